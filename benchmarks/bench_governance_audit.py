@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""Benchmark governance-audit queries over a synthetic audit store.
+
+Builds a store of --events events spread over a year (compacted and indexed
+like the hooks' background compactor does), then times typical compliance
+queries through the index against a full scan of the same events as a
+legacy governance_audit.log, and checks that both agree.
+
+Usage:
+    python3 benchmarks/bench_governance_audit.py [--events 1000000] [--sessions 5000] [--dir DIR]
+"""
+
+import argparse
+import importlib.machinery
+import importlib.util
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins', 'governance-layer', 'hooks'))
+
+import audit_store  # noqa: E402
+
+# scripts/governance-audit has no .py extension
+_loader = importlib.machinery.SourceFileLoader('governance_audit', os.path.join(REPO_ROOT, 'scripts', 'governance-audit'))
+_spec = importlib.util.spec_from_loader('governance_audit', _loader)
+governance_audit = importlib.util.module_from_spec(_spec)
+_loader.exec_module(governance_audit)
+
+EVENT_TYPES = ['TOOL_USE'] * 6 + ['TOOL_OUTPUT_CHECK'] * 6 + ['INPUT_CHECK'] * 3 + ['SESSION_START', 'HITL_APPROVAL']
+TOOLS = ['Bash', 'Read', 'Edit', 'Write', 'Grep']
+
+
+def make_event(rng, timestamp, session_id):
+    event_type = rng.choice(EVENT_TYPES)
+    details = {'session_id': session_id}
+    if event_type == 'TOOL_USE':
+        details.update(tool_name=rng.choice(TOOLS), tool_input={'command': 'ls -la ' + 'x' * rng.randrange(80)})
+    elif event_type == 'TOOL_OUTPUT_CHECK':
+        details.update(tool_name=rng.choice(TOOLS), has_pii=False, content_snippet='y' * rng.randrange(200))
+    elif event_type == 'INPUT_CHECK':
+        prompt = 'please refactor the module ' * rng.randrange(1, 8)
+        details.update(original_prompt=prompt, redacted_prompt=prompt, has_pii=False)
+    blocked = event_type == 'HITL_APPROVAL' and rng.random() < 0.5
+    return {
+        'timestamp': timestamp.isoformat(),
+        'event_type': event_type,
+        'risk_level': 'HIGH' if event_type == 'HITL_APPROVAL' or rng.random() < 0.02 else 'LOW',
+        'decision': 'BLOCKED' if blocked else 'ALLOWED',
+        'details': details,
+        'model_version': 'unknown',
+    }
+
+
+def build_store(store_dir, legacy_log, events, sessions, rng):
+    """Sessions of about events/sessions events each, a few of them running at any time."""
+    start = datetime(2025, 1, 1)
+    step = timedelta(days=365) / events
+    per_segment = max(events // 52, 1)  # About one segment per week
+    os.makedirs(store_dir)
+    sealed = None
+    running = [0] * 4
+    with open(legacy_log, 'w') as legacy:
+        for i in range(events):
+            if i % per_segment == 0:
+                if sealed:
+                    sealed.close()
+                sealed = open(os.path.join(store_dir, f'sealed-{i:020d}-0.ndjson'), 'w')
+            slot = rng.randrange(len(running))
+            if rng.random() < sessions / events * len(running):
+                running[slot] = max(running) + 1
+            event = make_event(rng, start + step * i, f'session-{running[slot]:06d}')
+            line = json.dumps(event)
+            sealed.write(line + '\n')
+            legacy.write(f'{event["timestamp"]} - INFO - {line}\n')
+    sealed.close()
+    for path in audit_store.list_segments(store_dir):
+        audit_store.compact_segment(path)
+
+
+def legacy_scan(legacy_log, query):
+    """What a script over governance_audit.log has to do: parse every line."""
+    with open(legacy_log, 'rb') as f:
+        for line in f:
+            event = json.loads(line.split(b' - INFO - ', 1)[1])
+            if query.matches(event):
+                yield event
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=1000000)
+    parser.add_argument('--sessions', type=int, default=5000)
+    parser.add_argument('--dir', help="Work directory (default: a temporary one, removed afterwards)")
+    args = parser.parse_args()
+
+    work_dir = args.dir or tempfile.mkdtemp(prefix='bench_governance_audit_')
+    store_dir = os.path.join(work_dir, 'store')
+    legacy_log = os.path.join(work_dir, 'governance_audit.log')
+    try:
+        if not os.path.isdir(store_dir):
+            (_, build_time) = timed(lambda: build_store(store_dir, legacy_log, args.events, args.sessions,
+                                                        random.Random(42)))
+            print(f"Built store of {args.events} events in {build_time:.1f}s")
+        store_bytes = sum(os.path.getsize(p) for p in audit_store.list_segments(store_dir))
+        print(f"Legacy log {os.path.getsize(legacy_log) / 1e6:.0f} MB, "
+              f"store {store_bytes / 1e6:.0f} MB compressed\n")
+
+        session = 'session-%06d' % (args.sessions // 2)
+        queries = [
+            ('all events by month', governance_audit.Query(), ['month']),
+            ('Q3 by event type/decision', governance_audit.Query(*governance_audit.parse_quarter('2025Q3')),
+             ['event_type', 'decision']),
+            ('BLOCKED in Q3', governance_audit.Query(*governance_audit.parse_quarter('2025Q3'),
+                                                     {'decision': ['BLOCKED']}), ['event_type']),
+            # Not in the per-block counts: every Q3 block is decompressed
+            ('Q3 by tool name', governance_audit.Query(*governance_audit.parse_quarter('2025Q3')), ['tool_name']),
+            ('session, BLOCKED', governance_audit.Query(values={'session_id': [session], 'decision': ['BLOCKED']}),
+             ['day']),
+        ]
+        print(f"{'query':28s} {'matches':>9s} {'legacy scan':>12s} {'indexed':>10s}")
+        for name, query, by in queries:
+            (legacy_total, legacy_groups), legacy_time = timed(
+                lambda: governance_audit.summarize(legacy_scan(legacy_log, query), by))
+            (total, groups), indexed_time = timed(
+                lambda: governance_audit.summarize_store(query, by, store_dir))
+            assert (total, groups) == (legacy_total, legacy_groups), name
+            print(f"{name:28s} {total:9d} {legacy_time:11.2f}s {indexed_time:9.2f}s  "
+                  f"{legacy_time / indexed_time:6.1f}x")
+        print(f"\nPeak RSS: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+    finally:
+        if not args.dir:
+            shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Benchmark governance command policy lookups as the policy grows.
+
+Writes policies of increasing size (rules for generated executables, plus a
+few for the executables of the benchmarked command line and some "*"
+rules), compiles each into its index, and times evaluate_command() on the
+same command line against it. The lookup only reads the shards of the
+executables on the line, so its time should stay flat with policy size;
+compile time (once per policy edit) grows with it.
+
+Usage:
+    python3 benchmarks/bench_governance_command_policy.py [--sizes 10,1000,10000] [--runs 200]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins', 'governance-layer', 'hooks'))
+
+from command_policy import evaluate_command, load_policy  # noqa: E402
+
+COMMAND = 'git status && npm test -- --coverage | tee /tmp/out.txt'
+FIXED_RULES = [
+    {'executable': 'git', 'action': 'review', 'args': ['push'], 'flags': [['-f', '--force']]},
+    {'executable': 'npm', 'action': 'deny', 'args': ['publish']},
+    {'executable': '*', 'action': 'review', 'args': ['--no-verify']},
+]
+
+
+def write_policy(path: str, size: int):
+    rules = list(FIXED_RULES)
+    actions = ('allow', 'review', 'deny')
+    for index in range(size - len(rules)):
+        rules.append({'executable': f'tool{index}', 'action': actions[index % 3],
+                      'args': [f'--target=*{index}*'], 'flags': [['-x', '--execute']]})
+    with open(path, 'w') as f:
+        json.dump({'default': 'allow', 'rules': rules}, f)
+
+
+def measure(fn, runs: int):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10,1000,10000', help='Comma-separated policy sizes (rules)')
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_governance_command_policy_')
+    try:
+        print(f"Command: {COMMAND}")
+        print(f"{'rules':>8}  {'compile':>10}  {'lookup':>10}  decision")
+        for size in (int(value) for value in args.sizes.split(',')):
+            policy_path = os.path.join(work_dir, f'policy-{size}.json')
+            index_dir = os.path.join(work_dir, f'index-{size}')
+            write_policy(policy_path, size)
+
+            start = time.perf_counter()
+            load_policy(policy_path, index_dir)
+            compile_time = time.perf_counter() - start
+
+            decision = evaluate_command(COMMAND, policy_path, index_dir)
+            lookup = measure(lambda: evaluate_command(COMMAND, policy_path, index_dir), args.runs)
+            print(f"{size:>8}  {compile_time * 1e3:8.1f}ms  {lookup * 1e6:8.1f}us  {decision.action}")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
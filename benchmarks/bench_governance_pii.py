@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Benchmark governance PII redaction: per-pattern search+sub vs single pass.
+
+The legacy implementation is what governance_hook.check_pii did before the
+pii_redaction engine: five patterns compiled on every call, each run as a
+re.search and then a re.sub over the text. Realistic payloads are tool
+outputs with occasional PII; adversarial payloads target the worst case of
+each pattern and are only given to the legacy implementation at a reduced
+size, since several of them are quadratic there.
+
+Usage:
+    python3 benchmarks/bench_governance_pii.py [--size-mb 5] [--legacy-kb 64] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins', 'governance-layer', 'hooks'))
+
+from pii_redaction import find_pii, redact_pii  # noqa: E402
+
+WORDS = [
+    'error', 'user', 'id', 'value', 'path', '/usr/lib/python3', 'def', 'return', 'self.x',
+    '=', '(x)', '2024-01-01', '12:00:00', 'ok', '42', '0x1f', 'import', 'os', 'sys',
+]
+PII = ['jane.doe@example.com', '123-45-6789', '4111 1111 1111 1111', 'EMP-12345', 'PROJ-ATLAS']
+
+
+def legacy_check_pii(text):
+    patterns = [
+        (r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "[REDACTED_EMAIL]"),
+        (r"\b\d{3}-\d{2}-\d{4}\b", "[REDACTED_SSN]"),
+        (r"\b(?:\d[ -]*?){13,16}\b", "[REDACTED_CREDIT_CARD]"),
+        (r"\bEMP-\d{5}\b", "[REDACTED_EMPLOYEE_ID]"),
+        (r"\bPROJ-[A-Z]{3,}\b", "[REDACTED_PROJECT_CODE]")
+    ]
+    redacted_text = text
+    found_pii = False
+    for pattern, replacement in patterns:
+        if re.search(pattern, redacted_text):
+            redacted_text = re.sub(pattern, replacement, redacted_text)
+            found_pii = True
+    return found_pii, redacted_text
+
+
+def check_pii(text):
+    matches = find_pii(text)
+    return bool(matches), redact_pii(text, matches)
+
+
+def tool_output(size, rng):
+    """Log/code-like text with PII on one line in fifty."""
+    lines = []
+    total = 0
+    while total < size:
+        line = ' '.join(rng.choice(WORDS) for _ in range(10))
+        if len(lines) % 50 == 0:
+            line += ' ' + rng.choice(PII)
+        lines.append(line)
+        total += len(line) + 1
+    return '\n'.join(lines)
+
+
+def repeat_to(unit, size):
+    return unit * (size // len(unit) + 1)
+
+
+ADVERSARIAL = {
+    'digit run': lambda size, rng: repeat_to('1', size),
+    'spaced digits': lambda size, rng: repeat_to('1 ', size),
+    'separator runs': lambda size, rng: repeat_to('1 - ', size),
+    'card groups': lambda size, rng: ' '.join('%04d' % rng.randint(0, 9999) for _ in range(size // 5)),
+    'address chars': lambda size, rng: repeat_to('a', size),
+    'dotted domain': lambda size, rng: 'a@' + repeat_to('a.', size),
+}
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-mb', type=float, default=5.0)
+    parser.add_argument('--legacy-kb', type=int, default=64,
+                        help="Size of the adversarial payloads given to the legacy implementation")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    size = int(args.size_mb * 1024 * 1024)
+
+    text = tool_output(size, rng)
+    matches = find_pii(text)
+    categories = sorted({m.category for m in matches})
+    print(f"Tool output, {len(text) / 1e6:.1f} MB, {len(matches)} matches ({', '.join(categories)}), "
+          f"best of {args.repeat}")
+    legacy_time = timed(lambda: legacy_check_pii(text), args.repeat)
+    new_time = timed(lambda: check_pii(text), args.repeat)
+    print(f"  legacy search+sub      {legacy_time * 1000:10.1f} ms")
+    print(f"  single pass            {new_time * 1000:10.1f} ms  {legacy_time / new_time:5.1f}x")
+
+    legacy_size = args.legacy_kb * 1024
+    print(f"\nAdversarial payloads: single pass at {args.size_mb:g} MB, legacy at {args.legacy_kb} KB")
+    for name, make in ADVERSARIAL.items():
+        payload = make(size, rng)[:size]
+        small = make(legacy_size, rng)[:legacy_size]
+        new_time = timed(lambda: check_pii(payload), 1)
+        legacy_time = timed(lambda: legacy_check_pii(small), 1)
+        print(f"  {name:16s} single pass {new_time * 1000:9.1f} ms "
+              f"({new_time / len(payload) * 1e9:6.1f} ns/char)   "
+              f"legacy {legacy_time * 1000:9.1f} ms ({legacy_time / len(small) * 1e9:8.1f} ns/char)")
+
+
+if __name__ == '__main__':
+    main()
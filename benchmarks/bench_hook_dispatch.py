@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark hook latency: one process per plugin vs the hook-dispatcher.
+
+Today every hook event starts the governance-layer, hookify and (for file
+edits) security-guidance hooks as separate Python processes, which Claude
+Code runs in parallel. The dispatcher runs all of them in one process. For
+each payload this measures the wall time of one hook event (fan-out run in
+parallel, as Claude Code does, and sequentially) and the CPU time spent in
+the hook processes, with a fresh HOME and a project without hookify rules.
+
+Usage:
+    python3 benchmarks/bench_hook_dispatch.py [--runs 30]
+"""
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGINS = os.path.join(REPO_ROOT, 'plugins')
+
+# (plugin, command) as registered in each plugin's hooks.json
+FAN_OUT = {
+    'PreToolUse': [
+        ('governance-layer', ['hooks/governance_hook.py', '--event', 'PreToolUse']),
+        ('hookify', ['hooks/pretooluse.py']),
+        ('security-guidance', ['hooks/security_reminder_hook.py']),
+    ],
+    'UserPromptSubmit': [
+        ('governance-layer', ['hooks/governance_hook.py', '--event', 'UserPromptSubmit']),
+        ('hookify', ['hooks/userpromptsubmit.py']),
+    ],
+}
+
+PAYLOADS = [
+    ('PreToolUse Edit', 'PreToolUse', {
+        'tool_name': 'Edit',
+        'tool_input': {'file_path': '/project/src/app.py', 'old_string': 'x = 1', 'new_string': 'x = 2'},
+    }),
+    ('PreToolUse Bash', 'PreToolUse', {'tool_name': 'Bash', 'tool_input': {'command': 'ls -la'}}),
+    ('UserPromptSubmit', 'UserPromptSubmit', {'prompt': 'Refactor the config loader'}),
+]
+
+
+def matches_tool(plugin, payload):
+    # security-guidance is registered with matcher Edit|Write|MultiEdit
+    return plugin != 'security-guidance' or payload.get('tool_name') in ('Edit', 'Write', 'MultiEdit')
+
+
+def spawn(plugin, args, raw, env, cwd):
+    proc = subprocess.Popen([sys.executable, os.path.join(PLUGINS, plugin, *args[:1])] + args[1:],
+                            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                            env=dict(env, CLAUDE_PLUGIN_ROOT=os.path.join(PLUGINS, plugin)), cwd=cwd)
+    proc.stdin.write(raw)
+    proc.stdin.close()
+    return proc
+
+
+def fan_out(event, payload, raw, env, cwd, parallel):
+    commands = [(plugin, args) for plugin, args in FAN_OUT[event] if matches_tool(plugin, payload)]
+    if parallel:
+        for proc in [spawn(plugin, args, raw, env, cwd) for plugin, args in commands]:
+            proc.wait()
+    else:
+        for plugin, args in commands:
+            spawn(plugin, args, raw, env, cwd).wait()
+
+
+def dispatcher(event, payload, raw, env, cwd):
+    spawn('hook-dispatcher', ['hooks/dispatcher.py', '--event', event], raw, env, cwd).wait()
+
+
+def measure(fn, runs):
+    """Wall times of runs calls and the children's CPU time per call."""
+    fn()  # Warm up caches (pyc, rule cache, state files)
+    times = []
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = (after.ru_utime - before.ru_utime + after.ru_stime - before.ru_stime) / runs
+    return times, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=30)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_hook_dispatch_')
+    home = os.path.join(work_dir, 'home')
+    project = os.path.join(work_dir, 'project')
+    os.makedirs(home)
+    os.makedirs(project)
+    # Every run evaluates its rules, without the daemon or the decision cache
+    env = dict(os.environ, HOME=home, HOOKIFY_DAEMON='0', HOOKIFY_DECISION_CACHE='0')
+    env.pop('GOVERNANCE_SIEM_URL', None)
+    try:
+        print(f"{'payload':18s} {'mode':22s} {'p50':>9s} {'p95':>9s} {'cpu/event':>10s}")
+        for name, event, payload in PAYLOADS:
+            payload = dict(payload, session_id='bench', hook_event_name=event, cwd=project)
+            raw = json.dumps(payload).encode('utf-8')
+            modes = [
+                ('fan-out (parallel)', lambda: fan_out(event, payload, raw, env, project, True)),
+                ('fan-out (sequential)', lambda: fan_out(event, payload, raw, env, project, False)),
+                ('dispatcher', lambda: dispatcher(event, payload, raw, env, project)),
+            ]
+            for mode, fn in modes:
+                times, cpu = measure(fn, args.runs)
+                p95 = sorted(times)[max(int(len(times) * 0.95) - 1, 0)]
+                print(f"{name:18s} {mode:22s} {statistics.median(times) * 1000:7.1f}ms "
+                      f"{p95 * 1000:7.1f}ms {cpu * 1000:8.1f}ms")
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""Benchmark every hook entry point on synthetic payloads, with baselines.
+
+Runs each hook script the way Claude Code does (a new process, hook input
+on stdin, CLAUDE_PLUGIN_ROOT set) against generated payloads: small Bash
+commands, a large Write, a MultiEdit with many edits, prompts, and Stop
+events with a large transcript, for hookify rule sets of several sizes.
+For every scenario it reports the p50/p99 wall time and the peak RSS of the
+hook process, and per entry point the startup time (a payload it ignores or
+an empty project).
+
+Timings are machine specific, so baselines are stored locally (not in git):
+--save-baseline records the results, --check compares against them and
+exits with 1 if a scenario got slower or bigger than the tolerances allow.
+Run --check with the options the baseline was saved with. With the default
+sizes the Stop scenarios (a full read of a 500MB transcript per run)
+dominate the run time; --only and smaller sizes make quick local checks.
+
+Usage:
+    python3 benchmarks/bench_hook_entry_points.py [--rules 10,100,1000] [--only REGEX]
+        [--runs 20] [--heavy-runs 5] [--write-mb 5] [--edits 200] [--transcript-mb 500]
+        [--save-baseline | --check] [--baseline PATH]
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import string
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGINS = os.path.join(REPO_ROOT, 'plugins')
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, 'benchmarks', 'baselines', 'hook_entry_points.json')
+BASELINE_VERSION = 1
+
+# name: (plugin, script and arguments)
+ENTRY_POINTS = {
+    'hookify/pretooluse': ('hookify', ['hooks/pretooluse.py']),
+    'hookify/posttooluse': ('hookify', ['hooks/posttooluse.py']),
+    'hookify/stop': ('hookify', ['hooks/stop.py']),
+    'hookify/userpromptsubmit': ('hookify', ['hooks/userpromptsubmit.py']),
+    'governance/SessionStart': ('governance-layer', ['hooks/governance_hook.py', '--event', 'SessionStart']),
+    'governance/UserPromptSubmit': ('governance-layer', ['hooks/governance_hook.py', '--event', 'UserPromptSubmit']),
+    'governance/PreToolUse': ('governance-layer', ['hooks/governance_hook.py', '--event', 'PreToolUse']),
+    'governance/PostToolUse': ('governance-layer', ['hooks/governance_hook.py', '--event', 'PostToolUse']),
+    'security/PreToolUse': ('security-guidance', ['hooks/security_reminder_hook.py']),
+    'dispatcher/PreToolUse': ('hook-dispatcher', ['hooks/dispatcher.py', '--event', 'PreToolUse']),
+    'dispatcher/UserPromptSubmit': ('hook-dispatcher', ['hooks/dispatcher.py', '--event', 'UserPromptSubmit']),
+}
+
+# (entry point, payload kind, depends on the hookify rules); heavy payloads get --heavy-runs
+SCENARIOS = [
+    ('hookify/pretooluse', 'bash', True),
+    ('hookify/pretooluse', 'write', True),
+    ('hookify/pretooluse', 'multiedit', True),
+    ('hookify/posttooluse', 'bash-output', True),
+    ('hookify/userpromptsubmit', 'prompt', True),
+    ('hookify/stop', 'stop', True),
+    ('governance/SessionStart', 'session', False),
+    ('governance/UserPromptSubmit', 'prompt', False),
+    ('governance/PreToolUse', 'bash', False),
+    ('governance/PreToolUse', 'write', False),
+    ('governance/PreToolUse', 'multiedit', False),
+    ('governance/PostToolUse', 'bash-output', False),
+    ('security/PreToolUse', 'edit', False),
+    ('security/PreToolUse', 'write', False),
+    ('security/PreToolUse', 'multiedit', False),
+    ('dispatcher/PreToolUse', 'bash', True),
+    ('dispatcher/PreToolUse', 'write', True),
+    ('dispatcher/UserPromptSubmit', 'prompt', True),
+]
+HEAVY = {'write', 'multiedit', 'stop'}
+
+# Payload each entry point ignores or has nothing to check in, for startup
+STARTUP_PAYLOADS = {
+    'hookify': 'bash',
+    'governance-layer': 'session',
+    'security-guidance': 'read',
+    'hook-dispatcher': 'read',
+}
+
+# Words rule patterns are built from; a few of them occur in the payloads
+KEYWORDS = ['console.log', 'debugger', 'eval', 'exec', 'innerHTML', 'document.write', 'pickle',
+            'os.system', 'subprocess', 'API_KEY', 'SECRET', 'TOKEN', 'password', 'TODO', 'FIXME',
+            'chmod', 'rm -rf', 'sudo', 'curl', 'wget', 'DROP TABLE', 'force-push']
+
+
+def source_text(size, rng):
+    """Source-like text of roughly size characters, with a few risky calls."""
+    alphabet = string.ascii_letters + string.digits + ' _.(){}=;'
+    block_lines = []
+    for _ in range(2000):
+        block_lines.append(''.join(rng.choice(alphabet) for _ in range(rng.randint(20, 100))))
+    block = '\n'.join(block_lines) + '\n'
+    text = (block * (size // len(block) + 1))[:size]
+    return 'import os\nresult = eval(expression)\n' + text + '\nconsole.log(result)\n'
+
+
+def write_transcript(path, size, rng):
+    """A JSONL transcript of roughly size bytes of user/assistant turns."""
+    lines = []
+    for i in range(500):
+        role = 'user' if i % 2 == 0 else 'assistant'
+        text = ' '.join(rng.choice(KEYWORDS + ['the', 'code', 'file', 'test', 'fix', 'update', 'run'] * 5)
+                        for _ in range(rng.randint(20, 200)))
+        lines.append(json.dumps({'type': role, 'message': {'role': role, 'content': text}}))
+    chunk = ('\n'.join(lines) + '\n').encode('utf-8')
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size:
+            f.write(chunk)
+            written += len(chunk)
+        f.write(b'{"type": "assistant", "message": {"role": "assistant", "content": "Ran pytest, all green"}}\n')
+
+
+def make_payloads(args, work_dir, rng):
+    """{kind: hook input without session/cwd}."""
+    write_content = source_text(int(args.write_mb * 1024 * 1024), rng)
+    edits = [{'old_string': f'value_{i} = {i}', 'new_string': source_text(2000, rng)} for i in range(args.edits)]
+    transcript = os.path.join(work_dir, 'transcript.jsonl')
+    write_transcript(transcript, int(args.transcript_mb * 1024 * 1024), rng)
+    bash = {'tool_name': 'Bash', 'tool_input': {'command': 'git status && npm test'}}
+    return {
+        'bash': dict(bash, hook_event_name='PreToolUse'),
+        'bash-output': dict(bash, hook_event_name='PostToolUse',
+                            tool_result='On branch main\nnothing to commit, working tree clean\n' * 20),
+        'edit': {'hook_event_name': 'PreToolUse', 'tool_name': 'Edit',
+                 'tool_input': {'file_path': '/project/src/app.py', 'old_string': 'x = 1', 'new_string': 'x = 2'}},
+        'write': {'hook_event_name': 'PreToolUse', 'tool_name': 'Write',
+                  'tool_input': {'file_path': '/project/src/generated.py', 'content': write_content}},
+        'multiedit': {'hook_event_name': 'PreToolUse', 'tool_name': 'MultiEdit',
+                      'tool_input': {'file_path': '/project/src/app.py', 'edits': edits}},
+        'read': {'hook_event_name': 'PreToolUse', 'tool_name': 'Read',
+                 'tool_input': {'file_path': '/project/src/app.py'}},
+        'prompt': {'hook_event_name': 'UserPromptSubmit',
+                   'prompt': 'Refactor the config loader and add tests for the edge cases'},
+        'session': {'hook_event_name': 'SessionStart', 'source': 'startup'},
+        'stop': {'hook_event_name': 'Stop', 'reason': 'Task complete', 'transcript_path': transcript},
+    }
+
+
+def write_rules(project, count, rng):
+    """count hookify rules for all events in project/.claude, a few of which match."""
+    rules_dir = os.path.join(project, '.claude')
+    os.makedirs(rules_dir, exist_ok=True)
+    for i in range(count):
+        word = rng.choice(KEYWORDS)
+        # Mostly near misses, so rules are checked but rarely all match
+        literal = word if i % 10 == 0 else word + ''.join(rng.choice(string.ascii_lowercase) for _ in range(3))
+        kind = i % 10
+        if kind < 4:
+            event, field = 'bash', 'command'
+        elif kind < 8:
+            event, field = 'file', rng.choice(['new_text', 'content', 'file_path'])
+        elif kind < 9:
+            event, field = 'prompt', 'user_prompt'
+        else:
+            event, field = 'stop', 'transcript'
+        # Frontmatter values are taken verbatim, no quoting or escaping
+        if i % 3 == 0:
+            operator, pattern = 'contains', literal
+        else:
+            operator, pattern = 'regex_match', re.escape(literal) + r'\s*[(=]?'
+        with open(os.path.join(rules_dir, f'hookify.bench-{i:04d}.local.md'), 'w') as f:
+            f.write(f"---\nname: bench-{i:04d}\nenabled: true\nevent: {event}\naction: warn\n"
+                    f"conditions:\n  - field: {field}\n    operator: {operator}\n    pattern: {pattern}\n"
+                    f"---\n\nBenchmark rule {i} matched.\n")
+
+
+# Starts the hook processes of one scenario and reports their wall time and
+# peak RSS. On Linux a forked child's peak RSS starts at its parent's, so the
+# hooks are spawned from this small interpreter rather than from the
+# benchmark process holding all payloads; hook input is passed as a file.
+RUNNER = r"""
+import json, os, subprocess, sys, time
+spec = json.load(sys.stdin)
+results = []
+for path in spec['inputs']:
+    with open(path, 'rb') as stdin:
+        start = time.perf_counter()
+        proc = subprocess.Popen(spec['command'], stdin=stdin, stdout=subprocess.DEVNULL,
+                                stderr=subprocess.DEVNULL, env=spec['env'], cwd=spec['cwd'])
+        _, status, usage = os.wait4(proc.pid, 0)
+        results.append([time.perf_counter() - start, usage.ru_maxrss * 1024])
+        proc.returncode = os.waitstatus_to_exitcode(status)
+json.dump(results, sys.stdout)
+"""
+
+
+def run_hooks(entry, input_paths, env, cwd):
+    """Run a hook once per input file. Returns [(seconds, peak RSS in bytes)]."""
+    plugin, args = ENTRY_POINTS[entry]
+    spec = {
+        'command': [sys.executable, os.path.join(PLUGINS, plugin, args[0])] + args[1:],
+        'env': dict(env, CLAUDE_PLUGIN_ROOT=os.path.join(PLUGINS, plugin)),
+        'cwd': cwd,
+        'inputs': input_paths,
+    }
+    result = subprocess.run([sys.executable, '-c', RUNNER], input=json.dumps(spec), env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+def measure(entry, payload, env, cwd, runs, session, input_dir):
+    """p50/p99 wall time (ms) and peak RSS (MB) over runs, after one warm-up run."""
+    input_paths = []
+    for run in range(runs + 1):
+        # Stop events get a new session per run, so the transcript is read in full
+        if run and payload.get('hook_event_name') != 'Stop':
+            input_paths.append(input_paths[0])
+            continue
+        path = os.path.join(input_dir, f'input-{run}.json')
+        with open(path, 'w') as f:
+            json.dump(dict(payload, session_id=f'{session}-{run}', cwd=cwd), f)
+        input_paths.append(path)
+
+    measured = run_hooks(entry, input_paths, env, cwd)[1:]
+    times = sorted(seconds for seconds, _ in measured)
+    peak = max(rss for _, rss in measured)
+    return {
+        'p50_ms': round(statistics.median(times) * 1000, 2),
+        'p99_ms': round(times[min(len(times) - 1, int(len(times) * 0.99))] * 1000, 2),
+        'rss_mb': round(peak / (1024 * 1024), 1),
+    }
+
+
+def check(results, baseline, args):
+    """Regressions of results against baseline, as messages."""
+    failures = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for metric, tolerance, slack in (('p50_ms', args.tolerance, args.min_delta_ms),
+                                         ('rss_mb', args.rss_tolerance, args.min_delta_mb)):
+            limit = max(base[metric] * (1 + tolerance), base[metric] + slack)
+            if result[metric] > limit:
+                failures.append(f"{key}: {metric} {result[metric]:g} > {limit:.1f} (baseline {base[metric]:g})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', default='10,100,1000', help="Comma-separated hookify rule set sizes")
+    parser.add_argument('--only', help="Only run scenarios whose name matches this regex")
+    parser.add_argument('--runs', type=int, default=20, help="Runs per light scenario")
+    parser.add_argument('--heavy-runs', type=int, default=5, help="Runs per Write/MultiEdit/Stop scenario")
+    parser.add_argument('--write-mb', type=float, default=5.0)
+    parser.add_argument('--edits', type=int, default=200)
+    parser.add_argument('--transcript-mb', type=float, default=500.0)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--save-baseline', action='store_true', help="Store the results as the baseline")
+    mode.add_argument('--check', action='store_true', help="Exit with 1 on regressions against the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative p50 increase")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help="p50 increase always allowed")
+    parser.add_argument('--rss-tolerance', type=float, default=0.10, help="Allowed relative RSS increase")
+    parser.add_argument('--min-delta-mb', type=float, default=2.0, help="RSS increase always allowed")
+    args = parser.parse_args()
+
+    # Results are only comparable for the same payloads
+    params = {'rules': args.rules, 'write_mb': args.write_mb, 'edits': args.edits,
+              'transcript_mb': args.transcript_mb}
+    baseline = None
+    if args.check:
+        try:
+            with open(args.baseline) as f:
+                stored = json.load(f)
+            baseline = stored['results']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Cannot read baseline {args.baseline}: {e} (run with --save-baseline first)", file=sys.stderr)
+            return 2
+        if stored.get('version') != BASELINE_VERSION or stored.get('params') != params:
+            print(f"Baseline {args.baseline} was recorded with other payloads ({stored.get('params')}); "
+                  f"run with the same options or --save-baseline again", file=sys.stderr)
+            return 2
+
+    rng = random.Random(16)
+    work_dir = tempfile.mkdtemp(prefix='bench_hook_entry_points_')
+    home = os.path.join(work_dir, 'home')
+    os.makedirs(home)
+    # Every run evaluates its rules, without the daemon or the decision cache
+    env = dict(os.environ, HOME=home, HOOKIFY_DAEMON='0', HOOKIFY_DECISION_CACHE='0')
+    for name in ('GOVERNANCE_SIEM_URL', 'HOOK_DISPATCHER_SKIP', 'HOOK_DISPATCHER_DEBUG', 'ENABLE_SECURITY_REMINDER'):
+        env.pop(name, None)
+    only = re.compile(args.only) if args.only else None
+    results = {}
+    try:
+        print(f"Generating payloads ({args.write_mb:g}MB Write, {args.edits}-edit MultiEdit, "
+              f"{args.transcript_mb:g}MB transcript)...", file=sys.stderr)
+        payloads = make_payloads(args, work_dir, rng)
+        input_dir = os.path.join(work_dir, 'inputs')
+        os.makedirs(input_dir)
+        projects = {0: os.path.join(work_dir, 'project-0')}
+        os.makedirs(projects[0])
+        for count in [int(n) for n in args.rules.split(',')]:
+            projects[count] = os.path.join(work_dir, f'project-{count}')
+            write_rules(projects[count], count, rng)
+
+        print(f"{'scenario':52s} {'p50':>10s} {'p99':>10s} {'peak RSS':>9s}")
+        if not only or only.search('startup'):
+            # The interpreter's share of every startup time
+            times = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, '-c', 'pass'], env=env, check=True)
+                times.append(time.perf_counter() - start)
+            print(f"{'python3 -c pass':52s} {statistics.median(times) * 1000:8.1f}ms")
+
+        def report(key, result):
+            results[key] = result
+            print(f"{key:52s} {result['p50_ms']:8.1f}ms {result['p99_ms']:8.1f}ms {result['rss_mb']:7.1f}MB")
+
+        for entry, (plugin, _) in ENTRY_POINTS.items():
+            key = f"{entry} startup"
+            if only and not only.search(key):
+                continue
+            report(key, measure(entry, payloads[STARTUP_PAYLOADS[plugin]], env, projects[0], args.runs, 'startup',
+                                input_dir))
+
+        for entry, kind, uses_rules in SCENARIOS:
+            runs = args.heavy_runs if kind in HEAVY else args.runs
+            for count in (sorted(n for n in projects if n) if uses_rules else [0]):
+                key = f"{entry} {kind}" + (f" rules={count}" if uses_rules else '')
+                if only and not only.search(key):
+                    continue
+                report(key, measure(entry, payloads[kind], env, projects[count], runs, 'bench', input_dir))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        stored = {'version': BASELINE_VERSION, 'python': sys.version.split()[0], 'params': params,
+                  'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+        with open(args.baseline, 'w') as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    elif baseline is not None:
+        failures = check(results, baseline, args)
+        for failure in failures:
+            print(f"REGRESSION: {failure}", file=sys.stderr)
+        if failures:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
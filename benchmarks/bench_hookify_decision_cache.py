@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark repeated identical hookify calls with and without the decision cache.
+
+Writes a project with generated Bash rules, then runs hookify.core.client
+evaluate() in-process on the same `git status` call: once per run with the
+decision cache off (every call loads and evaluates the rules), and with it
+on after a first call has stored the decision (every call is a hit). The
+daemon is off and the user and org rule layers are disabled.
+
+Usage:
+    python3 benchmarks/bench_hookify_decision_cache.py [--rules 100] [--runs 200]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins'))
+
+from hookify.core.client import evaluate  # noqa: E402
+
+RULE_TEMPLATE = """---
+name: rule-{index}
+enabled: true
+event: bash
+action: {action}
+pattern: {word}{index}\\s+--force
+---
+Rule {index} matched
+"""
+
+
+def measure(fn, runs: int):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=200)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_hookify_decision_cache_')
+    rules_dir = os.path.join(work_dir, '.claude')
+    os.makedirs(rules_dir)
+    for index in range(args.rules):
+        with open(os.path.join(rules_dir, f'hookify.rule-{index}.local.md'), 'w') as f:
+            f.write(RULE_TEMPLATE.format(index=index, action='block' if index % 2 else 'warn',
+                                         word=('rm', 'git', 'npm', 'curl')[index % 4]))
+
+    cwd = os.getcwd()
+    os.chdir(work_dir)
+    os.environ.update(HOOKIFY_DAEMON='0', HOOKIFY_USER_RULES_DIR='', HOOKIFY_ORG_RULES_DIR='')
+    payload = {'session_id': f'bench-{os.getpid()}', 'hook_event_name': 'PreToolUse',
+               'tool_name': 'Bash', 'tool_input': {'command': 'git status'}}
+    try:
+        os.environ['HOOKIFY_DECISION_CACHE'] = '0'
+        uncached = measure(lambda: evaluate('bash', payload), args.runs)
+        os.environ['HOOKIFY_DECISION_CACHE'] = '1'
+        evaluate('bash', payload)
+        cached = measure(lambda: evaluate('bash', payload), args.runs)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir)
+
+    print(f"{args.rules} rules, median of {args.runs} identical Bash calls")
+    print(f"  cache off  {uncached * 1e6:9.1f} us")
+    print(f"  cache hit  {cached * 1e6:9.1f} us  {uncached / cached:6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark hookify rule evaluation: per-rule loop vs single-scan prefilter.
+
+The per-rule loop is what RuleEngine did before the literal prefilter: every
+condition extracts its field and scans it on its own. The prefiltered path
+scans each field value once for the literals of all conditions.
+
+Usage:
+    python3 benchmarks/bench_hookify_rules.py [--rules 200] [--size-mb 5] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins'))
+
+from hookify.core.config_loader import Condition, Rule  # noqa: E402
+from hookify.core.rule_engine import FieldContext, RuleEngine  # noqa: E402
+
+# Typical rule vocabulary: security smells, debug code, credentials
+KEYWORDS = [
+    'console.log', 'debugger', 'eval', 'exec', 'innerHTML', 'document.write',
+    'pickle', 'os.system', 'subprocess', 'API_KEY', 'SECRET', 'TOKEN', 'password',
+    'TODO', 'FIXME', 'print', 'chmod', 'rm -rf', 'sudo', 'curl', 'wget',
+]
+
+
+def make_rules(count: int, rng: random.Random):
+    """Build a mixed ruleset of contains and regex_match conditions."""
+    rules = []
+    for i in range(count):
+        word = rng.choice(KEYWORDS) + ''.join(rng.choice(string.ascii_lowercase) for _ in range(3))
+        if i % 3 == 0:
+            condition = Condition(field='content', operator='contains', pattern=word)
+        elif i % 3 == 1:
+            condition = Condition(field='content', operator='regex_match', pattern=rf"{word}\s*\(")
+        else:
+            condition = Condition(field='content', operator='regex_match', pattern=rf"\b{word}\b.*=")
+        rules.append(Rule(name=f'rule-{i}', enabled=True, event='file',
+                          conditions=[condition], message=f'Rule {i} matched'))
+    return rules
+
+
+def make_payload(size: int, rng: random.Random) -> str:
+    """Generate source-like text of roughly size characters."""
+    alphabet = string.ascii_letters + string.digits + ' _.(){}=;'
+    lines = []
+    total = 0
+    while total < size:
+        line = ''.join(rng.choice(alphabet) for _ in range(rng.randint(20, 100)))
+        lines.append(line)
+        total += len(line) + 1
+    return '\n'.join(lines)
+
+
+def per_rule_loop(engine: RuleEngine, rules, input_data):
+    """The pre-prefilter evaluation: each condition extracts and scans its field."""
+    return [r.name for r in rules
+            if all(engine._check_condition(c, FieldContext.from_input(engine, input_data))
+                   for c in r.conditions)]
+
+
+def matched_names(result):
+    message = result.get('systemMessage', '')
+    return sorted(line[3:-3] for line in message.split('\n') if line.startswith('**['))
+
+
+def timed(fn, repeat: int):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rules', type=int, default=200)
+    parser.add_argument('--size-mb', type=float, default=5.0)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    rules = make_rules(args.rules, rng)
+    content = make_payload(int(args.size_mb * 1024 * 1024), rng)
+    # Plant a few matches so both paths do real work
+    content += '\n' + '\n'.join(f"{c.pattern} = 1" for r in rules[:10:3] for c in r.conditions)
+    input_data = {
+        'hook_event_name': 'PreToolUse',
+        'tool_name': 'Write',
+        'tool_input': {'file_path': 'src/app.py', 'content': content},
+    }
+
+    engine = RuleEngine()
+    loop_time, loop_result = timed(lambda: per_rule_loop(engine, rules, input_data), args.repeat)
+    fresh_time, fresh_result = timed(lambda: engine.evaluate_rules(rules, input_data), args.repeat)
+    index = engine.compile(rules)
+    index_time, index_result = timed(lambda: engine.evaluate_rules(index, input_data), args.repeat)
+
+    assert sorted(loop_result) == matched_names(fresh_result) == matched_names(index_result), \
+        "prefiltered evaluation disagrees with the per-rule loop"
+
+    print(f"{args.rules} rules, {len(content) / 1e6:.1f} MB Write payload, "
+          f"{len(loop_result)} matching rules (best of {args.repeat})")
+    print(f"  per-rule loop            {loop_time * 1000:10.1f} ms")
+    print(f"  evaluate_rules (list)    {fresh_time * 1000:10.1f} ms  {loop_time / fresh_time:5.1f}x")
+    print(f"  evaluate_rules (index)   {index_time * 1000:10.1f} ms  {loop_time / index_time:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
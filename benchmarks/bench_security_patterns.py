@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Benchmark security-guidance pattern matching: substring loops vs single scan.
+
+The first-hit loop is what check_patterns did before: `substring in content`
+for each substring of each pattern, stopping at the first hit. Reporting every
+finding with its offsets that way takes a str.find loop per substring. The
+single scan finds all occurrences of all substrings in one pass over the
+content. Results of the all-hits loop and the single scan are checked to be
+equal.
+
+Usage:
+    python3 benchmarks/bench_security_patterns.py [--size-kb 50,500,5000] [--repeat 5]
+"""
+
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins', 'security-guidance', 'hooks'))
+
+from security_reminder_hook import SECURITY_PATTERNS, find_pattern_matches  # noqa: E402
+
+# Risky calls sprinkled into the payload, plus near misses
+SNIPPETS = ['eval(x)', 'child_process.exec(cmd)', 'el.innerHTML = html', 'import pickle',
+            'os.system(cmd)', 'evaluate(x)', 'executor(task)', 'document.body']
+
+
+def make_payload(size, hits, rng):
+    """Generate source-like text of roughly size characters with hits findings."""
+    alphabet = string.ascii_letters + string.digits + ' _.(){}=;'
+    lines = []
+    total = 0
+    while total < size:
+        line = ''.join(rng.choice(alphabet) for _ in range(rng.randint(20, 100)))
+        lines.append(line)
+        total += len(line) + 1
+    for _ in range(hits):
+        lines.insert(rng.randrange(len(lines) + 1), rng.choice(SNIPPETS))
+    return '\n'.join(lines)
+
+
+def first_hit_loop(content):
+    """The previous check_patterns (content patterns only)."""
+    for pattern in SECURITY_PATTERNS:
+        for substring in pattern.get('substrings', ()):
+            if substring in content:
+                return pattern['ruleName']
+    return None
+
+
+def all_hits_loop(content):
+    """Every occurrence of every substring, one str.find loop per substring."""
+    found = {}
+    for pattern in SECURITY_PATTERNS:
+        for substring in pattern.get('substrings', ()):
+            offset = content.find(substring)
+            while offset != -1:
+                found.setdefault(pattern['ruleName'], []).append((None, offset, substring))
+                offset = content.find(substring, offset + 1)
+    return {rule: sorted(matches) for rule, matches in found.items()}
+
+
+def single_scan(content):
+    return {rule: matches for rule, _, matches in find_pattern_matches('src/app.js', [(None, content)])}
+
+
+def best_time(fn, content, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size-kb', default='50,500,5000', help="Comma-separated payload sizes")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    print(f"{'payload':>10s} {'hits':>5s} {'first-hit loop':>15s} {'all-hits loop':>14s} {'single scan':>12s}")
+    for size_kb in [int(size) for size in args.size_kb.split(',')]:
+        for hits in (0, 20):
+            content = make_payload(size_kb * 1024, hits, rng)
+            first, _ = best_time(first_hit_loop, content, args.repeat)
+            loop, expected = best_time(all_hits_loop, content, args.repeat)
+            scan, actual = best_time(single_scan, content, args.repeat)
+            assert actual == expected, 'single scan and all-hits loop disagree'
+            print(f"{size_kb:>8d}KB {hits:>5d} {first * 1000:>13.2f}ms {loop * 1000:>12.2f}ms {scan * 1000:>10.2f}ms")
+
+
+if __name__ == '__main__':
+    main()
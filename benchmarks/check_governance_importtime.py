@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Check the import-time budget of governance_hook.py for every hook event.
+
+Runs the hook under `python -X importtime` for each event and counts the
+modules it imports beyond what a bare interpreter imports at startup. Fails
+(exit code 1) if a module that must stay off the per-event path is imported,
+or if their total import time exceeds the budget (best of --runs runs).
+
+Usage:
+    python3 benchmarks/check_governance_importtime.py [--budget-ms 40] [--runs 5] [-v]
+
+tests/test_governance_importtime.py runs the same check as part of the
+test suite.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOOK = os.path.join(REPO_ROOT, 'plugins', 'governance-layer', 'hooks', 'governance_hook.py')
+
+EVENTS = {
+    'SessionStart': {'session_id': 'check'},
+    'UserPromptSubmit': {'session_id': 'check', 'prompt': 'Refactor the config loader'},
+    'PreToolUse': {'session_id': 'check', 'tool_name': 'Bash', 'tool_input': {'command': 'ls -la'}},
+    'PostToolUse': {'session_id': 'check', 'tool_name': 'Bash', 'tool_result': 'total 0'},
+}
+
+# The hook's own imports take about 10-15ms; the budget leaves room for
+# slower machines and noise, while catching a heavy module on the path
+DEFAULT_BUDGET_MS = 40.0
+
+# Only needed for errors, --help, SIEM forwarding, compaction or queries
+NEVER = {'argparse', 'logging', 'datetime', 'urllib.request', 'http.client', 'hashlib', 'zlib', 'gzip',
+         'random', 'siem_forwarder'}
+# Only needed to scan text for PII
+NO_PII = {'pii_redaction'}
+FORBIDDEN = {
+    'SessionStart': NEVER | NO_PII,
+    'UserPromptSubmit': NEVER,
+    'PreToolUse': NEVER | NO_PII,
+    'PostToolUse': NEVER,
+}
+
+
+def import_times(args, stdin, env):
+    """{module: self import time in microseconds} from -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, input=stdin, env=env,
+                            capture_output=True, text=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def check(budget_ms=DEFAULT_BUDGET_MS, runs=5, verbose=False):
+    """Run the hook for every event; returns the list of failures."""
+    home = tempfile.mkdtemp(prefix='check_governance_importtime_')
+    env = dict(os.environ, HOME=home)
+    env.pop('GOVERNANCE_SIEM_URL', None)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # Hooks run with cached bytecode
+    failures = []
+    try:
+        startup = set(import_times(['-c', 'pass'], '', env))
+        for event, payload in EVENTS.items():
+            stdin = json.dumps(dict(payload, hook_event_name=event))
+            # The first event ever creates the audit store and starts the compactor
+            import_times([HOOK, '--event', event], stdin, env)
+
+            best = None
+            for _ in range(runs):
+                times = {name: us for name, us in import_times([HOOK, '--event', event], stdin, env).items()
+                         if name not in startup}
+                if best is None or sum(times.values()) < sum(best.values()):
+                    best = times
+            total_ms = sum(best.values()) / 1000
+            forbidden = sorted(FORBIDDEN[event] & set(best))
+            slowest = sorted(best.items(), key=lambda item: -item[1])[:5]
+            status = 'FAIL' if forbidden or total_ms > budget_ms else 'ok'
+            print(f"{status:4s} {event:17s} {len(best):3d} modules {total_ms:6.1f}ms  "
+                  f"slowest: {', '.join(f'{name} {us / 1000:.1f}ms' for name, us in slowest)}")
+            if verbose:
+                print('     ' + ' '.join(sorted(best)))
+            if forbidden:
+                failures.append(f"{event} imports {', '.join(forbidden)}")
+            if total_ms > budget_ms:
+                failures.append(f"{event} import time {total_ms:.1f}ms exceeds {budget_ms:g}ms")
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum import time of the hook's own imports per event")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('-v', '--verbose', action='store_true', help="List the imported modules")
+    args = parser.parse_args()
+
+    failures = check(args.budget_ms, args.runs, args.verbose)
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
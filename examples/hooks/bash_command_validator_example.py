@@ -6,6 +6,12 @@ This hook runs as a PreToolUse hook for the Bash tool.
 It validates bash commands against a set of rules before execution.
 In this case it changes grep calls to using rg.
 
+Commands are split into words with shlex (quotes removed, |, ;, && and ||
+separated), so the rules check each command's executable and arguments
+rather than regexing the raw string: `"grep" foo`, `sudo grep foo` or
+`ls; grep foo` are all caught. The script only uses the standard library
+and can be copied anywhere.
+
 Read more about hooks here: https://docs.anthropic.com/en/docs/claude-code/hooks
 
 Make sure to change your path to your actual script.
@@ -29,26 +35,60 @@ Make sure to change your path to your actual script.
 """
 
 import json
-import re
+import shlex
 import sys
 
-# Define validation rules as a list of (regex pattern, message) tuples
+# Separators between commands; | also feeds the next command
+_SEPARATORS = {"|", "|&", ";", "&", "&&", "||", "(", ")", "\n"}
+# Commands that run the rest of their arguments as a command
+_WRAPPERS = {"sudo", "env", "nohup", "nice", "time", "command", "exec"}
+
+# Define validation rules as a list of (check, message) tuples. Each check
+# gets the argv of one command, whether it reads a pipe, and the argvs of
+# all commands of the line.
 _VALIDATION_RULES = [
     (
-        r"^grep\b(?!.*\|)",
+        # grep on its own, not filtering the output of a pipeline
+        lambda argv, piped, commands: argv[0] == "grep" and all(not other_piped for _, other_piped in commands),
         "Use 'rg' (ripgrep) instead of 'grep' for better performance and features",
     ),
     (
-        r"^find\s+\S+\s+-name\b",
+        lambda argv, piped, commands: argv[0] == "find" and "-name" in argv[1:],
         "Use 'rg --files | rg pattern' or 'rg --files -g pattern' instead of 'find -name' for better performance",
     ),
 ]
 
 
+def _split_commands(command: str) -> list[tuple[list[str], bool]]:
+    """(argv, piped) of each command of a command line."""
+    lexer = shlex.shlex(command, posix=True, punctuation_chars="();<>|&\n")
+    lexer.whitespace = " \t\r"  # Newlines separate commands
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:  # Unbalanced quotes
+        tokens = command.split()
+
+    commands = []
+    argv, piped = [], False
+    for token in tokens + [";"]:
+        if token not in _SEPARATORS:
+            argv.append(token)
+            continue
+        while argv and ("=" in argv[0] and argv[0].split("=")[0].isidentifier() or argv[0] in _WRAPPERS):
+            argv = argv[1:]
+        if argv:
+            argv[0] = argv[0].rsplit("/", 1)[-1]
+            commands.append((argv, piped))
+        argv, piped = [], token in ("|", "|&")
+    return commands
+
+
 def _validate_command(command: str) -> list[str]:
+    commands = _split_commands(command)
     issues = []
-    for pattern, message in _VALIDATION_RULES:
-        if re.search(pattern, command):
+    for check, message in _VALIDATION_RULES:
+        if any(check(argv, piped, commands) for argv, piped in commands):
             issues.append(message)
     return issues
 
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Rotated, compressed and indexed storage for governance audit events.
+
+Events are stored as NDJSON (one JSON object per line) in a store directory:
+
+    active-<period>.ndjson       events of the current rotation period
+    sealed-<ns>-<pid>.ndjson     rotated segments waiting to be compacted
+    segment-<ns>-<pid>.ndjson.gz compacted segments
+    segment-<ns>-<pid>.idx.json  sidecar index of each compacted segment
+
+Hooks only append to the active segment. It is rotated when it reaches
+SEGMENT_MAX_BYTES or when its rotation period ends, and a compactor started
+in the background then compresses and indexes it. A compacted segment is a
+concatenation of independent gzip members ("blocks") of up to
+BLOCK_MAX_EVENTS events, so it stays readable with zcat while any block can
+also be decompressed on its own. The index records for every block its byte
+range, event count, timestamp range and event counts per combination of
+event_type, risk_level and decision, and for each value of session_id,
+event_type, risk_level and decision the blocks it occurs in. A query only
+decompresses blocks that can match, and counts by type, risk level and
+decision are read from the index for blocks entirely within its time range.
+
+String fields longer than MAX_FIELD_CHARS (full prompts, file contents in
+tool inputs) are truncated to a prefix plus the length and SHA-256 of the
+full value, which keeps single events bounded but still verifiable.
+
+Usage:
+    python3 audit_store.py compact [--store DIR]
+    python3 audit_store.py status [--store DIR]
+    python3 audit_store.py import-legacy [LOG] [--store DIR]
+"""
+
+import os
+import sys
+import json
+import time
+
+STORE_DIR = os.path.expanduser(os.environ.get("GOVERNANCE_AUDIT_DIR", "~/.claude/governance_audit"))
+LEGACY_LOG_PATH = os.path.expanduser("~/.claude/governance_audit.log")
+
+ACTIVE_PREFIX = "active-"
+SEALED_PREFIX = "sealed-"
+SEGMENT_PREFIX = "segment-"
+RAW_SUFFIX = ".ndjson"
+SEGMENT_SUFFIX = ".ndjson.gz"
+INDEX_SUFFIX = ".idx.json"
+COMPACT_LOCK = "compact.lock"
+
+# Rotate the active segment at this size or at the end of its period
+SEGMENT_MAX_BYTES = int(float(os.environ.get("GOVERNANCE_AUDIT_SEGMENT_MAX_MB", "64")) * 1024 * 1024)
+ROTATE_SECONDS = max(int(float(os.environ.get("GOVERNANCE_AUDIT_ROTATE_HOURS", "24")) * 3600), 1)
+
+# Truncate longer strings in events (0 keeps them whole)
+MAX_FIELD_CHARS = int(float(os.environ.get("GOVERNANCE_AUDIT_MAX_FIELD_KB", "64")) * 1024)
+
+# Delete compacted segments older than this / beyond this total size (0 keeps everything)
+RETENTION_DAYS = float(os.environ.get("GOVERNANCE_AUDIT_RETENTION_DAYS", "0"))
+STORE_MAX_BYTES = int(float(os.environ.get("GOVERNANCE_AUDIT_MAX_MB", "0")) * 1024 * 1024)
+
+BLOCK_MAX_EVENTS = 1000
+BLOCK_MAX_BYTES = 1024 * 1024
+COMPRESS_LEVEL = 6
+
+# Appends that opened a segment before it was rotated may still be in flight
+SEAL_GRACE_SECONDS = 1.0
+
+INDEX_VERSION = 1
+INDEXED_FIELDS = ("session_id", "event_type", "risk_level", "decision")
+# Fields whose value combinations are counted per block
+COUNTED_FIELDS = ("event_type", "risk_level", "decision")
+
+
+def event_field(event, field):
+    """
+    Value of an indexed field of an event; session_id lives in its details.
+    """
+    if field == "session_id":
+        details = event.get("details")
+        return details.get("session_id") if isinstance(details, dict) else None
+    return event.get(field)
+
+
+def bound_payload(value, max_chars=None):
+    """
+    Truncate strings longer than max_chars anywhere in value, keeping a prefix
+    and the length and SHA-256 of the full string.
+    """
+    max_chars = MAX_FIELD_CHARS if max_chars is None else max_chars
+    if isinstance(value, str):
+        if max_chars and len(value) > max_chars:
+            import hashlib
+
+            digest = hashlib.sha256(value.encode("utf-8", "surrogatepass")).hexdigest()
+            return f"{value[:max_chars]}...[truncated, {len(value)} chars, sha256={digest}]"
+        return value
+    if isinstance(value, dict):
+        return {key: bound_payload(item, max_chars) for key, item in value.items()}
+    if isinstance(value, list):
+        return [bound_payload(item, max_chars) for item in value]
+    return value
+
+
+def active_segment_name(now=None):
+    """
+    Name of the active segment for the rotation period containing now.
+    """
+    now = time.time() if now is None else now
+    period = int(now // ROTATE_SECONDS) * ROTATE_SECONDS
+    return f"{ACTIVE_PREFIX}{period:012d}{RAW_SUFFIX}"
+
+
+def append_event(entry, store_dir=None):
+    """
+    Append one audit event to the active segment. This is all a hook does per event.
+    A single O_APPEND write keeps concurrent hook processes from interleaving.
+    """
+    store_dir = store_dir or STORE_DIR
+    line = (json.dumps(bound_payload(entry)) + "\n").encode("utf-8")
+    os.makedirs(store_dir, mode=0o700, exist_ok=True)
+    path = os.path.join(store_dir, active_segment_name())
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, line)
+        stat = os.fstat(fd)
+    finally:
+        os.close(fd)
+
+    if stat.st_size >= SEGMENT_MAX_BYTES:
+        rotate_segment(path, stat.st_ino)
+        ensure_compactor(store_dir)
+    elif stat.st_size == len(line):
+        # First event of a new period: earlier periods can be compacted
+        ensure_compactor(store_dir)
+
+
+def rotate_segment(path, inode=None):
+    """
+    Rename an active segment to a sealed one. With inode, only if path still is that file.
+    """
+    sealed = os.path.join(os.path.dirname(path), f"{SEALED_PREFIX}{time.time_ns():020d}-{os.getpid()}{RAW_SUFFIX}")
+    try:
+        if inode is not None and os.stat(path).st_ino != inode:
+            return None  # Already rotated by another process
+        os.rename(path, sealed)
+    except FileNotFoundError:
+        return None
+    return sealed
+
+
+def ensure_compactor(store_dir=None):
+    """
+    Start the background compactor unless one is already running.
+    """
+    import fcntl
+    import subprocess
+
+    store_dir = store_dir or STORE_DIR
+    fd = os.open(os.path.join(store_dir, COMPACT_LOCK), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # Running
+    finally:
+        os.close(fd)  # Also releases the lock if we got it
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "compact", "--store", store_dir],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+def list_segments(store_dir=None):
+    """
+    All segment files holding events, oldest first: compacted, then sealed,
+    then active ones.
+    """
+    store_dir = store_dir or STORE_DIR
+    try:
+        names = sorted(os.listdir(store_dir))
+    except FileNotFoundError:
+        return []
+    compacted = [name for name in names if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)]
+    sealed = [name for name in names if name.startswith(SEALED_PREFIX) and name.endswith(RAW_SUFFIX)]
+    active = [name for name in names if name.startswith(ACTIVE_PREFIX) and name.endswith(RAW_SUFFIX)]
+    return [os.path.join(store_dir, name) for name in compacted + sealed + active]
+
+
+def index_path(segment_path):
+    return segment_path[:-len(SEGMENT_SUFFIX)] + INDEX_SUFFIX
+
+
+def read_index(segment_path):
+    """
+    The sidecar index of a compacted segment, or None if it has none
+    (raw segments, or compaction was interrupted).
+    """
+    if not segment_path.endswith(SEGMENT_SUFFIX):
+        return None
+    try:
+        with open(index_path(segment_path), "r") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+        return None
+    return index
+
+
+def read_block(f, block):
+    """
+    Decompress one block of a compacted segment opened in binary mode.
+    Returns its NDJSON lines.
+    """
+    import zlib
+
+    f.seek(block["offset"])
+    return zlib.decompress(f.read(block["length"]), 31).splitlines()
+
+
+def iter_segment_lines(segment_path):
+    """
+    Yield the NDJSON lines of any segment, streaming.
+    """
+    if segment_path.endswith(SEGMENT_SUFFIX):
+        import gzip
+        opener = gzip.open
+    else:
+        opener = open
+    with opener(segment_path, "rb") as f:
+        for line in f:
+            line = line.rstrip(b"\r\n")
+            if line:
+                yield line
+
+
+def compact_segment(raw_path):
+    """
+    Compress a sealed segment into blocks and write its index.
+    Returns the compacted segment path, or None if the segment held no events.
+    """
+    store_dir = os.path.dirname(raw_path)
+    stem = os.path.basename(raw_path)[len(SEALED_PREFIX):-len(RAW_SUFFIX)]
+    segment_path = os.path.join(store_dir, f"{SEGMENT_PREFIX}{stem}{SEGMENT_SUFFIX}")
+    index = {
+        "version": INDEX_VERSION,
+        "events": 0,
+        "min_timestamp": None,
+        "max_timestamp": None,
+        "blocks": [],
+        "fields": {field: {} for field in INDEXED_FIELDS},
+    }
+
+    tmp_path = f"{segment_path}.{os.getpid()}.tmp"
+    with open(raw_path, "rb") as src, open(tmp_path, "wb") as dst:
+        lines = []
+        size = 0
+        for line in src:
+            if not line.strip():
+                continue
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            lines.append(line)
+            size += len(line)
+            if len(lines) >= BLOCK_MAX_EVENTS or size >= BLOCK_MAX_BYTES:
+                _write_block(dst, lines, index)
+                lines = []
+                size = 0
+        if lines:
+            _write_block(dst, lines, index)
+        dst.flush()
+        os.fsync(dst.fileno())
+
+    if not index["events"]:
+        _remove_quietly(tmp_path)
+        _remove_quietly(raw_path)
+        return None
+
+    index_tmp_path = f"{index_path(segment_path)}.{os.getpid()}.tmp"
+    with open(index_tmp_path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    # Segment first: a segment without index is still readable, just not indexed
+    os.replace(tmp_path, segment_path)
+    os.replace(index_tmp_path, index_path(segment_path))
+    os.remove(raw_path)
+    return segment_path
+
+
+def _write_block(dst, lines, index):
+    import zlib
+
+    block_id = len(index["blocks"])
+    min_ts = max_ts = None
+    fields = index["fields"]
+    counts = {}
+    for line in lines:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            event = None  # Kept in the segment, but not indexed
+        if not isinstance(event, dict):
+            counts = None
+            continue
+        timestamp = event.get("timestamp")
+        if isinstance(timestamp, str):
+            if min_ts is None or timestamp < min_ts:
+                min_ts = timestamp
+            if max_ts is None or timestamp > max_ts:
+                max_ts = timestamp
+        else:
+            counts = None
+        if counts is not None:
+            key = tuple(event.get(field) for field in COUNTED_FIELDS)
+            counts[key] = counts.get(key, 0) + 1
+        for field in INDEXED_FIELDS:
+            value = event_field(event, field)
+            if value is None:
+                continue
+            blocks = fields[field].setdefault(str(value), [])
+            if not blocks or blocks[-1] != block_id:
+                blocks.append(block_id)
+
+    compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)  # One gzip member
+    data = compressor.compress(b"".join(lines)) + compressor.flush()
+    block = {
+        "offset": dst.tell(),
+        "length": len(data),
+        "events": len(lines),
+        "min_timestamp": min_ts,
+        "max_timestamp": max_ts,
+    }
+    if counts is not None:
+        # Only when every event is well-formed and has a timestamp
+        block["counts"] = [list(key) + [count] for key, count in counts.items()]
+    index["blocks"].append(block)
+    dst.write(data)
+
+    index["events"] += len(lines)
+    if min_ts is not None and (index["min_timestamp"] is None or min_ts < index["min_timestamp"]):
+        index["min_timestamp"] = min_ts
+    if max_ts is not None and (index["max_timestamp"] is None or max_ts > index["max_timestamp"]):
+        index["max_timestamp"] = max_ts
+
+
+def compact_store(store_dir=None, now=None):
+    """
+    Rotate active segments of past periods, then compact all sealed segments
+    and apply the retention limits. Returns the number of segments compacted,
+    or None if another compactor is running.
+    """
+    import fcntl
+
+    store_dir = store_dir or STORE_DIR
+    os.makedirs(store_dir, mode=0o700, exist_ok=True)
+    lock_file = open(os.path.join(store_dir, COMPACT_LOCK), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+
+    try:
+        current = active_segment_name(now)
+        for name in sorted(os.listdir(store_dir)):
+            if name.startswith(ACTIVE_PREFIX) and name.endswith(RAW_SUFFIX) and name < current:
+                rotate_segment(os.path.join(store_dir, name))
+
+        compacted = 0
+        for path in list_segments(store_dir):
+            if not os.path.basename(path).startswith(SEALED_PREFIX):
+                continue
+            # Renaming updates ctime: give appends racing the rotation time to land
+            stat = os.stat(path)
+            age = time.time() - max(stat.st_mtime, stat.st_ctime)
+            if age < SEAL_GRACE_SECONDS:
+                time.sleep(SEAL_GRACE_SECONDS - age)
+            if compact_segment(path):
+                compacted += 1
+
+        enforce_retention(store_dir)
+        return compacted
+    finally:
+        lock_file.close()
+
+
+def enforce_retention(store_dir=None, days=None, max_bytes=None):
+    """
+    Delete the oldest compacted segments that are older than days or do not
+    fit in max_bytes. Both limits are off by default.
+    """
+    store_dir = store_dir or STORE_DIR
+    days = RETENTION_DAYS if days is None else days
+    max_bytes = STORE_MAX_BYTES if max_bytes is None else max_bytes
+    if not days and not max_bytes:
+        return
+
+    from datetime import datetime, timedelta
+
+    cutoff = (datetime.now() - timedelta(days=days)).isoformat() if days else None
+    segments = list_segments(store_dir)
+    total = 0
+    for path in segments:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+
+    for path in segments:
+        if not path.endswith(SEGMENT_SUFFIX):
+            break
+        index = read_index(path)
+        expired = cutoff is not None and index is not None and (index["max_timestamp"] or "") < cutoff
+        if not expired and (not max_bytes or total <= max_bytes):
+            break
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            continue
+        _remove_quietly(index_path(path))
+        total -= size
+
+
+def import_legacy_log(log_path=LEGACY_LOG_PATH, store_dir=None):
+    """
+    Copy the audit events of a legacy governance_audit.log (JSON in logging
+    lines) into the store. Returns the number of events imported.
+    """
+    store_dir = store_dir or STORE_DIR
+    os.makedirs(store_dir, mode=0o700, exist_ok=True)
+    # Sorts before segments rotated by hooks, like the events it holds
+    sealed = os.path.join(store_dir, f"{SEALED_PREFIX}{0:020d}-{time.time_ns()}{RAW_SUFFIX}")
+    count = 0
+    with open(log_path, "r", encoding="utf-8", errors="replace") as src, open(sealed, "w") as dst:
+        for line in src:
+            _, sep, message = line.partition(" - INFO - ")
+            if not sep:
+                continue
+            try:
+                event = json.loads(message)
+            except ValueError:
+                continue
+            if not isinstance(event, dict) or "event_type" not in event:
+                continue
+            dst.write(json.dumps(bound_payload(event)) + "\n")
+            count += 1
+    compact_store(store_dir)
+    return count
+
+
+def store_status(store_dir=None):
+    """
+    Segment counts, sizes, event count and time range of the store.
+    """
+    store_dir = store_dir or STORE_DIR
+    status = {
+        "store": store_dir,
+        "compacted_segments": 0,
+        "raw_segments": 0,
+        "unindexed_segments": 0,
+        "bytes": 0,
+        "events": 0,
+        "first_timestamp": None,
+        "last_timestamp": None,
+    }
+    for path in list_segments(store_dir):
+        try:
+            status["bytes"] += os.path.getsize(path)
+        except OSError:
+            continue
+        index = read_index(path)
+        if index is not None:
+            status["compacted_segments"] += 1
+            timestamps = (index["min_timestamp"], index["max_timestamp"])
+            status["events"] += index["events"]
+        else:
+            if path.endswith(SEGMENT_SUFFIX):
+                status["compacted_segments"] += 1
+                status["unindexed_segments"] += 1
+            else:
+                status["raw_segments"] += 1
+            timestamps = []
+            try:
+                for line in iter_segment_lines(path):
+                    status["events"] += 1
+                    try:
+                        timestamps.append(json.loads(line)["timestamp"])
+                    except (ValueError, KeyError, TypeError):
+                        pass
+                    if len(timestamps) > 2:
+                        timestamps = [min(timestamps), max(timestamps)]
+            except OSError:
+                continue
+        for timestamp in timestamps:
+            if not isinstance(timestamp, str):
+                continue
+            if status["first_timestamp"] is None or timestamp < status["first_timestamp"]:
+                status["first_timestamp"] = timestamp
+            if status["last_timestamp"] is None or timestamp > status["last_timestamp"]:
+                status["last_timestamp"] = timestamp
+    return status
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Governance audit store maintenance")
+    parser.add_argument("command", choices=["compact", "status", "import-legacy"])
+    parser.add_argument("log", nargs="?", default=LEGACY_LOG_PATH, help="Legacy log to import")
+    parser.add_argument("--store", default=STORE_DIR, help="Store directory")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        compacted = compact_store(args.store)
+        if compacted is None:
+            print("Another compactor is running.", file=sys.stderr)
+        return 0
+
+    if args.command == "import-legacy":
+        try:
+            count = import_legacy_log(args.log, args.store)
+        except OSError as e:
+            print(f"Error: cannot import {args.log}: {e}", file=sys.stderr)
+            return 1
+        print(f"Imported {count} events from {args.log} into {args.store}")
+        return 0
+
+    status = store_status(args.store)
+    print(f"Store: {status['store']}")
+    print(f"Segments: {status['compacted_segments']} compacted "
+          f"({status['unindexed_segments']} without index), {status['raw_segments']} raw")
+    print(f"Size on disk: {status['bytes']} bytes")
+    print(f"Events: {status['events']}")
+    print(f"First event: {status['first_timestamp'] or '-'}")
+    print(f"Last event: {status['last_timestamp'] or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
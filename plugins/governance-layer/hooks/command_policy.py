@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+Enterprise policy for Bash commands: allow, deny and review rules by executable.
+
+The policy is a JSON file (GOVERNANCE_COMMAND_POLICY, default
+~/.claude/governance_command_policy.json):
+
+    {
+      "default": "allow",
+      "include_default_rules": true,
+      "rules": [
+        {"executable": "rm", "action": "deny", "flags": [["-r", "-R", "--recursive"], ["-f", "--force"]],
+         "args": ["/*"], "message": "Recursive deletes of absolute paths are not allowed."},
+        {"executable": "curl", "action": "review", "args": ["*.internal.example.com*"]},
+        {"executable": "terraform", "action": "deny", "args": ["destroy"]},
+        {"executable": "*", "action": "review", "args": ["--no-verify"]}
+      ]
+    }
+
+A rule applies to a command (see shell_command: pipelines, ;, &&, $(...),
+bash -c and wrappers like sudo are split into commands) when argv0 is its
+executable and all of its conditions hold:
+
+    flags   every group has one of its options: "--force" also matches
+            "--force=..." and "-f" also matches inside "-rf" (the whole
+            word counts too, so "-name" matches "find -name")
+    args    every pattern (fnmatch syntax) matches some argument
+
+and is reported by its "name" if it has one, else by its position
+("rules[3]").
+
+Rules for "*" only apply to commands no rule of their executable applies
+to, and a command no rule applies to gets the "default" action. Of the
+applying rules the strictest wins (deny, then review, then allow), and
+the strictest command decides for the whole command line. The built-in
+rules (DEFAULT_RULES: rm -rf on absolute paths is denied, and
+DEFAULT_RAW_DENY: "rm -rf /" anywhere in the command line) always apply
+unless include_default_rules is false, so a policy cannot allow what they
+deny by accident. "allow" only means governance does not object: Claude
+Code's own permission prompts still apply.
+
+The policy is compiled into an index under GOVERNANCE_COMMAND_POLICY_INDEX
+(default ~/.claude/governance_command_policy.d): one directory per version
+of the policy file (named by its device, inode, mtime and size), holding
+one JSON shard of rules per executable and a shard of "*" rules. A Bash
+call stats the policy file, reads the small _meta.json of its index and
+then only the shards of the executables on the command line, so its cost
+does not grow with the size of the policy. Editing the policy file makes
+the next call compile a new index: running sessions pick up changes without
+a restart. A policy file that cannot be compiled makes every command
+"review" until it is fixed (the built-in rules still deny).
+
+Usage:
+    python3 command_policy.py check COMMAND [--policy FILE] [--index DIR]
+    python3 command_policy.py compile [--policy FILE] [--index DIR]
+"""
+
+import os
+import sys
+import json
+import time
+from collections import namedtuple
+
+from shell_command import parse_command
+
+POLICY_PATH = os.path.expanduser(os.environ.get("GOVERNANCE_COMMAND_POLICY", "~/.claude/governance_command_policy.json"))
+INDEX_DIR = os.path.expanduser(os.environ.get("GOVERNANCE_COMMAND_POLICY_INDEX", "~/.claude/governance_command_policy.d"))
+INDEX_VERSION = 1
+
+# Least to most strict
+ACTIONS = ("allow", "review", "deny")
+ANY_EXECUTABLE = "*"
+META_FILE = "_meta.json"
+ANY_SHARD = "any.json"
+# Longest executable name kept whole in a shard file name (hex doubles it)
+SHARD_NAME_MAX_BYTES = 100
+# Indexes of older policy versions are removed once this old
+STALE_INDEX_SECONDS = 60
+
+DEFAULT_RULES = [
+    {
+        "executable": "rm",
+        "action": "deny",
+        "flags": [["-r", "-R", "--recursive"], ["-f", "--force"]],
+        "args": ["/*"],
+        "message": "Dangerous command blocked.",
+    },
+]
+
+# Denied wherever they occur in the command line while the built-in rules
+# apply: a safety net for commands the tokenizer does not look into, like
+# code run by python -c or perl -e (it also denies `echo "rm -rf /"`)
+DEFAULT_RAW_DENY = ["rm -rf /"]
+
+# Without a policy file / with one that cannot be compiled
+_DEFAULT_META = {"default": "allow", "include_default_rules": True, "any": False}
+_FALLBACK_META = {"default": "review", "include_default_rules": True, "any": False}
+
+Decision = namedtuple("Decision", ["action", "message", "rule", "command", "error"])
+
+
+class PolicyError(ValueError):
+    """
+    The policy file is not a valid command policy.
+    """
+
+
+def evaluate_command(command, policy_path=None, index_dir=None):
+    """
+    Decision for a Bash command line under the policy. Never raises: a
+    missing or invalid policy falls back as the module docstring says, and
+    any other error denies the command (fail closed).
+    """
+    try:
+        return _evaluate(command, policy_path, index_dir)
+    except Exception as e:
+        return Decision("deny", f"Command policy check failed: {e!r}", None, command, f"Command policy check of {command!r} failed: {e!r}")
+
+
+def _evaluate(command, policy_path, index_dir):
+    pipeline = parse_command(command).pipeline
+    policy_path = policy_path or POLICY_PATH
+    index_dir = index_dir or INDEX_DIR
+    error = None
+    for _attempt in range(2):
+        policy = load_policy(policy_path, index_dir)
+        try:
+            return _decide(policy, pipeline, command)
+        except FileNotFoundError as e:
+            error = f"Command policy index was removed while reading it: {e}"
+            continue  # Replaced by a newer version of the policy meanwhile
+        except (OSError, ValueError) as e:
+            error = f"Command policy index {policy.directory} is unreadable: {e}"
+            break
+    return _decide(_Policy(None, _FALLBACK_META, error), pipeline, command)
+
+
+def _decide(policy, pipeline, command):
+    """
+    The strictest decision of the policy for the commands of a pipeline
+    parsed from the command line command.
+    """
+    decision = None
+    for parsed in pipeline:
+        current = policy.decide(parsed)
+        if decision is None or ACTIONS.index(current.action) > ACTIONS.index(decision.action):
+            decision = current
+    if decision is None:
+        decision = Decision("allow", "", None, "", policy.error)
+    if policy.builtin and decision.action != "deny":
+        normalized = " ".join(command.split())
+        for position, text in enumerate(DEFAULT_RAW_DENY):
+            if text in normalized:
+                return Decision("deny", DEFAULT_RULES[0]["message"], f"default_raw_deny[{position}]", command, policy.error)
+    return decision
+
+
+def load_policy(policy_path, index_dir):
+    """
+    The compiled policy of policy_path, compiling it into index_dir first if
+    the file changed since it was last compiled.
+    """
+    try:
+        st = os.stat(policy_path)
+    except FileNotFoundError:
+        return _Policy(None, _DEFAULT_META)
+
+    version_dir = os.path.join(index_dir, f"v{INDEX_VERSION}-{st.st_dev}-{st.st_ino}-{st.st_mtime_ns}-{st.st_size}")
+    try:
+        meta = _read_json(os.path.join(version_dir, META_FILE))
+    except FileNotFoundError:
+        try:
+            compile_policy(policy_path, version_dir)
+            meta = _read_json(os.path.join(version_dir, META_FILE))
+        except (OSError, ValueError) as e:
+            return _Policy(None, _FALLBACK_META, f"Command policy {policy_path} is invalid: {e}")
+    except (OSError, ValueError) as e:
+        return _Policy(None, _FALLBACK_META, f"Command policy index {version_dir} is unreadable: {e}")
+    return _Policy(version_dir, meta)
+
+
+class _Policy:
+    """
+    A compiled policy: shards are read from its index directory on first use.
+    """
+
+    def __init__(self, directory, meta, error=None):
+        self.directory = directory
+        self.default = meta["default"]
+        self.builtin = _BUILTIN_RULES if meta["include_default_rules"] else []
+        self.has_any = meta["any"]
+        self.error = error
+        self.shards = {}
+
+    def rules_for(self, executable):
+        if self.directory is None:
+            return []
+        if executable not in self.shards:
+            try:
+                shard = _read_json(os.path.join(self.directory, _shard_name(executable)))
+            except FileNotFoundError:
+                if not os.path.isdir(self.directory):
+                    raise
+                shard = {}  # No rules for this executable
+            self.shards[executable] = shard.get(executable, [])
+        return self.shards[executable]
+
+    def any_rules(self):
+        if not self.has_any:
+            return []
+        if None not in self.shards:  # Not a possible argv0
+            self.shards[None] = _read_json(os.path.join(self.directory, ANY_SHARD))
+        return self.shards[None]
+
+    def decide(self, parsed):
+        flags = _present_flags(parsed.args)
+        applying = [rule for rule in self.rules_for(parsed.argv0) if _applies(rule, parsed.args, flags)]
+        if not applying:
+            applying = [rule for rule in self.any_rules() if _applies(rule, parsed.args, flags)]
+        applying.extend(rule for rule in self.builtin
+                        if rule["executable"] == parsed.argv0 and _applies(rule, parsed.args, flags))
+
+        if not applying:
+            message = self.error or ""
+            if self.default != "allow" and not message:
+                message = f"{parsed.argv0} is not covered by the command policy (default: {self.default})."
+            return Decision(self.default, message, None, parsed.text, self.error)
+
+        rule = max(applying, key=lambda rule: ACTIONS.index(rule["action"]))
+        message = rule["message"] or f"{parsed.argv0} matches command policy rule {rule['rule']} ({rule['action']})."
+        return Decision(rule["action"], message, rule["rule"], parsed.text, self.error)
+
+
+def _applies(rule, args, flags):
+    for group in rule["flags"]:
+        if not any(option in flags for option in group):
+            return False
+    for kind, value in rule["args"]:
+        if not any(_match(kind, value, arg) for arg in args):
+            return False
+    return True
+
+
+def _present_flags(args):
+    """
+    Options in args before "--": long options without their "=value", short
+    option clusters as the whole word and as each of their letters.
+    """
+    flags = set()
+    for arg in args:
+        if arg == "--":
+            break
+        if arg.startswith("--"):
+            flags.add(arg.split("=", 1)[0])
+        elif arg.startswith("-") and len(arg) > 1:
+            flags.add(arg)
+            flags.update("-" + letter for letter in arg[1:])
+    return flags
+
+
+def _match(kind, value, arg):
+    if kind == "exact":
+        return arg == value
+    if kind == "prefix":
+        return arg.startswith(value)
+    if kind == "suffix":
+        return arg.endswith(value)
+    if kind == "contains":
+        return value in arg
+    if kind == "any":
+        return True
+    import re
+
+    return re.match(value, arg) is not None
+
+
+def _compile_pattern(pattern):
+    """
+    [kind, value] for an fnmatch pattern. Plain prefixes, suffixes and
+    substrings are matched without regular expressions.
+    """
+    special = "*?["
+    inner = pattern.strip("*")
+    if not inner and pattern:
+        return ["any", ""]
+    if not any(char in inner for char in special):
+        starts, ends = pattern.startswith("*"), pattern.endswith("*")
+        if pattern.count("*") == starts + ends:
+            if starts and ends:
+                return ["contains", inner]
+            if ends:
+                return ["prefix", inner]
+            if starts:
+                return ["suffix", inner]
+            return ["exact", pattern]
+    import fnmatch
+
+    return ["regex", fnmatch.translate(pattern)]
+
+
+def _compile_rule(rule, label):
+    """
+    Validated, compiled form of one policy rule.
+    """
+    if not isinstance(rule, dict):
+        raise PolicyError(f"{label} is not an object")
+    executable = rule.get("executable")
+    if not isinstance(executable, str) or not executable:
+        raise PolicyError(f"{label} has no executable")
+    if executable != ANY_EXECUTABLE:
+        executable = os.path.basename(executable)  # argv0 is matched without its directory
+    action = rule.get("action")
+    if action not in ACTIONS:
+        raise PolicyError(f"{label} has action {action!r}, expected one of {', '.join(ACTIONS)}")
+
+    flags = rule.get("flags", [])
+    if not isinstance(flags, list):
+        raise PolicyError(f"{label}: flags must be a list")
+    groups = []
+    for group in flags:
+        group = [group] if isinstance(group, str) else group
+        if not isinstance(group, list) or not group or not all(isinstance(option, str) for option in group):
+            raise PolicyError(f"{label}: every flags entry must be an option or a list of options")
+        groups.append(group)
+
+    args = rule.get("args", [])
+    if not isinstance(args, list) or not all(isinstance(pattern, str) for pattern in args):
+        raise PolicyError(f"{label}: args must be a list of patterns")
+
+    message = rule.get("message", "")
+    if not isinstance(message, str):
+        raise PolicyError(f"{label}: message must be a string")
+
+    return {
+        "executable": executable,
+        "action": action,
+        "flags": groups,
+        "args": [_compile_pattern(pattern) for pattern in args],
+        "message": message,
+        "rule": rule.get("name") if isinstance(rule.get("name"), str) else label,
+    }
+
+
+def compile_policy(policy_path, version_dir):
+    """
+    Compile the policy file into the index directory version_dir (written
+    to a temporary directory and renamed into place) and remove indexes of
+    older versions of it. Raises PolicyError or OSError.
+    """
+    with open(policy_path, "r", encoding="utf-8") as f:
+        policy = json.load(f)
+    if not isinstance(policy, dict):
+        raise PolicyError("the policy is not a JSON object")
+    default = policy.get("default", "allow")
+    if default not in ACTIONS:
+        raise PolicyError(f"default is {default!r}, expected one of {', '.join(ACTIONS)}")
+    include_default_rules = policy.get("include_default_rules", True)
+    if not isinstance(include_default_rules, bool):
+        raise PolicyError("include_default_rules must be true or false")
+    rules = policy.get("rules", [])
+    if not isinstance(rules, list):
+        raise PolicyError("rules must be a list")
+
+    shards = {}
+    any_rules = []
+    for position, rule in enumerate(rules):
+        compiled = _compile_rule(rule, f"rules[{position}]")
+        if compiled["executable"] == ANY_EXECUTABLE:
+            any_rules.append(compiled)
+        else:
+            name = _shard_name(compiled["executable"])
+            shards.setdefault(name, {}).setdefault(compiled["executable"], []).append(compiled)
+
+    index_dir = os.path.dirname(version_dir)
+    os.makedirs(index_dir, mode=0o700, exist_ok=True)
+    tmp_dir = os.path.join(index_dir, f".tmp-{os.getpid()}-{time.time_ns()}")
+    os.mkdir(tmp_dir, 0o700)
+    try:
+        for name, shard in shards.items():
+            _write_json(os.path.join(tmp_dir, name), shard)
+        if any_rules:
+            _write_json(os.path.join(tmp_dir, ANY_SHARD), any_rules)
+        _write_json(os.path.join(tmp_dir, META_FILE), {
+            "default": default,
+            "include_default_rules": include_default_rules,
+            "any": bool(any_rules),
+            "source": os.path.abspath(policy_path),
+            "rules": len(rules),
+            "executables": sum(len(shard) for shard in shards.values()),
+        })
+        os.rename(tmp_dir, version_dir)
+    except OSError:
+        _remove_dir(tmp_dir)
+        if not os.path.exists(os.path.join(version_dir, META_FILE)):
+            raise
+        return  # Compiled by another process meanwhile
+    _remove_stale_indexes(index_dir, version_dir)
+
+
+def _shard_name(executable):
+    """
+    File name of the shard holding the rules of an executable. Names too long
+    for a file name share shards by prefix; shards are keyed by full name.
+    """
+    return "x" + executable.encode("utf-8")[:SHARD_NAME_MAX_BYTES].hex() + ".json"
+
+
+def _remove_stale_indexes(index_dir, current):
+    """
+    Remove the indexes of older versions of the policy file of current (other
+    policy files may share index_dir) and temporary directories left by
+    interrupted compiles. A process still reading a removed index retries
+    with the current one (see evaluate_command).
+    """
+    source = _read_json(os.path.join(current, META_FILE))["source"]
+    cutoff = time.time() - STALE_INDEX_SECONDS
+    try:
+        with os.scandir(index_dir) as it:
+            candidates = [entry.path for entry in it
+                          if entry.is_dir() and entry.path != current and entry.stat().st_mtime < cutoff]
+    except OSError:
+        return
+    for path in candidates:
+        try:
+            stale = _read_json(os.path.join(path, META_FILE))["source"] == source
+        except FileNotFoundError:
+            stale = os.path.basename(path).startswith(".tmp-")
+        except (OSError, ValueError, KeyError, TypeError):
+            stale = False
+        if stale:
+            _remove_dir(path)
+
+
+def _remove_dir(path):
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                _remove_quietly(entry.path)
+        os.rmdir(path)
+    except OSError:
+        pass  # Removed by another process meanwhile
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path, value):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(value, f, separators=(",", ":"))
+
+
+_BUILTIN_RULES = [_compile_rule(rule, f"default_rules[{position}]") for position, rule in enumerate(DEFAULT_RULES)]
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Governance command policy")
+    parser.add_argument("command", choices=["check", "compile"])
+    parser.add_argument("line", nargs="?", help="Bash command line to check")
+    parser.add_argument("--policy", default=POLICY_PATH, help="Policy file")
+    parser.add_argument("--index", default=INDEX_DIR, help="Index directory")
+    args = parser.parse_args()
+
+    if args.command == "compile":
+        policy = load_policy(args.policy, args.index)
+        if policy.error:
+            print(f"Error: {policy.error}", file=sys.stderr)
+            return 1
+        if policy.directory is None:
+            print(f"No policy file at {args.policy}; only the default rules apply.")
+            return 0
+        meta = _read_json(os.path.join(policy.directory, META_FILE))
+        print(f"Index: {policy.directory}")
+        print(f"Rules: {meta['rules']} for {meta['executables']} executables"
+              f"{' and any executable' if meta['any'] else ''}")
+        print(f"Default: {meta['default']}")
+        return 0
+
+    if args.line is None:
+        parser.error("check needs a command line")
+    decision = evaluate_command(args.line, args.policy, args.index)
+    if decision.error:
+        print(f"Error: {decision.error}", file=sys.stderr)
+    print(f"{decision.action}: {decision.command or args.line}")
+    if decision.rule:
+        print(f"Rule: {decision.rule}")
+    if decision.message:
+        print(f"Message: {decision.message}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,87 +2,105 @@
 """
 Governance Hook for Claude Code Enterprise.
 Handles UserPromptSubmit (PII/Risk), PreToolUse (Guardrails), PostToolUse (Output Scan), and SessionStart (Audit Init).
+
+The hook runs as a new process for every event, so module imports are part of
+the cost of each tool call. Only what every event needs is imported up front;
+argparse, logging, PII redaction and SIEM forwarding are imported on the code
+paths that use them (see benchmarks/check_governance_importtime.py).
 """
 
 import json
 import sys
 import os
-import re
-import argparse
-import logging
-import urllib.request
-import urllib.error
-from datetime import datetime
+import time
+
+from audit_store import append_event
 
 # Configuration
 AUDIT_LOG_PATH = os.path.expanduser("~/.claude/governance_audit.log")
 SIEM_URL = os.environ.get("GOVERNANCE_SIEM_URL")
 
-# Setup logging
-os.makedirs(os.path.dirname(AUDIT_LOG_PATH), exist_ok=True)
-logging.basicConfig(
-    filename=AUDIT_LOG_PATH,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+_logging_configured = False
+
+def get_logger():
+    """
+    Logging to AUDIT_LOG_PATH for operational errors, set up on first use.
+    """
+    global _logging_configured
+    import logging
+
+    if not _logging_configured:
+        os.makedirs(os.path.dirname(AUDIT_LOG_PATH), exist_ok=True)
+        logging.basicConfig(
+            filename=AUDIT_LOG_PATH,
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+        _logging_configured = True
+    return logging
+
+def timestamp():
+    """
+    Current local time in the format of datetime.now().isoformat().
+    """
+    seconds, nanoseconds = divmod(time.time_ns(), 1_000_000_000)
+    formatted = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(seconds))
+    microseconds = nanoseconds // 1000
+    return f"{formatted}.{microseconds:06d}" if microseconds else formatted
 
 def send_to_siem(log_entry):
     """
-    Sends the log entry to a configured SIEM via HTTP POST.
+    Queues the log entry for the configured SIEM.
+    Only appends to a local spool; siem_forwarder ships it in the background.
     """
     if not SIEM_URL:
         return
 
     try:
-        data = json.dumps(log_entry).encode('utf-8')
-        req = urllib.request.Request(SIEM_URL, data=data, headers={'Content-Type': 'application/json'})
-        with urllib.request.urlopen(req, timeout=2) as response:
-            pass # Success
+        from siem_forwarder import ensure_forwarder, spool_event
+
+        for message in spool_event(log_entry):
+            get_logger().error(message)
+        ensure_forwarder()
     except Exception as e:
         # Log failure to local log but don't crash
-        logging.error(f"SIEM Logging Failed: {str(e)}")
+        get_logger().error(f"SIEM Logging Failed: {str(e)}")
 
 def log_audit(event_type, details, risk_level="LOW", decision="ALLOWED"):
     """
-    Logs an audit event to the tamper-proof (simulated) log and optional SIEM.
+    Logs an audit event to the audit store (see audit_store) and optional SIEM.
+    Operational errors go to AUDIT_LOG_PATH.
     """
     entry = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": timestamp(),
         "event_type": event_type,
         "risk_level": risk_level,
         "decision": decision,
         "details": details,
         "model_version": os.environ.get("CLAUDE_MODEL_VERSION", "unknown"),
     }
-    logging.info(json.dumps(entry))
+    try:
+        append_event(entry)
+    except Exception as e:
+        # Keep the event in the plain log rather than losing it
+        logger = get_logger()
+        logger.error(f"Audit Store Failed: {str(e)}")
+        logger.info(json.dumps(entry))
     send_to_siem(entry)
     return entry
 
 def check_pii(text):
     """
-    Simple regex-based PII detection.
+    Regex-based PII detection (see pii_redaction for the patterns).
     Includes Email, SSN, Credit Card, Employee ID, Internal Projects.
     """
     if not isinstance(text, str):
         return False, text
 
-    patterns = [
-        (r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", "[REDACTED_EMAIL]"),
-        (r"\b\d{3}-\d{2}-\d{4}\b", "[REDACTED_SSN]"),
-        (r"\b(?:\d[ -]*?){13,16}\b", "[REDACTED_CREDIT_CARD]"),
-        (r"\bEMP-\d{5}\b", "[REDACTED_EMPLOYEE_ID]"),
-        (r"\bPROJ-[A-Z]{3,}\b", "[REDACTED_PROJECT_CODE]")
-    ]
-
-    redacted_text = text
-    found_pii = False
+    from pii_redaction import find_pii, redact_pii
 
-    for pattern, replacement in patterns:
-        if re.search(pattern, redacted_text):
-            redacted_text = re.sub(pattern, replacement, redacted_text)
-            found_pii = True
-
-    return found_pii, redacted_text
+    matches = find_pii(text)
+    return bool(matches), redact_pii(text, matches)
 
 def classify_risk(text):
     """
@@ -101,6 +119,11 @@ def request_user_approval(risk_level):
     """
     Attempts to prompt the user via /dev/tty for HITL approval.
     Returns True if approved, False otherwise.
+
+    The time the user takes to answer does not count against a timer
+    running in this process, such as the per-handler timeout of the hook
+    dispatcher: the timer is paused while the prompt waits and resumed
+    with its remaining time afterwards.
     """
     try:
         # Only works if attached to a terminal
@@ -110,11 +133,59 @@ def request_user_approval(risk_level):
         with open("/dev/tty", "r+") as tty:
             tty.write(f"\n\033[1;33m[Governance] WARN: Output classified as {risk_level} Risk.\033[0m\n")
             tty.write("[Governance] Do you confirm you have reviewed it? [y/N]: ")
-            response = tty.readline().strip().lower()
+            tty.flush()
+            remaining, interval = pause_alarm()
+            try:
+                response = tty.readline().strip().lower()
+            finally:
+                resume_alarm(remaining, interval)
             return response == 'y'
     except Exception:
         return False
 
+def pause_alarm():
+    """
+    Stop the ITIMER_REAL timer, returning (remaining, interval) for
+    resume_alarm(). (0, 0) where there is no such timer.
+    """
+    import signal
+
+    if not hasattr(signal, "setitimer"):
+        return 0, 0
+    return signal.setitimer(signal.ITIMER_REAL, 0)
+
+def resume_alarm(remaining, interval):
+    """
+    Restart a timer stopped by pause_alarm() with the time it had left.
+    """
+    if remaining > 0:
+        import signal
+
+        signal.setitimer(signal.ITIMER_REAL, remaining, interval)
+
+def check_command_policy(tool_name, tool_input):
+    """
+    Decision of the command policy (see command_policy) for a Bash tool
+    input, or None for other tools. Policy errors go to AUDIT_LOG_PATH; a
+    command the policy cannot be checked for at all is denied.
+    """
+    command = tool_input.get("command") if isinstance(tool_input, dict) else None
+    if tool_name != "Bash" or not isinstance(command, str):
+        return None
+
+    try:
+        from command_policy import evaluate_command
+
+        decision = evaluate_command(command)
+    except Exception as e:
+        from types import SimpleNamespace
+
+        decision = SimpleNamespace(action="deny", message=f"Command policy check failed: {e!r}",
+                                   rule=None, command=command, error=f"Command policy unavailable: {e!r}")
+    if decision.error:
+        get_logger().error(decision.error)
+    return decision
+
 def handle_session_start(data):
     """
     Initialize session audit.
@@ -177,16 +248,35 @@ def handle_pre_tool_use(data):
     tool_input = data.get("tool_input")
     session_id = data.get("session_id")
 
-    log_audit("TOOL_USE", {
+    details = {
         "session_id": session_id,
         "tool_name": tool_name,
         "tool_input": tool_input
-    })
+    }
+    decision = check_command_policy(tool_name, tool_input)
+    if decision is None or decision.action == "allow":
+        log_audit("TOOL_USE", details)
+        sys.exit(0)
 
-    if tool_name == "Bash" and "rm -rf /" in str(tool_input):
-        print("Governance Block: Dangerous command blocked.", file=sys.stderr)
+    details["policy_rule"] = decision.rule
+    details["policy_command"] = decision.command
+    if decision.error:
+        details["policy_error"] = decision.error
+
+    if decision.action == "deny":
+        log_audit("TOOL_USE", details, risk_level="HIGH", decision="BLOCKED")
+        print(f"Governance Block: {decision.message}", file=sys.stderr)
         sys.exit(2) # Block
 
+    # Review: ask the user to confirm, whatever their permission settings
+    log_audit("TOOL_USE", details, risk_level="MEDIUM", decision="REVIEW")
+    print(json.dumps({
+        "hookSpecificOutput": {
+            "hookEventName": "PreToolUse",
+            "permissionDecision": "ask",
+            "permissionDecisionReason": f"Governance Review: {decision.message}",
+        }
+    }))
     sys.exit(0)
 
 def handle_post_tool_use(data):
@@ -226,11 +316,33 @@ def handle_post_tool_use(data):
 
     sys.exit(0)
 
+# Hook event -> handler; handlers always end with sys.exit (2 blocks)
+EVENT_HANDLERS = {
+    "SessionStart": handle_session_start,
+    "UserPromptSubmit": handle_user_prompt,
+    "PreToolUse": handle_pre_tool_use,
+    "PostToolUse": handle_post_tool_use,
+}
+
+
+def parse_event(argv):
+    """
+    The --event argument. argparse is only needed for anything but the
+    "--event NAME" that hooks.json passes.
+    """
+    if len(argv) == 2 and argv[0] == "--event":
+        return argv[1]
+    if len(argv) == 1 and argv[0].startswith("--event="):
+        return argv[0][len("--event="):]
+
+    import argparse
 
-def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--event", required=True, help="Hook event type")
-    args = parser.parse_args()
+    return parser.parse_args(argv).event
+
+def main():
+    event = parse_event(sys.argv[1:])
 
     try:
         raw_input = sys.stdin.read()
@@ -240,16 +352,10 @@ def main():
     except Exception:
         sys.exit(0)
 
-    if args.event == "SessionStart":
-        handle_session_start(data)
-    elif args.event == "UserPromptSubmit":
-        handle_user_prompt(data)
-    elif args.event == "PreToolUse":
-        handle_pre_tool_use(data)
-    elif args.event == "PostToolUse":
-        handle_post_tool_use(data)
-    else:
+    handler = EVENT_HANDLERS.get(event)
+    if handler is None:
         sys.exit(0)
+    handler(data)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Spool and background forwarder for shipping governance audit events to a SIEM.
+
+Hooks only append each event as one NDJSON line to a local spool file
+(spool_event), so a slow or unreachable SIEM never delays a prompt or tool
+call. A single forwarder process per user, started on demand by the hooks,
+seals the spool into segments and ships them as NDJSON bulk POSTs over a
+kept-alive connection, retrying with exponential backoff. Delivery is at
+least once: progress within a segment is recorded after each acknowledged
+batch. The spool is bounded; when the SIEM is down for long, the oldest
+segments are dropped first.
+
+Usage:
+    python3 siem_forwarder.py run [--once] [--url URL] [--spool DIR]
+    python3 siem_forwarder.py status [--spool DIR]
+"""
+
+import os
+import sys
+import json
+import time
+
+SPOOL_DIR = os.path.expanduser("~/.claude/governance_siem_spool")
+ACTIVE_SEGMENT = "active.ndjson"
+SEGMENT_PREFIX = "segment-"
+LOCK_FILE = "forwarder.lock"
+
+# Seal the active segment once it reaches this size
+SEGMENT_MAX_BYTES = 4 * 1024 * 1024
+# Drop the oldest segments beyond this total spool size
+SPOOL_MAX_BYTES = int(float(os.environ.get("GOVERNANCE_SIEM_SPOOL_MAX_MB", "100")) * 1024 * 1024)
+
+BATCH_MAX_EVENTS = int(os.environ.get("GOVERNANCE_SIEM_BATCH_SIZE", "500"))
+BATCH_MAX_BYTES = 1024 * 1024
+
+# Appends to a segment sealed less than this long ago may still be in flight
+SEAL_GRACE_SECONDS = 1.0
+POLL_INTERVAL = 1.0
+IDLE_EXIT_SECONDS = 60
+RETRY_MAX_SECONDS = 60
+HTTP_TIMEOUT = 10
+
+
+def spool_event(entry, spool_dir=SPOOL_DIR):
+    """
+    Append one audit event to the spool. This is all the hook does per event.
+    A single O_APPEND write keeps concurrent hook processes from interleaving.
+    Returns the segments dropped to keep the spool bounded, see enforce_spool_limit().
+    """
+    line = (json.dumps(entry) + "\n").encode("utf-8")
+    os.makedirs(spool_dir, mode=0o700, exist_ok=True)
+    fd = os.open(os.path.join(spool_dir, ACTIVE_SEGMENT), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, line)
+        size = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+
+    if size >= SEGMENT_MAX_BYTES:
+        # The forwarder is not keeping up (or not running): keep the spool bounded
+        seal_active_segment(spool_dir)
+        return enforce_spool_limit(spool_dir)
+    return []
+
+
+def seal_active_segment(spool_dir=SPOOL_DIR):
+    """
+    Rename the active segment to a sealed, time-ordered segment name.
+    """
+    active = os.path.join(spool_dir, ACTIVE_SEGMENT)
+    sealed = os.path.join(spool_dir, f"{SEGMENT_PREFIX}{time.time_ns():020d}-{os.getpid()}.ndjson")
+    try:
+        if os.path.getsize(active) == 0:
+            return None
+        os.rename(active, sealed)
+    except FileNotFoundError:
+        return None
+    return sealed
+
+
+def sealed_segments(spool_dir=SPOOL_DIR):
+    """
+    Sealed segment paths, oldest first.
+    """
+    try:
+        names = os.listdir(spool_dir)
+    except FileNotFoundError:
+        return []
+    return [os.path.join(spool_dir, name) for name in sorted(names)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(".ndjson")]
+
+
+def spool_size(spool_dir=SPOOL_DIR):
+    total = 0
+    for path in sealed_segments(spool_dir) + [os.path.join(spool_dir, ACTIVE_SEGMENT)]:
+        try:
+            total += os.path.getsize(path)
+        except OSError:
+            pass
+    return total
+
+
+def enforce_spool_limit(spool_dir=SPOOL_DIR, max_bytes=None):
+    """
+    Delete the oldest sealed segments until the spool fits in max_bytes.
+    Returns a message for each dropped segment: this also runs in hook
+    processes, where logging is the caller's (governance_hook.get_logger).
+    """
+    max_bytes = SPOOL_MAX_BYTES if max_bytes is None else max_bytes
+    total = spool_size(spool_dir)
+    dropped = []
+    for path in sealed_segments(spool_dir):
+        if total <= max_bytes:
+            break
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            continue
+        _remove_quietly(path + ".offset")
+        total -= size
+        dropped.append(f"SIEM spool over {max_bytes} bytes: dropped {size} bytes of unshipped events ({path})")
+    return dropped
+
+
+def ensure_forwarder(spool_dir=SPOOL_DIR):
+    """
+    Start the background forwarder unless one is already running.
+    The forwarder holds an exclusive lock on the spool for its lifetime.
+    """
+    import fcntl
+    import subprocess
+
+    os.makedirs(spool_dir, mode=0o700, exist_ok=True)
+    fd = os.open(os.path.join(spool_dir, LOCK_FILE), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return  # Running
+    finally:
+        os.close(fd)  # Also releases the lock if we got it
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "run", "--spool", spool_dir],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+class SIEMClient:
+    """
+    Posts NDJSON batches to the SIEM over one kept-alive HTTP connection.
+    """
+
+    def __init__(self, url, timeout=HTTP_TIMEOUT):
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported SIEM URL: {url}")
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        self.timeout = timeout
+        self._conn = None
+
+    def post(self, body):
+        """
+        Send one batch; raises OSError or http.client.HTTPException on failure.
+        """
+        import http.client
+
+        if self._conn is None:
+            conn_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self._conn = conn_class(self.host, self.port, timeout=self.timeout)
+        try:
+            self._conn.request("POST", self.path, body=body, headers={
+                "Content-Type": "application/x-ndjson",
+                "Connection": "keep-alive",
+            })
+            response = self._conn.getresponse()
+            response.read()
+        except Exception:
+            self.close()
+            raise
+        if response.will_close:
+            self.close()
+        if not 200 <= response.status < 300:
+            raise http.client.HTTPException(f"SIEM responded {response.status} {response.reason}")
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def ship_segment(path, client):
+    """
+    Ship a sealed segment in batches, resuming after the last acknowledged one.
+    Deletes the segment once everything was acknowledged. Only the forwarder
+    runs this, so it logs to the forwarder's log.
+    """
+    import logging
+
+    offset_path = path + ".offset"
+    try:
+        with open(offset_path, "r") as f:
+            offset = int(f.read().strip() or 0)
+    except (OSError, ValueError):
+        offset = 0
+
+    with open(path, "rb") as f:
+        f.seek(offset)
+        batch = []
+        batch_bytes = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                logging.error(f"SIEM spool: dropping truncated event at the end of {path}")
+                break
+            batch.append(line)
+            batch_bytes += len(line)
+            if len(batch) >= BATCH_MAX_EVENTS or batch_bytes >= BATCH_MAX_BYTES:
+                client.post(b"".join(batch))
+                offset += batch_bytes
+                _write_offset(offset_path, offset)
+                batch = []
+                batch_bytes = 0
+        if batch:
+            client.post(b"".join(batch))
+
+    _remove_quietly(path)
+    _remove_quietly(offset_path)
+
+
+def run_forwarder(url, spool_dir=SPOOL_DIR, once=False, idle_exit=IDLE_EXIT_SECONDS):
+    """
+    Forward spooled events until idle for idle_exit seconds (or, with once,
+    until the spool is empty). Returns False if another forwarder is running
+    or, with once, if shipping failed.
+    """
+    import fcntl
+    import logging
+    import random
+
+    os.makedirs(spool_dir, mode=0o700, exist_ok=True)
+    lock_file = open(os.path.join(spool_dir, LOCK_FILE), "w")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+
+    client = SIEMClient(url)
+    backoff = 0
+    idle_since = time.monotonic()
+    try:
+        while True:
+            seal_active_segment(spool_dir)
+            for message in enforce_spool_limit(spool_dir):
+                logging.error(message)
+            segments = sealed_segments(spool_dir)
+            if not segments:
+                if once or time.monotonic() - idle_since > idle_exit:
+                    return True
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            idle_since = time.monotonic()
+            try:
+                for path in segments:
+                    # Give appends that opened the file before it was sealed time to land
+                    age = time.time() - os.path.getmtime(path)
+                    if age < SEAL_GRACE_SECONDS:
+                        time.sleep(SEAL_GRACE_SECONDS - age)
+                    ship_segment(path, client)
+                backoff = 0
+            except FileNotFoundError:
+                continue  # Segment dropped by enforce_spool_limit meanwhile
+            except Exception as e:
+                if once:
+                    logging.error(f"SIEM Logging Failed: {e}")
+                    return False
+                backoff = min(max(backoff * 2, 1), RETRY_MAX_SECONDS)
+                logging.error(f"SIEM Logging Failed (retrying in {backoff}s): {e}")
+                time.sleep(backoff * random.uniform(0.5, 1.0))
+    finally:
+        client.close()
+        lock_file.close()
+
+
+def _write_offset(path, offset):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(offset))
+    os.replace(tmp_path, path)
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def main():
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description="Governance audit SIEM forwarder")
+    parser.add_argument("command", choices=["run", "status"])
+    parser.add_argument("--url", default=os.environ.get("GOVERNANCE_SIEM_URL"), help="SIEM endpoint")
+    parser.add_argument("--spool", default=SPOOL_DIR, help="Spool directory")
+    parser.add_argument("--once", action="store_true", help="Exit as soon as the spool is empty")
+    args = parser.parse_args()
+
+    if args.command == "status":
+        print(f"Spool: {args.spool}")
+        print(f"Sealed segments: {len(sealed_segments(args.spool))}")
+        print(f"Unshipped bytes: {spool_size(args.spool)}")
+        return 0
+
+    if not args.url:
+        print("Error: no SIEM URL (set GOVERNANCE_SIEM_URL or pass --url)", file=sys.stderr)
+        return 1
+    if not args.once:
+        os.makedirs(args.spool, mode=0o700, exist_ok=True)
+        logging.basicConfig(
+            filename=os.path.join(args.spool, "forwarder.log"),
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s'
+        )
+    return 0 if run_forwarder(args.url, args.spool, once=args.once) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
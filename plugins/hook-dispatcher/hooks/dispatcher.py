@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the governance-layer, hookify and security-guidance hooks.
+
+Installed separately, every tool call starts one Python process per plugin,
+each parsing the same hook input. The dispatcher reads the input once and
+runs the handler of each plugin in this process, one after the other, each
+under its own timeout and with its exceptions, exit code, stdout and stderr
+captured. The results are then merged the way Claude Code combines the
+results of separate hooks:
+
+    - any handler exiting with 2 blocks; the stderr of the blocking handlers
+      is passed on with exit code 2
+    - otherwise JSON outputs are merged (deny > ask > allow, "block" wins,
+      messages and context are concatenated), and failures, timeouts and
+      other non-zero exits become warnings in systemMessage
+
+Environment:
+    HOOK_DISPATCHER_PLUGINS_DIR  Directory holding the plugins (default: the
+                                 parent of this plugin)
+    HOOK_DISPATCHER_SKIP         Comma-separated handler names not to run
+    HOOK_DISPATCHER_TIMEOUT      Timeout in seconds for every handler
+    HOOK_DISPATCHER_DEBUG=1      Print per-handler timings to stderr
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import signal
+import traceback
+from collections import namedtuple
+from contextlib import redirect_stderr, redirect_stdout
+
+PLUGIN_ROOT = os.environ.get("CLAUDE_PLUGIN_ROOT") or os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+Handler = namedtuple("Handler", ["name", "events", "tools", "timeout", "run"])
+HandlerResult = namedtuple("HandlerResult", ["name", "exit_code", "stdout", "stderr", "error", "seconds"])
+
+
+class HandlerTimeout(BaseException):
+    """
+    Raised in a handler when its time is up. Not an Exception, so handlers
+    catching Exception do not swallow it.
+    """
+
+
+def plugins_dir():
+    return os.environ.get("HOOK_DISPATCHER_PLUGINS_DIR") or os.path.dirname(PLUGIN_ROOT)
+
+
+def _import_from(directory, module_name):
+    """
+    Import a plugin module, with its directory on sys.path like when the
+    plugin runs as a script.
+    """
+    import importlib
+
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    return importlib.import_module(module_name)
+
+
+def run_governance(event, data):
+    governance_hook = _import_from(os.path.join(plugins_dir(), "governance-layer", "hooks"), "governance_hook")
+    handler = governance_hook.EVENT_HANDLERS.get(event)
+    if handler is not None:
+        handler(data)
+
+
+def run_hookify(event, data):
+    # Same error handling as the scripts in hookify/hooks: never block on errors
+    try:
+        client = _import_from(plugins_dir(), "hookify.core.client")
+        result = client.evaluate(client.rule_event_for(event, data), data)
+    except ImportError as e:
+        result = {"systemMessage": f"Hookify import error: {e}"}
+    except Exception as e:
+        result = {"systemMessage": f"Hookify error: {str(e)}"}
+    print(json.dumps(result))
+
+
+def run_security_guidance(event, data):
+    hook = _import_from(os.path.join(plugins_dir(), "security-guidance", "hooks"), "security_reminder_hook")
+    return hook.run_hook(data)
+
+
+# In the order they run, named after their plugin directories. Timeouts and
+# tool matchers as in each plugin's hooks.json (60 s is Claude Code's default).
+HANDLERS = [
+    Handler("governance-layer", ("SessionStart", "UserPromptSubmit", "PreToolUse", "PostToolUse"), None, 60,
+            run_governance),
+    Handler("hookify", ("PreToolUse", "PostToolUse", "Stop", "UserPromptSubmit"), None, 10, run_hookify),
+    Handler("security-guidance", ("PreToolUse",), ("Edit", "Write", "MultiEdit"), 60, run_security_guidance),
+]
+
+
+def select_handlers(event, data):
+    """
+    Handlers registered for an event (and tool), skipping uninstalled plugins.
+    """
+    skip = {name.strip() for name in os.environ.get("HOOK_DISPATCHER_SKIP", "").split(",") if name.strip()}
+    tool_name = data.get("tool_name")
+    selected = []
+    for handler in HANDLERS:
+        if handler.name in skip or event not in handler.events:
+            continue
+        if handler.tools is not None and tool_name not in handler.tools:
+            continue
+        if not os.path.isdir(os.path.join(plugins_dir(), handler.name)):
+            continue
+        selected.append(handler)
+    return selected
+
+
+def _raise_timeout(signum, frame):
+    raise HandlerTimeout()
+
+
+def run_handler(handler, event, data, raw_input):
+    """
+    Run one handler as if it were a hook script of its own: with the hook
+    input on stdin, stdout and stderr captured and sys.exit() returning
+    its exit code. Exceptions and timeouts are non-blocking errors.
+    """
+    timeout = float(os.environ.get("HOOK_DISPATCHER_TIMEOUT", handler.timeout))
+    # SIGALRM also interrupts long regex matches, which a watchdog thread could not
+    use_alarm = hasattr(signal, "setitimer") and timeout > 0
+    stdout, stderr = io.StringIO(), io.StringIO()
+    exit_code, error = 0, None
+    saved_stdin = sys.stdin
+    sys.stdin = io.StringIO(raw_input)
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout) if use_alarm else None
+    start = time.perf_counter()
+    try:
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, timeout)
+                try:
+                    exit_code = handler.run(event, data) or 0
+                finally:
+                    if use_alarm:
+                        signal.setitimer(signal.ITIMER_REAL, 0)
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    exit_code = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    exit_code = 1
+            except HandlerTimeout:
+                exit_code, error = 1, f"timed out after {timeout:g}s"
+            except Exception as e:
+                exit_code, error = 1, f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+    finally:
+        sys.stdin = saved_stdin
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous_handler)
+    return HandlerResult(handler.name, exit_code, stdout.getvalue(), stderr.getvalue(), error,
+                         time.perf_counter() - start)
+
+
+def _join(*parts):
+    return "\n\n".join(part for part in parts if part)
+
+
+def merge_outputs(merged, output):
+    """
+    Merge one handler's JSON output into merged, keeping the strongest decision.
+    """
+    for key, value in output.items():
+        if key in ("systemMessage", "stopReason"):
+            merged[key] = _join(merged.get(key), value)
+        elif key == "continue":
+            merged[key] = merged.get(key, True) and value
+        elif key == "suppressOutput":
+            merged[key] = merged.get(key, False) or value
+        elif key == "decision":
+            # "block" over "approve"; the reason goes with the decision kept
+            if merged.get("decision") == value:
+                merged["reason"] = _join(merged.get("reason"), output.get("reason"))
+            elif merged.get("decision") != "block":
+                merged["decision"] = value
+                merged["reason"] = output.get("reason")
+            if not merged.get("reason"):
+                merged.pop("reason", None)
+        elif key == "reason":
+            continue  # Handled with decision
+        elif key == "hookSpecificOutput" and isinstance(value, dict):
+            merge_specific_output(merged.setdefault(key, {}), value)
+        else:
+            merged.setdefault(key, value)
+
+
+PERMISSION_PRECEDENCE = {"deny": 3, "ask": 2, "allow": 1}
+
+
+def merge_specific_output(merged, output):
+    for key, value in output.items():
+        if key == "permissionDecision":
+            current = merged.get(key)
+            rank = PERMISSION_PRECEDENCE.get(value, 0)
+            if current == value:
+                merged["permissionDecisionReason"] = _join(merged.get("permissionDecisionReason"),
+                                                           output.get("permissionDecisionReason"))
+            elif rank > PERMISSION_PRECEDENCE.get(current, 0):
+                merged[key] = value
+                merged["permissionDecisionReason"] = output.get("permissionDecisionReason")
+            if not merged.get("permissionDecisionReason"):
+                merged.pop("permissionDecisionReason", None)
+        elif key == "permissionDecisionReason":
+            continue  # Handled with permissionDecision
+        elif key == "additionalContext":
+            merged[key] = _join(merged.get(key), value)
+        else:
+            merged.setdefault(key, value)
+
+
+def merge_results(event, results):
+    """
+    Combine handler results into one (exit code, stdout, stderr).
+    """
+    blocking = [result for result in results if result.exit_code == 2]
+    if blocking:
+        return 2, "", "\n\n".join(result.stderr.strip() for result in blocking if result.stderr.strip())
+
+    merged = {}
+    context = []
+    warnings = []
+    for result in results:
+        if result.exit_code != 0:
+            detail = result.error or result.stderr.strip() or f"exit code {result.exit_code}"
+            if result.error and result.stderr.strip():
+                detail = f"{detail}\n{result.stderr.strip()}"
+            warnings.append(f"{result.name} hook error: {detail}")
+            continue
+        text = result.stdout.strip()
+        if not text:
+            continue
+        try:
+            output = json.loads(text)
+        except ValueError:
+            output = None
+        if isinstance(output, dict):
+            merge_outputs(merged, output)
+        else:
+            context.append(text)  # Plain stdout, added as context for prompt/session events
+
+    if warnings:
+        merged["systemMessage"] = _join(merged.get("systemMessage"), "\n".join(warnings))
+    if not merged:
+        return 0, "\n".join(context), ""
+    if context and event in ("UserPromptSubmit", "SessionStart"):
+        specific = merged.setdefault("hookSpecificOutput", {})
+        specific.setdefault("hookEventName", event)
+        specific["additionalContext"] = _join(specific.get("additionalContext"), "\n".join(context))
+    return 0, json.dumps(merged), ""
+
+
+def dispatch(event, raw_input):
+    """
+    Run all handlers for one hook event. Returns (exit code, stdout, stderr).
+    """
+    try:
+        data = json.loads(raw_input)
+    except ValueError:
+        return 0, "", ""  # Like every handler: allow if the input cannot be parsed
+    if not isinstance(data, dict):
+        return 0, "", ""
+    event = event or data.get("hook_event_name", "")
+
+    results = [run_handler(handler, event, data, raw_input) for handler in select_handlers(event, data)]
+    exit_code, stdout, stderr = merge_results(event, results)
+    if os.environ.get("HOOK_DISPATCHER_DEBUG") == "1":
+        timings = ", ".join(f"{r.name} {r.seconds * 1000:.1f}ms (exit {r.exit_code})" for r in results)
+        stderr = _join(stderr, f"[hook-dispatcher] {event}: {timings or 'no handlers'}")
+    return exit_code, stdout, stderr
+
+
+def main():
+    event = None
+    if len(sys.argv) > 2 and sys.argv[1] == "--event":
+        event = sys.argv[2]
+    exit_code, stdout, stderr = dispatch(event, sys.stdin.read())
+    if stdout:
+        print(stdout)
+    if stderr:
+        print(stderr, file=sys.stderr)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
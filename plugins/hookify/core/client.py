@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Hook-side client for the hookify rule daemon.
+
+Hook scripts call evaluate(), which asks the per-project daemon (see
+hookify.core.daemon) when one is running and otherwise loads and evaluates
+rules in-process exactly as before. Every hook call imports this module,
+so everything but the standard basics is imported in the function that
+needs it: the rule engine modules are not loaded on the daemon path, nor
+the socket module and the decision cache when they are not used.
+
+Environment:
+    HOOKIFY_DAEMON=0            Never contact the daemon
+    HOOKIFY_DAEMON_AUTOSTART=1  Start a daemon in the background when none
+                                is running (this call still runs in-process)
+    HOOKIFY_PROFILE=1           Record rule timings (see hookify.core.profiler)
+    HOOKIFY_REGEX_BUDGET_MS=N   Time budget of regexes prone to catastrophic
+                                backtracking (see hookify.core.regex_budget)
+    HOOKIFY_DECISION_CACHE=0    Never reuse the decisions of repeated tool calls
+                                (see hookify.core.decision_cache)
+"""
+
+import os
+import sys
+import json
+from typing import Dict, Any, Optional, Tuple
+
+
+# Must match hookify.core.daemon.socket_path(), duplicated to avoid importing it
+def _socket_path() -> Optional[str]:
+    """Socket of the current project's daemon; None if the runtime directory
+    is not private, since anyone could then answer in the daemon's place."""
+    import hashlib
+    from hookify.core.runtime_dir import runtime_dir
+
+    directory = runtime_dir()
+    if directory is None:
+        return None
+    project = os.path.realpath(os.getcwd())
+    digest = hashlib.sha1(project.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(directory, f"{digest}.sock")
+
+
+def evaluate(event: Optional[str], input_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Evaluate hookify rules for a hook event.
+
+    A repeat of a tool call the session already made is answered from the
+    decision cache as long as the rule files have not changed.
+
+    Args:
+        event: Rule event filter ("bash", "file", "stop", "prompt" or None)
+        input_data: Hook input JSON
+
+    Returns:
+        Hook response dict (empty if no rules match)
+    """
+    cache = None
+    if input_data.get('session_id') and os.environ.get('HOOKIFY_DECISION_CACHE', '1') != '0':
+        from hookify.core.decision_cache import DecisionCache, decision_key
+
+        cache = DecisionCache.for_input(input_data)
+    key = None
+    if cache is not None:
+        key = decision_key(event, input_data)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    evaluated = None
+    if os.environ.get('HOOKIFY_DAEMON', '1') != '0':
+        evaluated = _evaluate_remote(event, input_data)
+        if evaluated is None and os.environ.get('HOOKIFY_DAEMON_AUTOSTART') == '1':
+            _autostart()
+    if evaluated is None:
+        evaluated = evaluate_local(event, input_data)
+
+    result, cacheable = evaluated
+    if key is not None and cacheable:
+        cache.put(key, result)
+    return result
+
+
+def rule_event_for(hook_event: str, input_data: Dict[str, Any]) -> Optional[str]:
+    """Rule event filter for a hook event, as chosen by the scripts in hookify/hooks.
+
+    Args:
+        hook_event: Hook event name (PreToolUse, PostToolUse, Stop, UserPromptSubmit)
+        input_data: Hook input JSON
+
+    Returns:
+        "bash", "file", "stop", "prompt" or None (all rules)
+    """
+    if hook_event == 'Stop':
+        return 'stop'
+    if hook_event == 'UserPromptSubmit':
+        return 'prompt'
+    tool_name = input_data.get('tool_name', '')
+    if tool_name == 'Bash':
+        return 'bash'
+    if tool_name in ['Edit', 'Write', 'MultiEdit']:
+        return 'file'
+    return None
+
+
+def evaluate_local(event: Optional[str], input_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+    """Load rules and evaluate them in the current process.
+
+    Returns:
+        The hook response dict, and whether it may be cached: decisions of
+        rules with transcript conditions depend on the transcript file too
+    """
+    from hookify.core.config_loader import load_rules
+    from hookify.core.profiler import load_stats
+    from hookify.core.rule_engine import RuleEngine
+
+    engine = RuleEngine()
+    # Recorded stats, if any, order each rule's conditions by selectivity
+    rules = engine.compile(load_rules(event=event), load_stats()['conditions'])
+    cacheable = not rules.transcript_conditions(event, input_data.get('tool_name', ''))
+    if os.environ.get('HOOKIFY_PROFILE') != '1':
+        return engine.evaluate_rules(rules, input_data), cacheable
+
+    from hookify.core.profiler import RuleProfiler
+
+    profiler = RuleProfiler()
+    result = engine.evaluate_rules(rules, input_data, profiler=profiler)
+    profiler.flush()
+    return result, cacheable
+
+
+def _evaluate_remote(event: Optional[str],
+                     input_data: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], bool]]:
+    """Ask the daemon to evaluate, like evaluate_local(); None means fall back to in-process."""
+    path = _socket_path()
+    if path is None or not os.path.exists(path):
+        return None
+
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(2.0)
+            sock.connect(path)
+            request = {"event": event, "input": input_data,
+                       "profile": os.environ.get('HOOKIFY_PROFILE') == '1'}
+            sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+            with sock.makefile('rb') as reader:
+                response = json.loads(reader.readline())
+    except (ConnectionRefusedError, FileNotFoundError):
+        return None  # Stale socket left by a daemon that has exited
+    except (OSError, ValueError) as e:
+        print(f"Warning: hookify daemon unavailable, evaluating in-process: {e}", file=sys.stderr)
+        return None
+
+    if response.get('local'):
+        return None  # The daemon cannot evaluate this event, e.g. a budgeted regex
+    if not response.get('ok'):
+        print(f"Warning: hookify daemon error: {response.get('error')}", file=sys.stderr)
+        return None
+    return response.get('result', {}), bool(response.get('cacheable'))
+
+
+def _autostart() -> None:
+    """Spawn a detached daemon for the current project."""
+    import subprocess
+
+    daemon_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'daemon.py')
+    try:
+        subprocess.Popen(
+            [sys.executable, daemon_script, 'serve', '--project', os.getcwd()],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        print(f"Warning: Failed to start hookify daemon: {e}", file=sys.stderr)
@@ -1,15 +1,39 @@
 #!/usr/bin/env python3
 """Configuration loader for hookify plugin.
 
-Loads and parses .claude/hookify.*.local.md files.
+Loads and parses hookify.*.local.md rule files from three layers, lowest
+precedence first:
+
+    org      HOOKIFY_ORG_RULES_DIR (default /etc/claude-code/hookify), shared
+             read-only rules for every user of the host
+    user     HOOKIFY_USER_RULES_DIR (default ~/.claude)
+    project  .claude/ in the current directory
+
+A rule overrides the rules of the same name in lower layers. Setting either
+environment variable to an empty string disables that layer.
 """
 
 import os
 import sys
-import glob
+import hashlib
+import json
 import re
-from typing import List, Optional, Dict, Any
-from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
+from dataclasses import dataclass, field, asdict, fields
+
+from hookify.core.regex_analysis import backtracking_risks
+from hookify.core.rule_files import layer_manifest, rule_layers
+
+
+# Parsed project rules are cached here, keyed by a manifest of the rule files
+RULE_CACHE_PATH = os.path.join('.claude', '.hookify-cache')
+RULE_CACHE_VERSION = 2
+# Org and user rules are cached once per host (per user), for every project,
+# and so are the merged rules of each project
+HOST_CACHE_DIR = os.path.join('~', '.claude', 'hookify-cache')
+
+# Bytes read at a time while looking for the end of a rule's frontmatter
+HEADER_CHUNK_SIZE = 1024
 
 
 @dataclass
@@ -29,6 +53,27 @@ class Condition:
         )
 
 
+class _LazyMessage:
+    """Rule.message, read from the rule file on first access if not given.
+
+    Rules loaded from files only record where their message body starts
+    (Rule.message_source): most rules never match, so most bodies are never
+    read.
+    """
+
+    def __get__(self, rule: Optional['Rule'], owner=None) -> str:
+        if rule is None:
+            return ""  # Class access: the field default
+        message = rule.__dict__.get('_message')
+        if message is None:
+            message = read_message(*rule.message_source) if rule.message_source else ""
+            rule.__dict__['_message'] = message
+        return message
+
+    def __set__(self, rule: 'Rule', message: Optional[str]) -> None:
+        rule.__dict__['_message'] = message
+
+
 @dataclass
 class Rule:
     """A hookify rule."""
@@ -39,11 +84,17 @@ class Rule:
     conditions: List[Condition] = field(default_factory=list)
     action: str = "warn"  # "warn" or "block" (future)
     tool_matcher: Optional[str] = None  # Override tool matching
-    message: str = ""  # Message body from markdown
+    message: str = _LazyMessage()  # Message body from markdown
+    message_source: Optional[Tuple[str, int]] = None  # (rule file, byte offset) to read message from
 
     @classmethod
-    def from_dict(cls, frontmatter: Dict[str, Any], message: str) -> 'Rule':
-        """Create Rule from frontmatter dict and message body."""
+    def from_dict(cls, frontmatter: Dict[str, Any], message: Optional[str],
+                  message_source: Optional[Tuple[str, int]] = None) -> 'Rule':
+        """Create Rule from frontmatter dict and message body.
+
+        With message None, the message is read from message_source when it
+        is first used.
+        """
         # Handle both simple pattern and complex conditions
         conditions = []
 
@@ -80,7 +131,8 @@ class Rule:
             conditions=conditions,
             action=frontmatter.get('action', 'warn'),
             tool_matcher=frontmatter.get('tool_matcher'),
-            message=message.strip()
+            message=None if message is None else message.strip(),
+            message_source=message_source,
         )
 
 
@@ -88,8 +140,6 @@ def extract_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     """Extract YAML frontmatter and message body from markdown.
 
     Returns (frontmatter_dict, message_body).
-
-    Supports multi-line dictionary items in lists by preserving indentation.
     """
     if not content.startswith('---'):
         return {}, content
@@ -99,9 +149,14 @@ def extract_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     if len(parts) < 3:
         return {}, content
 
-    frontmatter_text = parts[1]
-    message = parts[2].strip()
+    return parse_frontmatter(parts[1]), parts[2].strip()
 
+
+def parse_frontmatter(frontmatter_text: str) -> Dict[str, Any]:
+    """Parse the YAML frontmatter between the --- markers of a rule file.
+
+    Supports multi-line dictionary items in lists by preserving indentation.
+    """
     # Simple YAML parser that handles indented list items
     frontmatter = {}
     lines = frontmatter_text.split('\n')
@@ -192,11 +247,68 @@ def extract_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
             current_list.append(current_dict)
         frontmatter[current_key] = current_list
 
-    return frontmatter, message
+    return frontmatter
+
+
+def _decode(data: bytes) -> str:
+    """Decode rule file bytes as text-mode open() would, newlines included."""
+    # Imported here: hook calls answered from the rule cache decode no files
+    import locale
+
+    return data.decode(locale.getpreferredencoding(False)).replace('\r\n', '\n').replace('\r', '\n')
+
+
+def read_frontmatter(file_path: str) -> Tuple[Optional[str], int]:
+    """Read the frontmatter of a rule file, stopping before the message body.
+
+    Returns:
+        (frontmatter text between the --- markers, byte offset of the
+        message body), or (None, 0) if the file has no frontmatter
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read(HEADER_CHUNK_SIZE)
+        if not data.startswith(b'---'):
+            return None, 0
+        end = data.find(b'---', 3)
+        while end == -1:
+            chunk = f.read(HEADER_CHUNK_SIZE)
+            if not chunk:
+                return None, 0
+            # The closing marker may straddle two chunks
+            start = max(len(data) - 2, 3)
+            data += chunk
+            end = data.find(b'---', start)
+    return _decode(data[3:end]), end + 3
+
+
+def read_message(file_path: str, offset: int) -> str:
+    """Read the message body of a rule file, which starts at byte offset."""
+    try:
+        with open(file_path, 'rb') as f:
+            f.seek(offset)
+            return _decode(f.read()).strip()
+    except (OSError, ValueError) as e:
+        print(f"Warning: Failed to read message of {file_path}: {e}", file=sys.stderr)
+        return ""
+
+
+def rule_applies_to_event(rule: Rule, event: Optional[str]) -> bool:
+    """Check whether rule should be evaluated for event.
+
+    Args:
+        rule: Rule to check
+        event: Event filter ("bash", "file", "stop", etc.), None for all events
+
+    Returns:
+        True if rule applies
+    """
+    if not event:
+        return True
+    return rule.event == 'all' or rule.event == event
 
 
 def load_rules(event: Optional[str] = None) -> List[Rule]:
-    """Load all hookify rules from .claude directory.
+    """Load the hookify rules of all layers.
 
     Args:
         event: Optional event filter ("bash", "file", "stop", etc.)
@@ -204,60 +316,222 @@ def load_rules(event: Optional[str] = None) -> List[Rule]:
     Returns:
         List of enabled Rule objects matching the event.
     """
-    rules = []
+    return [rule for rule in load_all_rules()
+            if rule.enabled and rule_applies_to_event(rule, event)]
 
-    # Find all hookify.*.local.md files
-    pattern = os.path.join('.claude', 'hookify.*.local.md')
-    files = glob.glob(pattern)
 
-    for file_path in files:
+def load_all_rules() -> List[Rule]:
+    """Load every rule of every layer, enabled or not, merged by name.
+
+    See merge_rule_layers() for how rules override each other. The merged
+    rules are cached in HOST_CACHE_DIR per project, keyed by the manifests
+    of all layers, so as long as no rule file of any layer changed a load
+    reads one file and neither parses nor merges anything. On a miss only
+    the layers that changed are parsed again (see _load_layer()).
+    """
+    use_cache = os.environ.get('HOOKIFY_RULE_CACHE', '1') != '0'
+    layers = [(name, directory, layer_manifest(directory)) for name, directory in rule_layers()]
+    if not any(manifest for _name, _directory, manifest in layers):
+        return []
+
+    key = [[name, manifest] for name, _directory, manifest in layers]
+    digest = hashlib.sha1(os.path.realpath(os.getcwd()).encode('utf-8')).hexdigest()[:16]
+    cache_path = os.path.join(os.path.expanduser(HOST_CACHE_DIR), f"merged-{digest}.json")
+    if use_cache:
+        cached = _read_rule_cache(key, cache_path)
+        if cached is not None:
+            return cached
+
+    loaded = [_load_layer(name, directory, manifest, use_cache) for name, directory, manifest in layers]
+    rules = merge_rule_layers([layer_rules for layer_rules, _all_parsed in loaded])
+    if use_cache and all(all_parsed for _layer_rules, all_parsed in loaded):
+        _write_rule_cache(key, rules, cache_path, create_dir=True)
+    return rules
+
+
+def merge_rule_layers(layers: List[List[Rule]]) -> List[Rule]:
+    """Merge rule layers, lowest precedence first.
+
+    The rules of a layer named like rules of lower layers replace them,
+    taking the place of the first one, so overriding an org rule (or
+    disabling it with enabled: false) keeps the order of messages. Other
+    rules are appended in layer order.
+    """
+    merged: List[Rule] = []
+    for layer in layers:
+        overrides: Dict[str, Optional[List[Rule]]] = {}
+        for rule in layer:
+            overrides.setdefault(rule.name, []).append(rule)
+        result = []
+        for rule in merged:
+            if rule.name not in overrides:
+                result.append(rule)
+            elif overrides[rule.name] is not None:
+                result.extend(overrides[rule.name])
+                overrides[rule.name] = None  # Placed; drop other rules of that name
+        result.extend(rule for rule in layer if overrides[rule.name] is not None)
+        merged = result
+    return merged
+
+
+def _load_layer(name: str, directory: str, manifest: List[Tuple[str, int, int, int]],
+                use_cache: bool) -> Tuple[List[Rule], bool]:
+    """Load the rule files of one layer, given their manifest.
+
+    Parsed rules are served from the layer's rule cache when no rule file
+    changed since it was written; otherwise every file is parsed and the
+    cache is rewritten (only if all files parsed cleanly, so warnings keep
+    showing). Regex patterns prone to catastrophic backtracking count as
+    warnings. The project layer is cached in RULE_CACHE_PATH, the others
+    in HOST_CACHE_DIR, where all projects share them.
+
+    Returns:
+        The rules, and whether all files parsed cleanly
+    """
+    if not manifest:
+        return [], True
+    if name == 'project':
+        cache_path = RULE_CACHE_PATH
+    else:
+        digest = hashlib.sha1(os.path.realpath(directory).encode('utf-8')).hexdigest()[:16]
+        cache_path = os.path.join(os.path.expanduser(HOST_CACHE_DIR), f"{name}-{digest}.json")
+
+    if use_cache:
+        cached = _read_rule_cache(manifest, cache_path)
+        if cached is not None:
+            return cached, True
+
+    rules = []
+    all_parsed = True
+
+    for file_path, *_ in manifest:
         try:
             rule = load_rule_file(file_path)
             if not rule:
+                all_parsed = False
                 continue
-
-            # Filter by event if specified
-            if event:
-                if rule.event != 'all' and rule.event != event:
-                    continue
-
-            # Only include enabled rules
-            if rule.enabled:
-                rules.append(rule)
+            rules.append(rule)
+            if warn_backtracking_risks(file_path, rule):
+                all_parsed = False
 
         except (IOError, OSError, PermissionError) as e:
             # File I/O errors - log and continue
             print(f"Warning: Failed to read {file_path}: {e}", file=sys.stderr)
+            all_parsed = False
             continue
         except (ValueError, KeyError, AttributeError, TypeError) as e:
             # Parsing errors - log and continue
             print(f"Warning: Failed to parse {file_path}: {e}", file=sys.stderr)
+            all_parsed = False
             continue
         except Exception as e:
             # Unexpected errors - log with type details
             print(f"Warning: Unexpected error loading {file_path} ({type(e).__name__}): {e}", file=sys.stderr)
+            all_parsed = False
             continue
 
-    return rules
+    if use_cache and all_parsed:
+        _write_rule_cache(manifest, rules, cache_path, create_dir=name != 'project')
+    return rules, all_parsed
+
+
+def warn_backtracking_risks(file_path: str, rule: Rule) -> bool:
+    """Warn about regex conditions of rule prone to catastrophic backtracking.
+
+    Such patterns still load, but are searched under a time budget (see
+    hookify.core.regex_budget).
+
+    Returns:
+        True if any warning was printed
+    """
+    warned = False
+    for condition in rule.conditions:
+        if condition.operator != 'regex_match':
+            continue
+        for risk in backtracking_risks(condition.pattern):
+            print(f"Warning: {file_path}: pattern '{condition.pattern}' may backtrack catastrophically "
+                  f"({risk}); it runs under a time budget", file=sys.stderr)
+            warned = True
+    return warned
+
+
+def _read_rule_cache(manifest: Any, cache_path: str) -> Optional[List[Rule]]:
+    """Return cached rules if the cache was built from exactly this manifest
+    (of one layer, or the [name, manifest] pairs of all layers)."""
+    try:
+        with open(cache_path, 'r') as f:
+            data = json.load(f)
+        if data.get('version') != RULE_CACHE_VERSION:
+            return None
+        if data.get('manifest') != json.loads(json.dumps(manifest)):
+            return None
+        return [_rule_from_cache(entry) for entry in data['rules']]
+    except (IOError, OSError, ValueError, KeyError, TypeError):
+        return None  # Missing or corrupt cache: parse the rule files
+
+
+def _write_rule_cache(manifest: Any, rules: List[Rule], cache_path: str, create_dir: bool = False) -> None:
+    """Atomically replace a rule cache; failures only cost the next load."""
+    cache_dir = os.path.dirname(cache_path)
+    if create_dir:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            return
+    elif not os.path.isdir(cache_dir):
+        return
+    data = {
+        'version': RULE_CACHE_VERSION,
+        'manifest': manifest,
+        'rules': [_rule_to_cache(rule) for rule in rules],
+    }
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except (IOError, OSError, TypeError, ValueError) as e:
+        print(f"Warning: Failed to write rule cache {cache_path}: {e}", file=sys.stderr)
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _rule_to_cache(rule: Rule) -> Dict[str, Any]:
+    # Not asdict(): that would read every message body. Unread ones stay null.
+    data = {f.name: getattr(rule, f.name) for f in fields(Rule) if f.name != 'message'}
+    data['conditions'] = [asdict(c) for c in rule.conditions]
+    data['message'] = rule.__dict__.get('_message')
+    return data
+
+
+def _rule_from_cache(data: Dict[str, Any]) -> Rule:
+    data = dict(data)
+    data['conditions'] = [Condition(**c) for c in data.get('conditions', [])]
+    if data.get('message_source'):
+        data['message_source'] = tuple(data['message_source'])
+    return Rule(**data)
 
 
 def load_rule_file(file_path: str) -> Optional[Rule]:
     """Load a single rule file.
 
+    Only the frontmatter is read; the message body is read when the rule's
+    message is first used (see Rule.message_source).
+
     Returns:
         Rule object or None if file is invalid.
     """
     try:
-        with open(file_path, 'r') as f:
-            content = f.read()
-
-        frontmatter, message = extract_frontmatter(content)
+        frontmatter_text, body_offset = read_frontmatter(file_path)
+        frontmatter = parse_frontmatter(frontmatter_text) if frontmatter_text is not None else {}
 
         if not frontmatter:
             print(f"Warning: {file_path} missing YAML frontmatter (must start with ---)", file=sys.stderr)
             return None
 
-        rule = Rule.from_dict(frontmatter, message)
+        rule = Rule.from_dict(frontmatter, None, message_source=(file_path, body_offset))
         return rule
 
     except (IOError, OSError, PermissionError) as e:
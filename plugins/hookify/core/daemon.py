@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""Persistent rule server for hookify plugin.
+
+Hook scripts are short-lived processes: without a server every tool call
+pays for interpreter startup, module imports, globbing .claude/ and parsing
+every rule file. The daemon keeps the parsed rules (and the compiled regexes
+cached in rule_engine) in memory for one project and answers evaluation
+requests over a per-project Unix socket. See hookify.core.client for the
+hook-side shim, which falls back to in-process evaluation whenever the
+daemon is not reachable.
+
+Usage:
+    python3 core/daemon.py start [--project DIR] [--idle-timeout SECONDS]
+    python3 core/daemon.py stop|status [--project DIR]
+    python3 core/daemon.py serve [--project DIR]     # run in foreground
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import hashlib
+import threading
+import socketserver
+from typing import List, Dict, Any, Optional, Tuple
+
+if __name__ == '__main__':
+    # Allow running this file directly: make the "hookify" package importable
+    _plugin_root = os.environ.get('CLAUDE_PLUGIN_ROOT') or \
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    _parent_dir = os.path.dirname(_plugin_root)
+    if _parent_dir not in sys.path:
+        sys.path.insert(0, _parent_dir)
+
+from hookify.core.config_loader import load_all_rules
+from hookify.core.profiler import load_stats
+from hookify.core.regex_budget import RegexBudgetUnavailable
+from hookify.core.rule_engine import RuleEngine, RuleIndex
+from hookify.core.rule_files import rules_manifest
+from hookify.core.runtime_dir import runtime_dir, runtime_dir_path
+
+
+# Exit after this many seconds without a request (0 disables)
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+
+def socket_path(project_dir: Optional[str] = None) -> str:
+    """Return the Unix socket path of the daemon serving project_dir.
+
+    Sockets live in the private per-user runtime directory (see
+    hookify.core.runtime_dir; socket paths are limited to ~100 bytes, so
+    the project is hashed).
+
+    Raises:
+        RuntimeError: If the runtime directory is not safe to use
+    """
+    project = os.path.realpath(project_dir or os.getcwd())
+    digest = hashlib.sha1(project.encode('utf-8')).hexdigest()[:16]
+    directory = runtime_dir(create=True)
+    if directory is None:
+        raise RuntimeError(f"{runtime_dir_path()} is not a private directory of this user")
+    return os.path.join(directory, f"{digest}.sock")
+
+
+class RuleState:
+    """Compiled rules for one project, reloaded when rule files change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._manifest: Optional[List[Tuple[str, int, int, int]]] = None
+        self.engine = RuleEngine()
+        self._index = self.engine.compile([])
+
+    def index(self) -> RuleIndex:
+        """Return the rule index, recompiling it first if rule files changed.
+
+        Checking the manifest is a glob plus one stat per file, which is far
+        cheaper than re-reading and re-parsing every rule. Profiling stats,
+        which order the conditions, are only re-read along with the rules.
+        """
+        manifest = rules_manifest()
+        with self._lock:
+            if manifest != self._manifest:
+                enabled = [rule for rule in load_all_rules() if rule.enabled]
+                self._index = self.engine.compile(enabled, load_stats()['conditions'])
+                self._manifest = manifest
+            return self._index
+
+    def evaluate(self, event: Optional[str], input_data: Dict[str, Any],
+                 profile: bool = False) -> Tuple[Dict[str, Any], bool]:
+        """Evaluate rules; also returns whether the decision may be cached.
+
+        Decisions of rules with transcript conditions depend on the
+        transcript file, not just on the hook input, so they may not.
+        """
+        index = self.index()
+        cacheable = not index.transcript_conditions(event, input_data.get('tool_name', ''))
+        if not profile:
+            return self.engine.evaluate_rules(index, input_data, event=event), cacheable
+
+        from hookify.core.profiler import RuleProfiler
+
+        profiler = RuleProfiler()
+        result = self.engine.evaluate_rules(index, input_data, event=event, profiler=profiler)
+        profiler.flush()
+        return result, cacheable
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handles one newline-delimited JSON request per connection."""
+
+    def handle(self):
+        self.server.touch()
+        try:
+            request = json.loads(self.rfile.readline())
+            if request.get('command') == 'ping':
+                response = {"ok": True, "pid": os.getpid()}
+            elif request.get('command') == 'shutdown':
+                response = {"ok": True}
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+            else:
+                result, cacheable = self.server.state.evaluate(request.get('event'), request.get('input', {}),
+                                                               profile=bool(request.get('profile')))
+                response = {"ok": True, "result": result, "cacheable": cacheable}
+        except RegexBudgetUnavailable as e:
+            # Time budgets need the main thread of a process: the hook has one
+            response = {"ok": False, "local": True, "error": str(e)}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+
+
+class HookifyServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server holding the rule state of a single project."""
+
+    daemon_threads = True
+
+    def __init__(self, path: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.state = RuleState()
+        self.idle_timeout = idle_timeout
+        self._last_request = time.monotonic()
+        self._stopping = False
+        super().__init__(path, _RequestHandler)
+        os.chmod(path, 0o600)
+
+    def touch(self):
+        self._last_request = time.monotonic()
+
+    def service_actions(self):
+        if self._stopping or not self.idle_timeout:
+            return
+        if time.monotonic() - self._last_request > self.idle_timeout:
+            # Called from serve_forever's own thread, so shutdown() must run elsewhere
+            self._stopping = True
+            threading.Thread(target=self.shutdown, daemon=True).start()
+
+
+def send_request(request: Dict[str, Any], path: str, timeout: float = 2.0) -> Dict[str, Any]:
+    """Send one request to the daemon listening on path and return its reply.
+
+    Raises:
+        OSError: If the daemon is not reachable or does not answer in time
+        ValueError: If the reply is not valid JSON
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            return json.loads(reader.readline())
+
+
+def is_running(path: str) -> bool:
+    """Check whether a daemon answers on path."""
+    try:
+        return bool(send_request({"command": "ping"}, path, timeout=0.5).get('ok'))
+    except (OSError, ValueError):
+        return False
+
+
+def serve(project_dir: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> None:
+    """Run the daemon for project_dir in the foreground."""
+    import fcntl
+
+    os.chdir(project_dir)
+    path = socket_path(project_dir)
+
+    # The lock is held for the daemon's lifetime, so concurrent starts race safely
+    lock_file = open(path + '.lock', 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        print(f"hookify daemon already running on {path}", file=sys.stderr)
+        lock_file.close()
+        return
+    if os.path.exists(path):
+        os.unlink(path)  # Stale socket from a daemon that did not exit cleanly
+
+    server = HookifyServer(path, idle_timeout=idle_timeout)
+    try:
+        server.serve_forever(poll_interval=1.0)
+    finally:
+        server.server_close()
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+        lock_file.close()
+
+
+def start(project_dir: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT) -> bool:
+    """Start a detached daemon for project_dir unless one is running.
+
+    Returns:
+        True if a daemon is answering when this returns
+    """
+    import subprocess
+
+    path = socket_path(project_dir)
+    if is_running(path):
+        return True
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'serve',
+         '--project', project_dir, '--idle-timeout', str(idle_timeout)],
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    for _ in range(50):
+        if is_running(path):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Persistent hookify rule server")
+    parser.add_argument('command', choices=['start', 'stop', 'status', 'serve'])
+    parser.add_argument('--project', default=os.getcwd(), help="Project root (default: cwd)")
+    parser.add_argument('--idle-timeout', type=float, default=DEFAULT_IDLE_TIMEOUT,
+                        help="Exit after this many idle seconds (0 = never)")
+    args = parser.parse_args(argv)
+
+    project = os.path.realpath(args.project)
+    try:
+        path = socket_path(project)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    if args.command == 'serve':
+        serve(project, idle_timeout=args.idle_timeout)
+        return 0
+    if args.command == 'start':
+        if start(project, idle_timeout=args.idle_timeout):
+            print(f"hookify daemon running on {path}")
+            return 0
+        print("Error: hookify daemon failed to start", file=sys.stderr)
+        return 1
+    if args.command == 'stop':
+        try:
+            send_request({"command": "shutdown"}, path)
+            print("hookify daemon stopped")
+        except (OSError, ValueError):
+            print("hookify daemon not running")
+        return 0
+
+    if is_running(path):
+        print(f"hookify daemon running on {path}")
+        return 0
+    print("hookify daemon not running")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""Session-scoped cache of hookify decisions.
+
+Agents repeat the same tool calls (`npm test`, `git status`, the same edit)
+many times per session, and every repeat used to evaluate all rules again.
+The decision of an evaluation is cached under a hash of everything it
+depends on: the rule files (their manifest of paths, mtimes, sizes and
+inodes), the regex time budget, the project, the rule event and the hook
+input fields rules can read (hook_event_name, tool_name, tool_input, reason
+and user_prompt). Editing, adding or removing any rule file changes the
+hash, so a cached block is never served once the rules behind it change.
+
+Entries are small JSON files in the decisions/ directory of the private
+per-user runtime directory (see hookify.core.runtime_dir; the cache is
+not used if that directory fails its owner and mode check), one directory
+per session, written atomically so concurrent hook processes share them
+without locking. An entry expires TTL seconds after
+it was written, and each session keeps a bounded number of entries,
+dropping the least recently used (a hit touches the entry's mtime).
+
+Decisions that depend on more than the hook input are never stored: rules
+with transcript conditions read the transcript file, which grows during
+the session. Profiling runs (HOOKIFY_PROFILE=1) bypass the cache so every
+evaluation is recorded.
+
+Environment:
+    HOOKIFY_DECISION_CACHE=0        Disable the cache
+    HOOKIFY_DECISION_CACHE_TTL=N    Entry lifetime in seconds
+    HOOKIFY_DECISION_CACHE_SIZE=N   Entries kept per session
+"""
+
+import os
+import json
+import time
+import hashlib
+from typing import Any, Dict, Optional
+
+from hookify.core.rule_files import rules_manifest
+from hookify.core.runtime_dir import runtime_dir
+
+
+DEFAULT_TTL = 30 * 60
+DEFAULT_MAX_ENTRIES = 256
+DECISION_CACHE_VERSION = 1
+
+# Hook input fields, besides tool_input, that rule conditions can read
+_INPUT_FIELDS = ('hook_event_name', 'tool_name', 'reason', 'user_prompt')
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return max(float(os.environ.get(name, default)), 0)
+    except ValueError:
+        return default
+
+
+class DecisionCache:
+    """The cached decisions of one session."""
+
+    def __init__(self, directory: str, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @classmethod
+    def for_input(cls, input_data: Dict[str, Any]) -> Optional['DecisionCache']:
+        """Cache of the session of a hook input; None if caching is off."""
+        session_id = input_data.get('session_id')
+        if not session_id or os.environ.get('HOOKIFY_DECISION_CACHE', '1') == '0' \
+                or os.environ.get('HOOKIFY_PROFILE') == '1':
+            return None
+        ttl = _env_number('HOOKIFY_DECISION_CACHE_TTL', DEFAULT_TTL)
+        max_entries = int(_env_number('HOOKIFY_DECISION_CACHE_SIZE', DEFAULT_MAX_ENTRIES))
+        if not ttl or not max_entries:
+            return None
+        root = runtime_dir(create=True)
+        if root is None:
+            return None  # Entries could have been planted by another user
+        digest = hashlib.sha1(str(session_id).encode('utf-8')).hexdigest()[:16]
+        return cls(os.path.join(root, 'decisions', digest), ttl, max_entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached decision for key, or None if there is none or it expired."""
+        path = os.path.join(self.directory, key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            if time.time() - entry['created'] > self.ttl:
+                os.unlink(path)
+                return None
+            os.utime(path)  # Most recently used
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry.get('result')
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a decision (best effort), pruning the session's old entries."""
+        try:
+            if not os.path.isdir(self.directory):
+                root = os.path.dirname(self.directory)
+                os.makedirs(self.directory, mode=0o700, exist_ok=True)
+                _remove_stale_sessions(root, self.ttl)
+            tmp_path = os.path.join(self.directory, f".{key}.{os.getpid()}.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({'created': time.time(), 'result': result}, f)
+            os.replace(tmp_path, os.path.join(self.directory, key))
+            self._prune()
+        except OSError:
+            pass  # Caching is an optimization: never fail the hook over it
+
+    def _prune(self) -> None:
+        """Drop entries unused for longer than the TTL, then the least recently used."""
+        entries = []
+        cutoff = time.time() - self.ttl
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue  # Pruned by another process
+                if mtime < cutoff:
+                    _unlink(entry.path)
+                else:
+                    entries.append((mtime, entry.path))
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _mtime, path in entries[:len(entries) - self.max_entries]:
+                _unlink(path)
+
+
+def decision_key(event: Optional[str], input_data: Dict[str, Any]) -> str:
+    """Hash of the rules and the hook input a decision depends on.
+
+    Args:
+        event: Rule event filter ("bash", "file", "stop", "prompt" or None)
+        input_data: Hook input JSON
+    """
+    state = [
+        DECISION_CACHE_VERSION,
+        rules_manifest(),
+        os.environ.get('HOOKIFY_REGEX_BUDGET_MS'),  # A longer budget may find more matches
+        os.getcwd(),
+        event,
+        input_data.get('tool_input', {}),
+    ]
+    state.extend(input_data.get(name) for name in _INPUT_FIELDS)
+    canonical = json.dumps(state, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def _remove_stale_sessions(root: str, ttl: float) -> None:
+    """Remove session directories that got no new entry for longer than the TTL.
+
+    Every entry in such a directory was written before the cutoff, so all
+    of them have expired.
+    """
+    cutoff = time.time() - ttl
+    try:
+        with os.scandir(root) as it:
+            sessions = [entry.path for entry in it if entry.is_dir() and entry.stat().st_mtime < cutoff]
+    except OSError:
+        return
+    for session in sessions:
+        try:
+            with os.scandir(session) as it:
+                for entry in it:
+                    _unlink(entry.path)
+            os.rmdir(session)
+        except OSError:
+            continue  # Written to or removed by another process meanwhile
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Single-pass literal prefilter for hookify conditions.
+
+Evaluating every condition on its own scans the same field value once per
+rule. Instead, the literals of all `contains`/`not_contains` conditions on a
+field, plus the literals that a `regex_match` pattern cannot match without,
+are combined into one trie-shaped regex and the field value is scanned once.
+Regex conditions whose required literals are absent are rejected without
+running the regex at all.
+"""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+
+# (literal, case_sensitive): contains-style literals are case sensitive,
+# literals derived from regex_match patterns follow re.IGNORECASE
+LiteralKey = Tuple[str, bool]
+
+# Rebuild the scan regex after this many consecutive hits that found nothing new
+REBUILD_AFTER_STALE_HITS = 64
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Build a regex matching any of words, shaped as a trie.
+
+    Python's re tries alternatives one by one, so a flat `a|b|c` alternation
+    costs O(words) per text position; nesting by common prefix keeps it at
+    O(word length). Longer words are preferred at each branch.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ''
+        body = alternatives[0] if len(alternatives) == 1 else '(?:' + '|'.join(alternatives) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return build(trie)
+
+
+class LiteralScanner:
+    """Finds which of many literals occur in a text in one left-to-right scan."""
+
+    def __init__(self, keys: Iterable[LiteralKey]):
+        self.keys: FrozenSet[LiteralKey] = frozenset(k for k in keys if k[0])
+        self._compiled: Dict[bool, Tuple[re.Pattern, Dict[str, List[LiteralKey]]]] = {}
+
+    def scan(self, text: str) -> Set[LiteralKey]:
+        """Return the keys whose literal occurs in text.
+
+        Case-insensitive keys can only be decided exactly for ASCII text
+        (where lowercasing is exact and length preserving); for other text
+        they are all reported as present, which just means their regexes run.
+        """
+        ascii_text = text.isascii()
+        if ascii_text:
+            haystack = text.lower()
+            remaining = set(self.keys)
+            found: Set[LiteralKey] = set()
+        else:
+            haystack = text
+            remaining = {k for k in self.keys if k[1]}
+            found = {k for k in self.keys if not k[1]}
+
+        if not remaining:
+            return found
+        regex, implied = self._compile(ascii_text, remaining)
+
+        pos = 0
+        stale_hits = 0
+        rebuilt = False
+        while remaining:
+            match = regex.search(haystack, pos)
+            if match is None:
+                break
+            start = match.start()
+            progressed = False
+            for key in implied[match.group()]:
+                if key in remaining and (not key[1] or text.startswith(key[0], start)):
+                    remaining.discard(key)
+                    found.add(key)
+                    progressed = True
+            pos = start + 1
+
+            stale_hits = 0 if progressed else stale_hits + 1
+            if stale_hits > REBUILD_AFTER_STALE_HITS and not rebuilt:
+                # Frequent literals that are already found keep hitting:
+                # continue with a regex for the missing ones only
+                regex, implied = self._build(ascii_text, remaining)
+                rebuilt = True
+
+        return found
+
+    def _compile(self, ascii_text: bool, keys: Set[LiteralKey]):
+        compiled = self._compiled.get(ascii_text)
+        if compiled is None:
+            compiled = self._compiled[ascii_text] = self._build(ascii_text, keys)
+        return compiled
+
+    @staticmethod
+    def _build(ascii_text: bool, keys: Iterable[LiteralKey]):
+        """Compile the scan regex and map each word to the keys it implies.
+
+        A match at some position is the longest word starting there; every
+        other literal starting at that position is a prefix of it.
+        """
+        by_word: Dict[str, List[LiteralKey]] = {}
+        for key in keys:
+            by_word.setdefault(key[0].lower() if ascii_text else key[0], []).append(key)
+
+        implied: Dict[str, List[LiteralKey]] = {}
+        for word in by_word:
+            implied[word] = [key for prefix, prefix_keys in by_word.items()
+                             if word.startswith(prefix) for key in prefix_keys]
+        return re.compile(_trie_pattern(by_word)), implied
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Opt-in profiling of hookify rule evaluation.
+
+With HOOKIFY_PROFILE=1, every evaluation records per-rule and per-condition
+evaluation time and match counts, and the time spent compiling regexes. The
+records of each hook invocation (or daemon request) are added to a stats
+file in the project, .claude/.hookify-stats.json, so they aggregate across
+invocations. Work shared between conditions (the literal scan of a field,
+the transcript stream) is charged to the condition that triggers it.
+
+Usage:
+    python3 core/profiler.py report [--top 10] [--json]   # from the project root
+    python3 core/profiler.py reset
+"""
+
+import os
+import sys
+import json
+from typing import Any, Dict, Optional
+
+if __name__ == '__main__':
+    # Allow running this file directly: make the "hookify" package importable
+    _plugin_root = os.environ.get('CLAUDE_PLUGIN_ROOT') or \
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    _parent_dir = os.path.dirname(_plugin_root)
+    if _parent_dir not in sys.path:
+        sys.path.insert(0, _parent_dir)
+
+from hookify.core.config_loader import Condition
+
+
+# Aggregated stats, relative to the project root like the rule cache
+STATS_PATH = os.path.join('.claude', '.hookify-stats.json')
+STATS_VERSION = 1
+
+# Counters summed when stats are merged (max_seconds takes the maximum)
+COUNTERS = ('evaluations', 'matches', 'seconds', 'compiles')
+
+
+def profiling_enabled() -> bool:
+    """Check whether HOOKIFY_PROFILE asks for profiling."""
+    return os.environ.get('HOOKIFY_PROFILE') == '1'
+
+
+def empty_stats() -> Dict[str, Any]:
+    return {'version': STATS_VERSION, 'invocations': 0, 'rules': {}, 'conditions': {}, 'regex_compiles': {}}
+
+
+class RuleProfiler:
+    """Records the evaluation of one hook event.
+
+    Not thread safe: use one profiler per evaluation.
+    """
+
+    def __init__(self):
+        self.stats = empty_stats()
+
+    def record_rule(self, rule_name: str, seconds: float, matched: bool) -> None:
+        """Record one evaluation of a rule's conditions."""
+        entry = self.stats['rules'].setdefault(
+            rule_name, {'evaluations': 0, 'matches': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+        _count(entry, seconds, matched)
+
+    def record_condition(self, rule_name: str, index: int, condition: Condition,
+                         seconds: float, matched: bool) -> None:
+        """Record one evaluation of the index-th condition of a rule."""
+        entry = self.stats['conditions'].get(f"{rule_name}#{index}")
+        if entry is None:
+            entry = self.stats['conditions'][f"{rule_name}#{index}"] = {
+                'rule': rule_name, 'index': index, 'field': condition.field,
+                'operator': condition.operator, 'pattern': condition.pattern,
+                'evaluations': 0, 'matches': 0, 'seconds': 0.0, 'max_seconds': 0.0,
+            }
+        _count(entry, seconds, matched)
+
+    def record_compile(self, pattern: str, seconds: float) -> None:
+        """Record the compilation of a regex pattern."""
+        entry = self.stats['regex_compiles'].setdefault(pattern, {'compiles': 0, 'seconds': 0.0})
+        entry['compiles'] += 1
+        entry['seconds'] += seconds
+
+    def flush(self, path: str = STATS_PATH) -> None:
+        """Add the recorded stats to the stats file (best effort)."""
+        import fcntl
+
+        if not self.stats['rules']:
+            return
+        self.stats['invocations'] = 1
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            # Concurrent hook processes (and daemon threads) merge one at a time
+            with open(path + '.lock', 'w') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                stats = load_stats(path)
+                merge_stats(stats, self.stats)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(stats, f)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Cannot write hookify stats to {path}: {e}", file=sys.stderr)
+        self.stats = empty_stats()
+
+
+def _count(entry: Dict[str, Any], seconds: float, matched: bool) -> None:
+    entry['evaluations'] += 1
+    entry['matches'] += int(matched)
+    entry['seconds'] += seconds
+    entry['max_seconds'] = max(entry['max_seconds'], seconds)
+
+
+def load_stats(path: str = STATS_PATH) -> Dict[str, Any]:
+    """Read the stats file; empty stats if it is missing or unreadable."""
+    try:
+        with open(path, 'r') as f:
+            stats = json.load(f)
+    except (OSError, ValueError):
+        return empty_stats()
+    if not isinstance(stats, dict) or stats.get('version') != STATS_VERSION:
+        return empty_stats()
+    return stats
+
+
+def merge_stats(into: Dict[str, Any], stats: Dict[str, Any]) -> None:
+    """Add the counters of stats to into."""
+    into['invocations'] += stats['invocations']
+    for section in ('rules', 'conditions', 'regex_compiles'):
+        target = into.setdefault(section, {})
+        for key, entry in stats[section].items():
+            current = target.get(key)
+            if current is None:
+                target[key] = dict(entry)
+                continue
+            for name in COUNTERS:
+                if name in entry:
+                    current[name] = current.get(name, 0) + entry[name]
+            if 'max_seconds' in entry:
+                current['max_seconds'] = max(current.get('max_seconds', 0.0), entry['max_seconds'])
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}ms"
+
+
+def _print_table(title: str, header: list, rows: list) -> None:
+    print(f"\n{title}")
+    if not rows:
+        print("  (none)")
+        return
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    # Names and patterns left-aligned, numbers right-aligned
+    left = [i == 0 or name in ('field', 'operator', 'pattern') for i, name in enumerate(header)]
+    for row in [header] + rows:
+        cells = [str(cell).ljust(width) if is_left else str(cell).rjust(width)
+                 for cell, width, is_left in zip(row, widths, left)]
+        print('  ' + '  '.join(cells).rstrip())
+
+
+def report(stats: Dict[str, Any], top: int = 10) -> None:
+    """Print the slowest and hottest rules, conditions and regex compiles."""
+    rules = stats['rules']
+    evaluations = sum(entry['evaluations'] for entry in rules.values())
+    print(f"{len(rules)} rules, {evaluations} rule evaluations in {stats['invocations']} hook invocations")
+
+    def rule_row(name, entry):
+        mean = entry['seconds'] / entry['evaluations'] if entry['evaluations'] else 0.0
+        return [name, entry['evaluations'], entry['matches'], _ms(entry['seconds']), _ms(mean),
+                _ms(entry['max_seconds'])]
+
+    header = ['rule', 'evals', 'matches', 'total', 'mean', 'max']
+    by_time = sorted(rules.items(), key=lambda item: -item[1]['seconds'])[:top]
+    _print_table("Slowest rules (total time)", header, [rule_row(n, e) for n, e in by_time])
+    by_calls = sorted(rules.items(), key=lambda item: (-item[1]['evaluations'], -item[1]['matches']))[:top]
+    _print_table("Hottest rules (evaluations)", header, [rule_row(n, e) for n, e in by_calls])
+
+    conditions = sorted(stats['conditions'].values(), key=lambda entry: -entry['seconds'])[:top]
+    _print_table("Slowest conditions (total time)",
+                 ['rule#condition', 'field', 'operator', 'evals', 'matches', 'total', 'max', 'pattern'],
+                 [[f"{e['rule']}#{e['index']}", e['field'], e['operator'], e['evaluations'], e['matches'],
+                   _ms(e['seconds']), _ms(e['max_seconds']), e['pattern'][:40]] for e in conditions])
+
+    compiles = sorted(stats['regex_compiles'].items(), key=lambda item: -item[1]['seconds'])[:top]
+    _print_table("Slowest regex compiles", ['pattern', 'compiles', 'total'],
+                 [[pattern[:60], e['compiles'], _ms(e['seconds'])] for pattern, e in compiles])
+
+
+def main(argv: Optional[list] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Report hookify rule evaluation stats (HOOKIFY_PROFILE=1)")
+    parser.add_argument('command', nargs='?', default='report', choices=['report', 'reset'])
+    parser.add_argument('--stats', default=STATS_PATH, help="Stats file (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=10, help="Rows per table")
+    parser.add_argument('--json', action='store_true', help="Print the aggregated stats as JSON")
+    args = parser.parse_args(argv)
+
+    if args.command == 'reset':
+        try:
+            os.remove(args.stats)
+        except FileNotFoundError:
+            pass
+        print(f"Removed {args.stats}")
+        return 0
+
+    stats = load_stats(args.stats)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    elif not stats['rules']:
+        print(f"No stats in {args.stats}; run hooks with HOOKIFY_PROFILE=1 to record them")
+        return 1
+    else:
+        report(stats, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""Static analysis of hookify regex patterns.
+
+Works on the parse tree of Python's own regex parser, so the analysis sees
+exactly the pattern re.compile() will run.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python 3.11+
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+# Shorter required literals hit almost everywhere and make poor filters
+MIN_LITERAL_LENGTH = 2
+
+_REPEATS = tuple(op for op in (
+    sre_constants.MAX_REPEAT,
+    sre_constants.MIN_REPEAT,
+    getattr(sre_constants, 'POSSESSIVE_REPEAT', None),
+) if op is not None)
+_ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+
+
+@lru_cache(maxsize=1024)
+def required_literals(pattern: str) -> Optional[FrozenSet[str]]:
+    """Find literals of which at least one must occur for pattern to match.
+
+    Matching is assumed to ignore case, as in rule_engine.compile_regex, so
+    the returned literals are lowercased ASCII.
+
+    Args:
+        pattern: Regex pattern string
+
+    Returns:
+        Set of alternative literals, or None if no useful set exists
+    """
+    try:
+        parsed = sre_parse.parse(pattern, re.IGNORECASE)
+    except (re.error, RecursionError, OverflowError):
+        return None
+
+    literals = _sequence_literals(parsed)
+    if not literals or min(len(lit) for lit in literals) < MIN_LITERAL_LENGTH:
+        return None
+    return frozenset(lit.lower() for lit in literals)
+
+
+def _sequence_literals(items) -> Optional[FrozenSet[str]]:
+    """Best required-literal set for a sequence of parsed regex items."""
+    best: Optional[FrozenSet[str]] = None
+    run: List[str] = []
+
+    def consider(candidate: Optional[FrozenSet[str]]):
+        nonlocal best
+        if candidate and (best is None or _score(candidate) > _score(best)):
+            best = candidate
+
+    for op, av in items:
+        # Only ASCII literals: str.lower() agrees with IGNORECASE matching there
+        if op is sre_constants.LITERAL and av < 128:
+            run.append(chr(av))
+            continue
+
+        if run:
+            consider(frozenset([''.join(run)]))
+            run = []
+
+        if op is sre_constants.SUBPATTERN:
+            consider(_sequence_literals(av[-1]))
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            consider(_sequence_literals(av))
+        elif op is sre_constants.BRANCH:
+            branches = [_sequence_literals(branch) for branch in av[1]]
+            if all(branches):
+                consider(frozenset().union(*branches))
+        elif op in _REPEATS:
+            low, _high, item = av
+            if low >= 1:
+                consider(_sequence_literals(item))
+
+    if run:
+        consider(frozenset([''.join(run)]))
+    return best
+
+
+def _score(literals: FrozenSet[str]) -> Tuple[int, int]:
+    """Prefer sets whose shortest literal is long, then smaller sets."""
+    return min(len(lit) for lit in literals), -len(literals)
+
+
+def _parse(pattern: str):
+    """Parse pattern the way compile_regex compiles it; None if invalid."""
+    try:
+        return sre_parse.parse(pattern, re.IGNORECASE)
+    except (re.error, RecursionError, OverflowError):
+        return None
+
+
+@lru_cache(maxsize=1024)
+def max_match_width(pattern: str) -> Optional[int]:
+    """Longest possible match of pattern in characters, None if unbounded."""
+    parsed = _parse(pattern)
+    if parsed is None:
+        return None
+    _low, high = parsed.getwidth()
+    if high >= sre_constants.MAXREPEAT - 1:
+        return None
+    return high
+
+
+@lru_cache(maxsize=1024)
+def may_cross_lines(pattern: str) -> bool:
+    """Check whether a match of pattern (or its lookarounds) may span a newline.
+
+    The analysis is conservative: True unless every construct in the pattern
+    provably excludes newlines, so a False result means each match lies
+    within a single line of the text.
+    """
+    parsed = _parse(pattern)
+    if parsed is None:
+        return True
+    dotall = bool(parsed.state.flags & re.DOTALL)
+    return _items_may_match_newline(parsed, dotall)
+
+
+# Character categories (\s, \D, \W and their Unicode/locale variants) that include '\n'
+_NEWLINE_CATEGORIES = {'SPACE', 'LINEBREAK', 'NOT_DIGIT', 'NOT_WORD'}
+
+
+def _items_may_match_newline(items, dotall: bool) -> bool:
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            if av == 10:
+                return True
+        elif op is sre_constants.NOT_LITERAL:
+            if av != 10:
+                return True
+        elif op is sre_constants.ANY:
+            if dotall:
+                return True
+        elif op is sre_constants.IN:
+            if _set_may_match_newline(av):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            _group, add_flags, del_flags, sub = av
+            sub_dotall = (dotall or bool(add_flags & re.DOTALL)) and not del_flags & re.DOTALL
+            if _items_may_match_newline(sub, sub_dotall):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_items_may_match_newline(branch, dotall) for branch in av[1]):
+                return True
+        elif op in _REPEATS:
+            if _items_may_match_newline(av[2], dotall):
+                return True
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            if _items_may_match_newline(av, dotall):
+                return True
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            if _items_may_match_newline(av[1], dotall):
+                return True
+        elif op is sre_constants.AT:
+            continue  # Anchors are zero-width
+        else:
+            return True  # Backreferences, conditionals, ...: assume the worst
+    return False
+
+
+def _set_may_match_newline(items) -> bool:
+    if items and items[0][0] is sre_constants.NEGATE:
+        return True
+    for op, av in items:
+        if op is sre_constants.LITERAL and av == 10:
+            return True
+        if op is sre_constants.RANGE and av[0] <= 10 <= av[1]:
+            return True
+        if op is sre_constants.CATEGORY:
+            name = str(av).replace('CATEGORY_', '').replace('UNI_', '').replace('LOC_', '')
+            if name in _NEWLINE_CATEGORIES:
+                return True
+    return False
+
+
+# Characters the backtracking analysis tries when comparing character sets:
+# ASCII plus a few non-ASCII letters, digits and spaces
+_SAMPLE_CHARS = tuple(chr(code) for code in range(128)) + (' ', 'é', '٠', ' ', '中')
+
+_LOOKAROUNDS = (sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+
+@lru_cache(maxsize=1024)
+def backtracking_risks(pattern: str) -> Tuple[str, ...]:
+    """Find constructs that expose pattern to exponential backtracking.
+
+    Python's regex engine backtracks, so an unbounded repeat whose body can
+    match the same text in several ways takes exponential time on a near
+    miss: `(a+)+$` against 40 a's and a `!` runs for minutes. Inside the
+    body of an unbounded repeat, two kinds of variable-length parts are
+    flagged:
+
+    - a nested repeat, like the `a+` of `(a+)+` or the `\\s?` of `(\\w+\\s?)+`
+    - alternatives of different lengths that can start with the same
+      character, like `(ab|abc|b)*`
+
+    unless the body has a required part that none of them can consume
+    (`(a+b)+` and `(\\d{1,3}\\.)+` are safe: the `b` and the `.` pin where each
+    iteration ends). Alternatives of the same length that can start with
+    the same character, like `(a|a)*` or `(ab|a.)*`, are flagged either
+    way: each iteration can match its text in two ways, whatever follows
+    it. The analysis is a heuristic and may flag some safe patterns.
+    Possessive repeats and atomic groups never backtrack and are not
+    flagged.
+
+    Args:
+        pattern: Regex pattern string
+
+    Returns:
+        Descriptions of the risky constructs found, empty if none
+    """
+    parsed = _parse(pattern)
+    if parsed is None:
+        return ()
+    risks: List[str] = []
+    _find_risks(parsed, risks)
+    return tuple(dict.fromkeys(risks))
+
+
+def _find_risks(items, risks: List[str]) -> None:
+    for op, av in items:
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            _low, high, body = av
+            if high == sre_constants.MAXREPEAT:
+                parts = _variable_parts(body)
+                if parts and not _has_delimiter(body, _chars(parts)):
+                    if parts[0][0] is sre_constants.BRANCH:
+                        risks.append('repeated alternation: alternatives of different lengths '
+                                     'that can start with the same character')
+                    else:
+                        risks.append('nested repeat: a variable-length repeat inside an unbounded repeat')
+                if _has_overlapping_branch(body):
+                    risks.append('repeated alternation: alternatives of the same length '
+                                 'that can start with the same character')
+            _find_risks(body, risks)
+        elif op is sre_constants.SUBPATTERN:
+            _find_risks(av[-1], risks)
+        elif op is sre_constants.BRANCH:
+            for branch in av[1]:
+                _find_risks(branch, risks)
+        elif op in _LOOKAROUNDS:
+            _find_risks(av[1], risks)
+        # Atomic groups and possessive repeats give up no positions: skipped
+
+
+def _variable_parts(items) -> list:
+    """Backtracking parts of items that can match text of several lengths."""
+    found = []
+    for op, av in items:
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if av[0] < av[1]:
+                found.append((op, av))
+            found.extend(_variable_parts(av[2]))
+        elif op is sre_constants.SUBPATTERN:
+            found.extend(_variable_parts(av[-1]))
+        elif op is sre_constants.BRANCH:
+            if _is_ambiguous_branch(av[1]):
+                found.append((op, av))
+            for branch in av[1]:
+                found.extend(_variable_parts(branch))
+    return found
+
+
+def _is_ambiguous_branch(branches) -> bool:
+    """Check for alternatives of different lengths with a common first character.
+
+    An alternative that can match the empty string overlaps all the others.
+    """
+    if len({branch.getwidth() for branch in branches}) < 2:
+        return False
+    seen: set = set()
+    for branch in branches:
+        first = _first_chars(branch)
+        if not sum(_min_width(item) for item in branch) or not seen.isdisjoint(first):
+            return True
+        seen |= first
+    return False
+
+
+def _has_overlapping_branch(items) -> bool:
+    """Check items for alternatives of the same length with a common first character.
+
+    Two empty alternatives (left by the parser factoring out the common
+    prefix of `a|a`) overlap too.
+    """
+    for op, av in items:
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if _has_overlapping_branch(av[2]):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            if _has_overlapping_branch(av[-1]):
+                return True
+        elif op is sre_constants.BRANCH:
+            seen: Dict[Tuple[int, int], set] = {}
+            for branch in av[1]:
+                width = branch.getwidth()
+                first = _first_chars(branch)
+                if width in seen and (not width[1] or not seen[width].isdisjoint(first)):
+                    return True
+                seen.setdefault(width, set()).update(first)
+            if any(_has_overlapping_branch(branch) for branch in av[1]):
+                return True
+    return False
+
+
+def _sequence(items) -> list:
+    """items with plain groups inlined, so their parts are checked one by one."""
+    flat = []
+    for op, av in items:
+        if op is sre_constants.SUBPATTERN:
+            flat.extend(_sequence(av[-1]))
+        else:
+            flat.append((op, av))
+    return flat
+
+
+def _has_delimiter(body, chars: FrozenSet[str]) -> bool:
+    """Check whether every match of body needs a character outside chars.
+
+    Such a character pins where each iteration of the outer repeat ends, so
+    the nested repeats cannot trade text between iterations.
+    """
+    return any(_min_width(item) > 0 and _chars([item]).isdisjoint(chars) for item in _sequence(body))
+
+
+def _min_width(item) -> int:
+    op, av = item
+    if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+        return 1
+    if op is sre_constants.SUBPATTERN:
+        return sum(_min_width(sub) for sub in av[-1])
+    if op is sre_constants.BRANCH:
+        return min(sum(_min_width(sub) for sub in branch) for branch in av[1])
+    if op in _REPEATS:
+        return av[0] and av[0] * sum(_min_width(sub) for sub in av[2])
+    if _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+        return sum(_min_width(sub) for sub in av)
+    return 0  # Anchors, lookarounds, backreferences (may be empty)
+
+
+def _chars(items) -> FrozenSet[str]:
+    """Sample characters that some match of items may consume."""
+    chars: set = set()
+    for op, av in items:
+        if op in (sre_constants.LITERAL, sre_constants.NOT_LITERAL, sre_constants.ANY, sre_constants.IN):
+            chars |= _char_class(op, av)
+        elif op is sre_constants.SUBPATTERN:
+            chars |= _chars(av[-1])
+        elif op is sre_constants.BRANCH:
+            for branch in av[1]:
+                chars |= _chars(branch)
+        elif op in _REPEATS:
+            chars |= _chars(av[2])
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            chars |= _chars(av)
+        elif op in _LOOKAROUNDS or op is sre_constants.AT:
+            continue
+        else:
+            return frozenset(_SAMPLE_CHARS)  # Backreferences, conditionals, ...: anything
+    return frozenset(chars)
+
+
+def _first_chars(items) -> FrozenSet[str]:
+    """Sample characters that a non-empty match of items may start with."""
+    chars: set = set()
+    for item in items:
+        op, av = item
+        if op in _LOOKAROUNDS or op is sre_constants.AT:
+            continue
+        if op is sre_constants.SUBPATTERN:
+            chars |= _first_chars(av[-1])
+        elif op is sre_constants.BRANCH:
+            for branch in av[1]:
+                chars |= _first_chars(branch)
+        elif op in _REPEATS:
+            chars |= _first_chars(av[2])
+        elif _ATOMIC_GROUP is not None and op is _ATOMIC_GROUP:
+            chars |= _first_chars(av)
+        else:
+            chars |= _chars([item])
+        if _min_width(item) > 0:
+            break
+    return frozenset(chars)
+
+
+_CHAR_CLASSES: Dict[Tuple[Any, str], FrozenSet[str]] = {}
+
+
+def _char_class(op, av) -> FrozenSet[str]:
+    """Sample characters matched by a one-character item, cached by its repr."""
+    key = (op, repr(av))
+    chars = _CHAR_CLASSES.get(key)
+    if chars is None:
+        chars = _CHAR_CLASSES[key] = frozenset(char for char in _SAMPLE_CHARS if _matches_char(op, av, char))
+    return chars
+
+
+def _matches_char(op, av, char: str) -> bool:
+    """Check whether a one-character item matches char, ignoring case."""
+    if op is sre_constants.LITERAL:
+        return char.lower() == chr(av).lower()
+    if op is sre_constants.NOT_LITERAL:
+        return char.lower() != chr(av).lower()
+    if op is sre_constants.ANY:
+        return True
+    negate = bool(av) and av[0][0] is sre_constants.NEGATE
+    for set_op, set_av in av:
+        if set_op is sre_constants.LITERAL:
+            found = char.lower() == chr(set_av).lower()
+        elif set_op is sre_constants.RANGE:
+            found = any(set_av[0] <= ord(c) <= set_av[1] for c in (char, char.lower(), char.upper()))
+        elif set_op is sre_constants.CATEGORY:
+            found = _in_category(set_av, char)
+        else:
+            continue
+        if found:
+            return not negate
+    return negate
+
+
+def _in_category(category, char: str) -> bool:
+    name = str(category).replace('CATEGORY_', '').replace('UNI_', '').replace('LOC_', '')
+    negated = name.startswith('NOT_')
+    name = name[4:] if negated else name
+    if name == 'DIGIT':
+        found = char.isdecimal()
+    elif name == 'SPACE':
+        found = char.isspace()
+    elif name == 'WORD':
+        found = char.isalnum() or char == '_'
+    elif name == 'LINEBREAK':
+        found = char == '\n'
+    else:
+        return True
+    return found != negated
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Time budgets for hookify regex searches.
+
+Python's regex engine backtracks, so a rule pattern like `(a+)+$` can take
+exponential time on a near miss and pin the CPU until the hook is killed.
+Patterns that regex_analysis.backtracking_risks() flags are searched under
+a time budget instead: SIGALRM interrupts the search (the regex engine
+checks for signals while matching) and the search raises RegexTimeout.
+
+Signals are only delivered to the main thread. Elsewhere (the daemon's
+request threads) a budgeted search raises RegexBudgetUnavailable, and the
+daemon hands the event back to the hook to evaluate in-process.
+"""
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Longest a flagged pattern may search one text, in milliseconds
+DEFAULT_BUDGET_MS = 250
+
+
+class RegexTimeout(Exception):
+    """A regex search ran out of its time budget."""
+
+
+class RegexBudgetUnavailable(RuntimeError):
+    """A budgeted search was attempted outside the main thread."""
+
+
+def budget_seconds() -> float:
+    """Time budget from HOOKIFY_REGEX_BUDGET_MS; 0 disables budgets."""
+    try:
+        budget_ms = float(os.environ.get('HOOKIFY_REGEX_BUDGET_MS', DEFAULT_BUDGET_MS))
+    except ValueError:
+        budget_ms = DEFAULT_BUDGET_MS
+    return max(budget_ms, 0) / 1000
+
+
+class BudgetedPattern:
+    """A compiled regex whose searches stop after a time budget."""
+
+    def __init__(self, regex: re.Pattern, seconds: float):
+        self.regex = regex
+        self.seconds = seconds
+
+    @property
+    def pattern(self) -> str:
+        return self.regex.pattern
+
+    def search(self, string: str, pos: int = 0) -> Optional[re.Match]:
+        """Search like re.Pattern.search; raises RegexTimeout when over budget."""
+        with time_budget(self.seconds):
+            return self.regex.search(string, pos)
+
+
+def _raise_timeout(signum, frame):
+    raise RegexTimeout()
+
+
+@contextmanager
+def time_budget(seconds: float) -> Iterator[None]:
+    """Raise RegexTimeout in the block once it has run for seconds.
+
+    A timer already running (the hook dispatcher's handler timeout) is
+    saved and restored with the time spent in the block deducted; if it
+    would fire first, it is left in charge.
+    """
+    # Imported here: the rule engine imports this module on every hook call,
+    # and most rules never need a budget
+    import signal
+    import threading
+
+    if threading.current_thread() is not threading.main_thread():
+        raise RegexBudgetUnavailable("regex time budgets need the main thread")
+    if not hasattr(signal, 'setitimer'):
+        yield  # No interval timers on this platform
+        return
+
+    outer_delay, outer_interval = signal.getitimer(signal.ITIMER_REAL)
+    if outer_delay and outer_delay <= seconds:
+        yield
+        return
+
+    outer_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    start = time.monotonic()
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, signal.SIG_DFL if outer_handler is None else outer_handler)
+        if outer_delay:
+            remaining = outer_delay - (time.monotonic() - start)
+            signal.setitimer(signal.ITIMER_REAL, max(remaining, 1e-6), outer_interval)
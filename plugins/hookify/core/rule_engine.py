@@ -3,11 +3,21 @@
 
 import re
 import sys
+import time
+from dataclasses import dataclass
 from functools import lru_cache
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
 # Import from local module
 from hookify.core.config_loader import Rule, Condition
+from hookify.core.prefilter import LiteralKey, LiteralScanner
+from hookify.core.regex_analysis import backtracking_risks, required_literals
+from hookify.core.regex_budget import BudgetedPattern, RegexTimeout, budget_seconds
+from hookify.core.shell_command import ParsedCommand, parse_command
+
+if TYPE_CHECKING:
+    from hookify.core.profiler import RuleProfiler
+    from hookify.core.transcript import ConditionKey
 
 
 # Cache compiled regexes (max 128 patterns)
@@ -24,6 +34,314 @@ def compile_regex(pattern: str) -> re.Pattern:
     return re.compile(pattern, re.IGNORECASE)
 
 
+@lru_cache(maxsize=128)
+def compile_budgeted(pattern: str) -> Union[re.Pattern, BudgetedPattern]:
+    """Compile pattern, under a time budget if it risks catastrophic backtracking.
+
+    Args:
+        pattern: Regex pattern string
+
+    Returns:
+        Compiled regex pattern, wrapped in a BudgetedPattern if flagged by
+        backtracking_risks() and budgets are enabled
+    """
+    regex = compile_regex(pattern)
+    seconds = budget_seconds()
+    if seconds and backtracking_risks(pattern):
+        return BudgetedPattern(regex, seconds)
+    return regex
+
+
+# A piece of a field value: (edit index, text). The index is None unless the
+# text is the new_string of one MultiEdit edit.
+Segment = Tuple[Optional[int], str]
+
+
+def edit_segments(tool_input: Dict[str, Any]) -> Iterator[Segment]:
+    """Yield the new_string of each MultiEdit edit with its index.
+
+    Conditions check the edits one by one, so no joined copy of all edits is
+    built and no match can span two edits. Without any edit, the new text
+    is one empty segment, as when the edits were joined into one string.
+    """
+    edits = tool_input.get('edits', [])
+    found = False
+    for index, edit in enumerate(edits if isinstance(edits, list) else ()):
+        if isinstance(edit, dict) and isinstance(edit.get('new_string', ''), str):
+            found = True
+            yield index, edit.get('new_string', '')
+    if not found:
+        yield None, ''
+
+
+# Fields of a tokenized Bash command (see hookify.core.shell_command), one
+# segment per token, so conditions check short tokens instead of the raw
+# command line
+SHELL_FIELDS = {
+    'argv0': ParsedCommand.argv0s,
+    'args': ParsedCommand.args,
+    'pipeline': lambda parsed: tuple(command.text for command in parsed.pipeline),
+    'redirect_targets': lambda parsed: parsed.redirect_targets,
+    'subshells': lambda parsed: parsed.subshells,
+}
+
+
+def shell_segments(field: str, command: str) -> Iterator[Segment]:
+    """Yield the tokens of a shell field of a Bash command."""
+    for token in SHELL_FIELDS[field](parse_command(command)):
+        yield None, token
+
+
+# Relative cost of checking a condition: operator cost times field cost.
+# Fields not listed (command, file_path, user_prompt, ...) hold short
+# values; transcript conditions stream the transcript file.
+OPERATOR_COSTS = {'equals': 1, 'starts_with': 1, 'ends_with': 1, 'contains': 2, 'not_contains': 2,
+                  'regex_match': 4}
+FIELD_COSTS = {'transcript': 100, 'content': 10, 'new_text': 10, 'new_string': 10,
+               'old_text': 10, 'old_string': 10}
+
+# Evaluations a condition needs in the profiling stats before they are used
+MIN_PROFILE_SAMPLES = 20
+
+
+# Literal scan results of one field: (edit index, text, literals found) per
+# segment, or None if the field is not found
+ScannedField = Optional[List[Tuple[Optional[int], str, Set[LiteralKey]]]]
+
+
+class FieldContext:
+    """Field values of one hook event, shared by every rule evaluated on it.
+
+    Each field is extracted on first use and kept, together with the
+    literal scan of its segments and the results of streaming the
+    transcript, for the rest of one RuleEngine.evaluate_rules() call.
+    """
+
+    def __init__(self, engine: 'RuleEngine', tool_name: str, tool_input: Dict[str, Any],
+                 input_data: Optional[Dict[str, Any]] = None):
+        self.engine = engine
+        self.tool_name = tool_name
+        self.tool_input = tool_input
+        self.input_data = input_data or {}
+        # Streamed unless the tool input carries a transcript field itself
+        self.transcript_path = None if 'transcript' in tool_input else self.input_data.get('transcript_path')
+        self.transcript_results: Dict[str, Dict['ConditionKey', bool]] = {}
+        self._segments: Dict[str, Optional[Tuple[Segment, ...]]] = {}
+        self._scanned: Dict[str, ScannedField] = {}
+        self._token_sets: Dict[str, Optional[FrozenSet[str]]] = {}
+
+    @classmethod
+    def from_input(cls, engine: 'RuleEngine', input_data: Dict[str, Any]) -> 'FieldContext':
+        return cls(engine, input_data.get('tool_name', ''), input_data.get('tool_input', {}), input_data)
+
+    def segments(self, field: str) -> Optional[Tuple[Segment, ...]]:
+        """Segments of a field (see RuleEngine._extract_segments), None if not found."""
+        if field in self._segments:
+            return self._segments[field]
+        segments = self.engine._extract_segments(field, self.tool_name, self.tool_input, self.input_data)
+        result = self._segments[field] = None if segments is None else tuple(segments)
+        return result
+
+    def token_set(self, field: str) -> Optional[FrozenSet[str]]:
+        """Texts of a field's segments for equals lookups.
+
+        None if the field is not found or its segments are MultiEdit edits,
+        whose matches must be reported edit by edit.
+        """
+        if field in self._token_sets:
+            return self._token_sets[field]
+        segments = self.segments(field)
+        result = self._token_sets[field] = None if segments is None or \
+            any(index is not None for index, _ in segments) else frozenset(text for _, text in segments)
+        return result
+
+    def scanned(self, field: str, scanner: LiteralScanner) -> ScannedField:
+        """Segments of a field with the literals scanner finds in each."""
+        if field in self._scanned:
+            return self._scanned[field]
+        segments = self.segments(field)
+        result = self._scanned[field] = None if segments is None else [
+            (index, text, scanner.scan(text)) for index, text in segments
+        ]
+        return result
+
+
+@dataclass(frozen=True)
+class CompiledCondition:
+    """A condition with the literals a field scan can decide it from."""
+    condition: Condition
+    # contains/not_contains: the (case sensitive) pattern itself;
+    # regex_match: literals of which one must occur; empty if none apply
+    literals: FrozenSet[LiteralKey]
+    index: int = 0  # Position in the rule file, which profiling stats refer to
+
+    @classmethod
+    def from_condition(cls, condition: Condition, index: int = 0) -> 'CompiledCondition':
+        literals: FrozenSet[LiteralKey] = frozenset()
+        if condition.operator in ('contains', 'not_contains') and condition.pattern:
+            literals = frozenset([(condition.pattern, True)])
+        elif condition.operator == 'regex_match':
+            required = required_literals(condition.pattern)
+            if required:
+                literals = frozenset((lit, False) for lit in required)
+        return cls(condition=condition, literals=literals, index=index)
+
+    @property
+    def cost(self) -> int:
+        """Estimated relative cost of checking the condition."""
+        return OPERATOR_COSTS.get(self.condition.operator, 1) * FIELD_COSTS.get(self.condition.field, 1)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A rule prepared for evaluation by RuleIndex."""
+    rule: Rule
+    position: int  # Index in the original rule list, preserves message order
+    tools: Optional[FrozenSet[str]]  # Pre-split tool_matcher, None matches any tool
+    conditions: Tuple[CompiledCondition, ...]
+
+
+class RuleIndex:
+    """Rules compiled once and bucketed by rule event and tool name.
+
+    Evaluation only visits the rules that can apply to the current event and
+    tool_name instead of scanning (and re-splitting tool matchers of) every
+    rule. Candidate lists are built on first use and cached, so an index that
+    outlives one event (e.g. in the hookify daemon) amortizes the work.
+
+    The conditions of each rule are reordered so that a rule that does not
+    match is rejected as cheaply as possible, see _order_conditions().
+    """
+
+    def __init__(self, rules: List[Rule], stats: Optional[Dict[str, Any]] = None):
+        """Compile rules.
+
+        Args:
+            rules: Rules to index
+            stats: Per-condition profiling stats (the "conditions" of
+                hookify.core.profiler.load_stats()) to order conditions by
+        """
+        self._by_event: Dict[str, List[CompiledRule]] = {}
+        self._candidates: Dict[Tuple[Optional[str], str], List[CompiledRule]] = {}
+        self._scanners: Dict[Tuple[Optional[str], str], Dict[str, LiteralScanner]] = {}
+        self._transcript: Dict[Tuple[Optional[str], str], List[Condition]] = {}
+
+        for position, rule in enumerate(rules):
+            # Rules must have at least one condition to be valid
+            if not rule.conditions:
+                continue
+            conditions = [CompiledCondition.from_condition(c, i) for i, c in enumerate(rule.conditions)]
+            compiled = CompiledRule(
+                rule=rule,
+                position=position,
+                tools=self._parse_tool_matcher(rule.tool_matcher),
+                conditions=self._order_conditions(rule.name, conditions, stats or {}),
+            )
+            self._by_event.setdefault(rule.event, []).append(compiled)
+
+    @staticmethod
+    def _order_conditions(rule_name: str, conditions: List[CompiledCondition],
+                          stats: Dict[str, Any]) -> Tuple[CompiledCondition, ...]:
+        """Order a rule's conditions by expected cost of rejecting the rule.
+
+        All conditions must match, so checking stops at the first one that
+        does not. Each condition is ranked by cost / (1 - match rate), which
+        minimizes the expected cost for independent conditions. The cost is
+        the static estimate (CompiledCondition.cost), or the mean observed
+        time if every condition of the rule has profiling stats; the match
+        rate is the observed one if the condition has stats, 1/2 otherwise.
+        Ties keep the file order.
+        """
+        if len(conditions) < 2:
+            return tuple(conditions)
+
+        observed = {}
+        for compiled in conditions:
+            entry = stats.get(f"{rule_name}#{compiled.index}")
+            condition = compiled.condition
+            # Stats of a condition that was edited since do not apply
+            if entry and entry.get('evaluations', 0) >= MIN_PROFILE_SAMPLES and \
+                    (entry.get('field'), entry.get('operator'), entry.get('pattern')) == \
+                    (condition.field, condition.operator, condition.pattern):
+                observed[compiled.index] = entry
+        timed = len(observed) == len(conditions)
+
+        def rank(compiled: CompiledCondition) -> float:
+            entry = observed.get(compiled.index)
+            if entry is None:
+                return compiled.cost / 0.5
+            cost = entry['seconds'] / entry['evaluations'] if timed else compiled.cost
+            # Smoothed, so a condition that always matched still ranks by cost
+            match_rate = (entry['matches'] + 1) / (entry['evaluations'] + 2)
+            return cost / (1 - match_rate)
+
+        return tuple(sorted(conditions, key=rank))
+
+    @staticmethod
+    def _parse_tool_matcher(matcher: Optional[str]) -> Optional[FrozenSet[str]]:
+        """Split a matcher like "Edit|Write" once; None/"*" match any tool."""
+        if not matcher or matcher == '*':
+            return None
+        return frozenset(matcher.split('|'))
+
+    def candidates(self, event: Optional[str], tool_name: str) -> List[CompiledRule]:
+        """Rules that may match a hook for event and tool_name, in rule order.
+
+        Args:
+            event: Rule event filter ("bash", "file", ...), None for all events
+            tool_name: Tool being used (empty for non-tool events)
+        """
+        key = (event, tool_name)
+        cached = self._candidates.get(key)
+        if cached is not None:
+            return cached
+
+        selected = []
+        for rule_event, bucket in self._by_event.items():
+            if event and rule_event != 'all' and rule_event != event:
+                continue
+            selected.extend(c for c in bucket if c.tools is None or tool_name in c.tools)
+        selected.sort(key=lambda c: c.position)
+
+        self._candidates[key] = selected
+        return selected
+
+    def scanners(self, event: Optional[str], tool_name: str) -> Dict[str, LiteralScanner]:
+        """Per-field literal scanners over the candidate rules' conditions.
+
+        Only fields with at least two distinct literals get a scanner; a
+        single literal is checked faster by a plain substring search.
+        """
+        key = (event, tool_name)
+        cached = self._scanners.get(key)
+        if cached is not None:
+            return cached
+
+        by_field: Dict[str, set] = {}
+        for compiled in self.candidates(event, tool_name):
+            for cond in compiled.conditions:
+                by_field.setdefault(cond.condition.field, set()).update(cond.literals)
+
+        scanners = {field: LiteralScanner(keys) for field, keys in by_field.items() if len(keys) > 1}
+        self._scanners[key] = scanners
+        return scanners
+
+    def transcript_conditions(self, event: Optional[str], tool_name: str) -> List[Condition]:
+        """Conditions on the transcript field across the candidate rules.
+
+        They are all evaluated in one streaming pass over the transcript file
+        the first time any of them is checked.
+        """
+        key = (event, tool_name)
+        cached = self._transcript.get(key)
+        if cached is None:
+            cached = self._transcript[key] = [
+                cond.condition for compiled in self.candidates(event, tool_name)
+                for cond in compiled.conditions if cond.condition.field == 'transcript'
+            ]
+        return cached
+
+
 class RuleEngine:
     """Evaluates rules against hook input data."""
 
@@ -32,34 +350,66 @@ class RuleEngine:
         # No need for instance cache anymore - using global lru_cache
         pass
 
-    def evaluate_rules(self, rules: List[Rule], input_data: Dict[str, Any]) -> Dict[str, Any]:
+    def compile(self, rules: List[Rule], stats: Optional[Dict[str, Any]] = None) -> RuleIndex:
+        """Compile rules into an index for repeated evaluation.
+
+        Args:
+            rules: Rules to index
+            stats: Per-condition profiling stats to order conditions by
+        """
+        return RuleIndex(rules, stats)
+
+    def evaluate_rules(self, rules: Union[List[Rule], RuleIndex], input_data: Dict[str, Any],
+                       event: Optional[str] = None,
+                       profiler: Optional['RuleProfiler'] = None) -> Dict[str, Any]:
         """Evaluate all rules and return combined results.
 
         Checks all rules and accumulates matches. Blocking rules take priority
         over warning rules. All matching rule messages are combined.
 
         Args:
-            rules: List of Rule objects to evaluate
+            rules: List of Rule objects, or a RuleIndex from compile()
             input_data: Hook input JSON (tool_name, tool_input, etc.)
+            event: Optional rule event filter ("bash", "file", "stop", etc.)
+            profiler: Records rule and condition timings if given (see
+                hookify.core.profiler)
 
         Returns:
             Response dict with systemMessage, hookSpecificOutput, etc.
             Empty dict {} if no rules match.
         """
+        if not isinstance(rules, RuleIndex):
+            rules = self.compile(rules)
+
         hook_event = input_data.get('hook_event_name', '')
+        tool_name = input_data.get('tool_name', '')
         blocking_rules = []
         warning_rules = []
 
-        for rule in rules:
-            if self._rule_matches(rule, input_data):
+        scanners = rules.scanners(event, tool_name)
+        transcript_conditions = rules.transcript_conditions(event, tool_name)
+        fields = FieldContext.from_input(self, input_data)
+
+        for compiled in rules.candidates(event, tool_name):
+            rule = compiled.rule
+            edits: Set[int] = set()
+            if profiler is None:
+                matched = self._conditions_match(compiled.conditions, fields, scanners,
+                                                 transcript_conditions, edits)
+            else:
+                start = time.perf_counter()
+                matched = self._conditions_match(compiled.conditions, fields, scanners,
+                                                 transcript_conditions, edits, profiler, rule.name)
+                profiler.record_rule(rule.name, time.perf_counter() - start, matched)
+            if matched:
                 if rule.action == 'block':
-                    blocking_rules.append(rule)
+                    blocking_rules.append((rule, edits))
                 else:
-                    warning_rules.append(rule)
+                    warning_rules.append((rule, edits))
 
         # If any blocking rules matched, block the operation
         if blocking_rules:
-            messages = [f"**[{r.name}]**\n{r.message}" for r in blocking_rules]
+            messages = [self._format_message(r, edits) for r, edits in blocking_rules]
             combined_message = "\n\n".join(messages)
 
             # Use appropriate blocking format based on event type
@@ -85,7 +435,7 @@ class RuleEngine:
 
         # If only warnings, show them but allow operation
         if warning_rules:
-            messages = [f"**[{r.name}]**\n{r.message}" for r in warning_rules]
+            messages = [self._format_message(r, edits) for r, edits in warning_rules]
             return {
                 "systemMessage": "\n\n".join(messages)
             }
@@ -93,76 +443,180 @@ class RuleEngine:
         # No matches - allow operation
         return {}
 
-    def _rule_matches(self, rule: Rule, input_data: Dict[str, Any]) -> bool:
-        """Check if rule matches input data.
+    @staticmethod
+    def _format_message(rule: Rule, edits: Set[int]) -> str:
+        """Rule message with its name and, for MultiEdit, the edits that matched."""
+        message = f"**[{rule.name}]**\n{rule.message}"
+        if edits:
+            numbers = ', '.join(str(index + 1) for index in sorted(edits))
+            message += f"\n\n(Matched in MultiEdit edit{'s' if len(edits) > 1 else ''} {numbers})"
+        return message
+
+    def _conditions_match(self, conditions: Tuple[CompiledCondition, ...], fields: FieldContext,
+                          scanners: Dict[str, LiteralScanner], transcript_conditions: List[Condition],
+                          edits: Optional[Set[int]] = None, profiler: Optional['RuleProfiler'] = None,
+                          rule_name: str = '') -> bool:
+        """Check that all conditions of a rule match input data.
 
         Args:
-            rule: Rule to evaluate
-            input_data: Hook input data
-
-        Returns:
-            True if rule matches, False otherwise
+            conditions: Compiled conditions of one rule, in evaluation order
+            fields: Field values of the event, shared across its rules
+            scanners: Literal scanners by field, from RuleIndex.scanners()
+            transcript_conditions: All transcript conditions of the event's rules
+            edits: If given, collects the indexes of the MultiEdit edits that
+                conditions matched in
+            profiler: Records the time of each condition of rule_name if given
         """
-        # Extract tool information
-        tool_name = input_data.get('tool_name', '')
-        tool_input = input_data.get('tool_input', {})
-
-        # Check tool matcher if specified
-        if rule.tool_matcher:
-            if not self._matches_tool(rule.tool_matcher, tool_name):
-                return False
-
-        # If no conditions, don't match
-        # (Rules must have at least one condition to be valid)
-        if not rule.conditions:
-            return False
-
-        # All conditions must match
-        for condition in rule.conditions:
-            if not self._check_condition(condition, tool_name, tool_input, input_data):
+        for compiled in conditions:
+            if profiler is not None:
+                self._profile_compile(compiled.condition, profiler)
+                start = time.perf_counter()
+            scanner = scanners.get(compiled.condition.field) if compiled.literals else None
+            if compiled.condition.field == 'transcript' and fields.transcript_path:
+                matched = self._check_transcript_condition(compiled.condition, fields, transcript_conditions)
+            elif scanner is None:
+                matched = self._check_condition(compiled.condition, fields, edits)
+            else:
+                matched = self._check_scanned_condition(compiled, scanner, fields, edits)
+            if profiler is not None:
+                profiler.record_condition(rule_name, compiled.index, compiled.condition,
+                                          time.perf_counter() - start, matched)
+            if not matched:
                 return False
 
         return True
 
-    def _matches_tool(self, matcher: str, tool_name: str) -> bool:
-        """Check if tool_name matches the matcher pattern.
+    @staticmethod
+    def _profile_compile(condition: Condition, profiler: 'RuleProfiler') -> None:
+        """Compile a regex condition's pattern ahead of it, timing a cache miss."""
+        if condition.operator != 'regex_match':
+            return
+        misses = compile_regex.cache_info().misses
+        start = time.perf_counter()
+        try:
+            compile_regex(condition.pattern)
+        except re.error:
+            return  # Reported when the condition is checked
+        if compile_regex.cache_info().misses > misses:
+            profiler.record_compile(condition.pattern, time.perf_counter() - start)
+
+    def _check_scanned_condition(self, compiled: CompiledCondition, scanner: LiteralScanner,
+                                 fields: FieldContext, edits: Optional[Set[int]] = None) -> bool:
+        """Check a condition using the single literal scan of its field.
+
+        Each segment of the field is scanned once per event; the results
+        (edit index, text, literals found) are shared by all conditions.
+        """
+        condition = compiled.condition
+        scanned = fields.scanned(condition.field, scanner)
+        if scanned is None:
+            return False
 
-        Args:
-            matcher: Pattern like "Bash", "Edit|Write", "*"
-            tool_name: Actual tool name
+        if condition.operator == 'not_contains':
+            return all((condition.pattern, True) not in hits for _, _, hits in scanned)
 
-        Returns:
-            True if matches
+        matched = False
+        for index, text, hits in scanned:
+            if condition.operator == 'contains':
+                found = (condition.pattern, True) in hits
+            else:
+                # regex_match: none of the required literals means no match
+                found = not hits.isdisjoint(compiled.literals) and self._regex_match(condition.pattern, text)
+            if found:
+                if index is None or edits is None:
+                    return True
+                matched = True
+                edits.add(index)
+        return matched
+
+    def _check_transcript_condition(self, condition: Condition, fields: FieldContext,
+                                    transcript_conditions: List[Condition]) -> bool:
+        """Check a transcript condition, streaming the file once per evaluation."""
+        transcript_path = fields.transcript_path
+        results = fields.transcript_results.get(transcript_path)
+        if results is None:
+            session_id = fields.input_data.get('session_id')
+            results = fields.transcript_results[transcript_path] = \
+                self._stream_transcript(transcript_path, transcript_conditions, session_id)
+
+        key = (condition.operator, condition.pattern)
+        if key in results:
+            return results[key]
+        # Unreadable transcript, invalid regex or unknown operator: same as
+        # evaluating on an empty transcript
+        return self._apply_operator(condition.operator, condition.pattern, '')
+
+    def _stream_transcript(self, transcript_path: str, conditions: List[Condition],
+                           session_id: Optional[str]) -> Dict['ConditionKey', bool]:
+        """Evaluate all transcript conditions in one pass over the file.
+
+        With a session_id, the pass resumes where the previous Stop event of
+        the session left off and only reads what was appended since.
         """
-        if matcher == '*':
-            return True
+        # Only Stop rules read the transcript; other events skip these imports
+        from hookify.core.transcript import TranscriptSource
+        from hookify.core.transcript_tail import TranscriptTail
 
-        # Split on | for OR matching
-        patterns = matcher.split('|')
-        return tool_name in patterns
+        tail = TranscriptTail(transcript_path, session_id, 'hookify') \
+            if session_id and isinstance(session_id, str) else None
+        try:
+            return TranscriptSource(transcript_path, tail=tail).evaluate(conditions, compile_budgeted)
+        except FileNotFoundError:
+            print(f"Warning: Transcript file not found: {transcript_path}", file=sys.stderr)
+        except PermissionError:
+            print(f"Warning: Permission denied reading transcript: {transcript_path}", file=sys.stderr)
+        except (IOError, OSError) as e:
+            print(f"Warning: Error reading transcript {transcript_path}: {e}", file=sys.stderr)
+        except UnicodeDecodeError as e:
+            print(f"Warning: Encoding error in transcript {transcript_path}: {e}", file=sys.stderr)
+        return {}
 
-    def _check_condition(self, condition: Condition, tool_name: str,
-                        tool_input: Dict[str, Any], input_data: Dict[str, Any] = None) -> bool:
+    def _check_condition(self, condition: Condition, fields: FieldContext,
+                         edits: Optional[Set[int]] = None) -> bool:
         """Check if a single condition matches.
 
         Args:
             condition: Condition to check
-            tool_name: Tool being used
-            tool_input: Tool input dict
-            input_data: Full hook input data (for Stop events, etc.)
+            fields: Field values of the event being evaluated
+            edits: If given, collects the indexes of the MultiEdit edits matched
 
         Returns:
             True if condition matches
         """
-        # Extract the field value to check
-        field_value = self._extract_field(condition.field, tool_name, tool_input, input_data)
-        if field_value is None:
+        if condition.operator == 'equals' and condition.field in SHELL_FIELDS:
+            # One set lookup instead of comparing every token
+            tokens = fields.token_set(condition.field)
+            if tokens is not None:
+                return condition.pattern in tokens
+
+        # Field values are extracted once per event
+        segments = fields.segments(condition.field)
+        if segments is None:
             return False
 
-        # Apply operator
-        operator = condition.operator
-        pattern = condition.pattern
+        return self._match_segments(condition.operator, condition.pattern, segments, edits)
+
+    def _match_segments(self, operator: str, pattern: str, segments: Iterable[Segment],
+                        edits: Optional[Set[int]] = None) -> bool:
+        """Apply a condition operator to the segments of a field value.
 
+        not_contains holds if no segment contains the pattern; every other
+        operator matches if any segment matches. With edits given, all
+        segments are checked and the indexes of the matching edits collected.
+        """
+        if operator == 'not_contains':
+            return all(pattern not in text for _, text in segments)
+        matched = False
+        for index, text in segments:
+            if self._apply_operator(operator, pattern, text):
+                if index is None or edits is None:
+                    return True
+                matched = True
+                edits.add(index)
+        return matched
+
+    def _apply_operator(self, operator: str, pattern: str, field_value: str) -> bool:
+        """Apply a condition operator to an extracted field value."""
         if operator == 'regex_match':
             return self._regex_match(pattern, field_value)
         elif operator == 'contains':
@@ -179,15 +633,38 @@ class RuleEngine:
             # Unknown operator
             return False
 
+    def _extract_segments(self, field: str, tool_name: str, tool_input: Dict[str, Any],
+                          input_data: Dict[str, Any] = None) -> Optional[Iterable[Segment]]:
+        """Extract a field value as segments to check one by one.
+
+        The new text of a MultiEdit is one segment per edit (see
+        edit_segments) and the shell fields of a Bash command one segment per
+        token (see shell_segments); every other field is a single segment
+        with index None.
+
+        Returns:
+            Iterable of (edit index, text), or None if the field is not found
+        """
+        if tool_name == 'MultiEdit' and field in ('new_text', 'content') and field not in tool_input:
+            return edit_segments(tool_input)
+        if tool_name == 'Bash' and field in SHELL_FIELDS and field not in tool_input:
+            return shell_segments(field, str(tool_input.get('command', '')))
+        field_value = self._extract_field(field, tool_name, tool_input, input_data)
+        if field_value is None:
+            return None
+        return ((None, field_value),)
+
     def _extract_field(self, field: str, tool_name: str,
                       tool_input: Dict[str, Any], input_data: Dict[str, Any] = None) -> Optional[str]:
         """Extract field value from tool input or hook input data.
 
         Args:
-            field: Field name like "command", "new_text", "file_path", "reason", "transcript"
+            field: Field name like "command", "new_text", "file_path" or "reason". The
+                transcript file is never read here: transcript conditions stream it
+                (see _check_transcript_condition)
             tool_name: Tool being used (may be empty for Stop events)
             tool_input: Tool input dict
-            input_data: Full hook input (for accessing transcript_path, reason, etc.)
+            input_data: Full hook input (for reason and user_prompt)
 
         Returns:
             Field value as string, or None if not found
@@ -204,25 +681,6 @@ class RuleEngine:
             # Stop event specific fields
             if field == 'reason':
                 return input_data.get('reason', '')
-            elif field == 'transcript':
-                # Read transcript file if path provided
-                transcript_path = input_data.get('transcript_path')
-                if transcript_path:
-                    try:
-                        with open(transcript_path, 'r') as f:
-                            return f.read()
-                    except FileNotFoundError:
-                        print(f"Warning: Transcript file not found: {transcript_path}", file=sys.stderr)
-                        return ''
-                    except PermissionError:
-                        print(f"Warning: Permission denied reading transcript: {transcript_path}", file=sys.stderr)
-                        return ''
-                    except (IOError, OSError) as e:
-                        print(f"Warning: Error reading transcript {transcript_path}: {e}", file=sys.stderr)
-                        return ''
-                    except UnicodeDecodeError as e:
-                        print(f"Warning: Encoding error in transcript {transcript_path}: {e}", file=sys.stderr)
-                        return ''
             elif field == 'user_prompt':
                 # For UserPromptSubmit events
                 return input_data.get('user_prompt', '')
@@ -244,12 +702,9 @@ class RuleEngine:
                 return tool_input.get('file_path', '')
 
         elif tool_name == 'MultiEdit':
+            # new_text/content are checked edit by edit, see _extract_segments
             if field == 'file_path':
                 return tool_input.get('file_path', '')
-            elif field in ['new_text', 'content']:
-                # Concatenate all edits
-                edits = tool_input.get('edits', [])
-                return ' '.join(e.get('new_string', '') for e in edits)
 
         return None
 
@@ -265,12 +720,16 @@ class RuleEngine:
         """
         try:
             # Use cached compiled regex (LRU cache with max 128 patterns)
-            regex = compile_regex(pattern)
+            regex = compile_budgeted(pattern)
             return bool(regex.search(text))
 
         except re.error as e:
             print(f"Invalid regex pattern '{pattern}': {e}", file=sys.stderr)
             return False
+        except RegexTimeout:
+            print(f"Warning: Regex pattern '{pattern}' ran out of its time budget, treating it as not matched",
+                  file=sys.stderr)
+            return False
 
 
 # For testing
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Where hookify rule files live.
+
+Rule files come from three layers, lowest precedence first (see
+hookify.core.config_loader for how their rules are merged):
+
+    org      HOOKIFY_ORG_RULES_DIR (default /etc/claude-code/hookify)
+    user     HOOKIFY_USER_RULES_DIR (default ~/.claude)
+    project  .claude/ in the current directory
+
+Finding the files and snapshotting their stats needs nothing but os and
+glob, so hook-side code that only has to know whether rules changed (the
+daemon client, the decision cache) does not import the rule parser.
+"""
+
+import os
+import glob
+from typing import List, Tuple
+
+
+DEFAULT_ORG_RULES_DIR = os.path.join(os.sep, 'etc', 'claude-code', 'hookify')
+DEFAULT_USER_RULES_DIR = os.path.join('~', '.claude')
+PROJECT_RULES_DIR = '.claude'
+RULE_FILE_GLOB = 'hookify.*.local.md'
+
+
+def rule_layers() -> List[Tuple[str, str]]:
+    """Rule layers as (name, directory), lowest precedence first.
+
+    A directory that is also a higher layer (e.g. ~/.claude when working in
+    the home directory) only counts as the higher one.
+    """
+    layers = []
+    seen = set()
+    for name, directory in (
+        ('project', PROJECT_RULES_DIR),
+        ('user', os.path.expanduser(os.environ.get('HOOKIFY_USER_RULES_DIR', DEFAULT_USER_RULES_DIR))),
+        ('org', os.environ.get('HOOKIFY_ORG_RULES_DIR', DEFAULT_ORG_RULES_DIR)),
+    ):
+        real_path = os.path.realpath(directory) if directory else None
+        if real_path and real_path not in seen:
+            seen.add(real_path)
+            layers.append((name, directory))
+    return layers[::-1]
+
+
+def rules_manifest() -> List[Tuple[str, int, int, int]]:
+    """Snapshot (path, mtime_ns, size, inode) of the rule files of all layers.
+
+    Any added, removed or edited rule file changes the manifest.
+    """
+    manifest = []
+    for _name, directory in rule_layers():
+        manifest.extend(layer_manifest(directory))
+    return manifest
+
+
+def layer_manifest(directory: str) -> List[Tuple[str, int, int, int]]:
+    """Snapshot (path, mtime_ns, size, inode) of the rule files in directory."""
+    manifest = []
+    for file_path in glob.glob(os.path.join(directory, RULE_FILE_GLOB)):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue  # Removed since the glob
+        manifest.append((file_path, st.st_mtime_ns, st.st_size, st.st_ino))
+    manifest.sort()
+    return manifest
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Private per-user directory for hookify's daemon sockets and decision cache.
+
+The directory is $XDG_RUNTIME_DIR/hookify when XDG_RUNTIME_DIR is set, else
+hookify-<uid> in $TMPDIR (or /tmp). A name in a shared temp dir is
+predictable: another local user can create it first and put a socket that
+allows everything, or planted cache entries, in it. The directory is
+therefore only used if it is a real directory (not a symlink) owned by the
+current user with no group or other permissions; otherwise callers
+evaluate in-process and without the cache.
+"""
+
+import os
+import sys
+import stat
+from typing import Optional
+
+
+_warned = set()
+
+
+def runtime_dir_path() -> str:
+    """Path of the runtime directory, whether or not it exists or is safe."""
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base and os.path.isabs(base):
+        return os.path.join(base, 'hookify')
+    # Not tempfile.gettempdir(): importing tempfile costs every hook call
+    # more than the directory lookup it would save
+    temp_dir = os.environ.get('TMPDIR')
+    if not temp_dir or not os.path.isabs(temp_dir):
+        temp_dir = '/tmp'
+    return os.path.join(temp_dir, f"hookify-{os.getuid()}")
+
+
+def runtime_dir(create: bool = False) -> Optional[str]:
+    """Path of the runtime directory if it is safe to use, else None.
+
+    Args:
+        create: Create the directory (mode 0700) if it does not exist
+    """
+    path = runtime_dir_path()
+    if create:
+        try:
+            os.mkdir(path, 0o700)
+        except FileExistsError:
+            pass
+        except OSError:
+            return None
+    return path if is_private_dir(path) else None
+
+
+def is_private_dir(path: str) -> bool:
+    """Whether path is a directory (not a symlink) of the current user that
+    nobody else can read, write or enter. Warns once if it exists but is not."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    if stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o077:
+        return True
+    if path not in _warned:
+        _warned.add(path)
+        print(f"Warning: not using {path}: it must be a directory of this user with mode 0700", file=sys.stderr)
+    return False
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+"""
+Shell tokenizer for Bash command rules.
+
+Parses a Bash command line once into the commands it would run, so rules
+can match tokens instead of regexing the raw string. Quotes, backslashes
+and extra whitespace are removed the way the shell removes them, and
+commands hidden in $(...), backticks, ( ... ) groups, <(...) process
+substitutions, `bash -c '...'` and `eval` are parsed too:
+
+    >>> parsed = parse_command("FOO=1 sudo /bin/rm -rf '/' 2>/dev/null | tee log")
+    >>> [command.text for command in parsed.pipeline]
+    ['sudo /bin/rm -rf /', 'rm -rf /', 'tee log']
+    >>> parsed.redirect_targets
+    ('/dev/null',)
+
+parse_command() returns a ParsedCommand with
+    pipeline          every simple command (a Command: argv0, args,
+                      redirect_targets and stage, its position in a
+                      `a | b` pipeline), across |, ;, &&, || and &, in order
+    redirect_targets  file names of all <, >, >>, &> ... redirections
+    subshells         source text of every command substitution, group,
+                      process substitution, `sh -c` string and eval
+and argv0s() / args() flatten the pipeline into token lists.
+
+argv0 is the executable name without its directory. Variable assignments
+before a command and wrappers that run the rest of their arguments as a
+command (sudo, env, nice, timeout, xargs, ...) are looked through: the
+wrapped command is added to the pipeline after the wrapper. So are the
+command lines run by ssh, watch, parallel, su -c and find -exec. Code of
+other interpreters (python -c, perl -e, ...) is not parsed. Expansions
+($VAR, globs, ~) are kept as written. This is not a full shell parser:
+control structures are reduced to the commands in their bodies.
+
+Only the standard library is used, and nothing beyond what json already
+imports, because hooks import this on every Bash tool call. The file is
+kept identical in plugins/governance-layer/hooks and plugins/hookify/core:
+plugins are installed independently and cannot import each other
+(tests/test_shell_command.py fails when the copies differ).
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+# Subshells nested deeper than this are recorded but not parsed
+MAX_DEPTH = 8
+
+# Largest \U escape that is a character (chr() raises above it)
+MAX_CODE_POINT = 0x10FFFF
+
+# Reserved words skipped at the start of a command
+RESERVED_WORDS = {"!", "{", "}", "if", "then", "else", "elif", "fi", "do", "done", "while", "until",
+                  "esac", "coproc"}
+# Headers whose words are not a command (for x in ...; case $x in ...)
+HEADER_WORDS = {"for", "select", "case"}
+
+# Wrapper -> (options that take a value, positional arguments before the command)
+WRAPPERS = {
+    "sudo": ({"-u", "-g", "-C", "-D", "-h", "-p", "-r", "-t", "-T", "-U"}, 0),
+    "doas": ({"-u", "-C"}, 0),
+    "env": ({"-u", "-C", "-S"}, 0),
+    "nice": ({"-n"}, 0),
+    "ionice": ({"-c", "-n", "-p"}, 0),
+    "nohup": (set(), 0),
+    "time": ({"-f", "-o"}, 0),
+    "command": (set(), 0),
+    "builtin": (set(), 0),
+    "exec": ({"-a"}, 0),
+    "stdbuf": ({"-i", "-o", "-e"}, 0),
+    "timeout": ({"-s", "-k"}, 1),
+    "xargs": ({"-a", "-d", "-E", "-I", "-L", "-n", "-P", "-s"}, 0),
+    "setsid": (set(), 0),
+    "chroot": ({"--userspec", "--groups"}, 1),
+}
+# Runner -> (options that take a value, positional arguments before the command),
+# for runners that join the rest of their arguments into a command line for a shell
+STRING_RUNNERS = {
+    "ssh": ({"-b", "-B", "-c", "-D", "-E", "-e", "-F", "-I", "-i", "-J", "-L", "-l", "-m", "-O", "-o", "-p",
+             "-Q", "-R", "-S", "-W", "-w"}, 1),
+    "watch": ({"-n", "--interval"}, 0),
+    "parallel": ({"-j", "--jobs", "-S", "--sshlogin", "-a", "--arg-file", "-n", "-N", "-L", "-I", "-P",
+                  "--delay", "--timeout", "--colsep"}, 0),
+}
+# Shells whose -c argument is a command line
+SHELLS = {"sh", "bash", "zsh", "dash", "ksh"}
+# Commands whose -c / --command option is a command line
+COMMAND_OPTION_RUNNERS = {"su", "runuser"}
+# find actions running the command that follows them, up to ";" or "+"
+FIND_EXEC_ACTIONS = {"-exec", "-execdir", "-ok", "-okdir"}
+
+_ANSI_C_ESCAPES = {"a": "\a", "b": "\b", "e": "\x1b", "E": "\x1b", "f": "\f", "n": "\n", "r": "\r",
+                   "t": "\t", "v": "\v", "\\": "\\", "'": "'", '"': '"', "?": "?"}
+
+
+class Command(namedtuple("Command", ["argv0", "args", "redirect_targets", "stage"])):
+    """
+    One simple command: executable name, arguments, redirection targets and
+    its position in the pipeline it belongs to (0 unless | or |& feeds it).
+    """
+    __slots__ = ()
+
+    @property
+    def text(self):
+        """
+        The command as one normalized string: argv0 and args joined by spaces.
+        """
+        return " ".join((self.argv0,) + self.args)
+
+
+class ParsedCommand(namedtuple("ParsedCommand", ["pipeline", "redirect_targets", "subshells"])):
+    """
+    A parsed command line, see parse_command().
+    """
+    __slots__ = ()
+
+    def argv0s(self):
+        return tuple(command.argv0 for command in self.pipeline)
+
+    def args(self):
+        return tuple(arg for command in self.pipeline for arg in command.args)
+
+
+@lru_cache(maxsize=256)
+def parse_command(command):
+    """
+    Parse a Bash command line into a ParsedCommand. Never raises: unbalanced
+    quotes or parentheses end at the end of the string.
+    """
+    pipeline, redirect_targets, subshells = [], [], []
+    _parse(command, 0, pipeline, redirect_targets, subshells)
+    return ParsedCommand(tuple(pipeline), tuple(redirect_targets), tuple(subshells))
+
+
+def _parse(command, depth, pipeline, redirect_targets, subshells):
+    lexer = _Lexer(command)
+    lexer.run()
+    nested = []  # Subshells found while tokenizing, parsed after this level
+
+    def parse_nested(source):
+        subshells.append(source)
+        if depth < MAX_DEPTH:
+            _parse(source, depth + 1, pipeline, redirect_targets, subshells)
+
+    words, targets = [], []
+    stage = 0
+    tokens = lexer.tokens
+    i = 0
+    while i < len(tokens):
+        kind, value = tokens[i]
+        if kind == "word":
+            words.append(value)
+        elif kind == "subst":
+            nested.append(value)
+        elif kind == "redir":
+            while i + 1 < len(tokens) and tokens[i + 1][0] == "subst":
+                i += 1
+                nested.append(tokens[i][1])  # Read while reading the target word
+            if i + 1 < len(tokens) and tokens[i + 1][0] == "word":
+                i += 1
+                target = tokens[i][1][0]
+                if value in ("<<", "<<-", "<<<"):
+                    pass  # Here-document delimiter or here-string, not a file
+                elif value in (">&", "<&") and (target.isdigit() or target == "-"):
+                    pass  # Duplicates a file descriptor
+                else:
+                    targets.append(target)
+        elif kind == "group":
+            if words:
+                words = []  # name() { ...; }: a function definition, not a command
+            elif value.strip():
+                parse_nested(value)
+        else:  # Separator
+            if value != ")":  # A command ended by ")" is a case pattern
+                _add_command(words, targets, stage, pipeline, parse_nested)
+            redirect_targets.extend(targets)
+            words, targets = [], []
+            stage = stage + 1 if value in ("|", "|&") else 0
+        i += 1
+    _add_command(words, targets, stage, pipeline, parse_nested)
+    redirect_targets.extend(targets)
+    for source in nested:
+        parse_nested(source)
+
+
+def _add_command(words, targets, stage, pipeline, parse_nested):
+    """
+    Add the command made of words (value, unquoted) to the pipeline.
+    """
+    start = 0
+    while start < len(words):
+        value, unquoted = words[start]
+        if unquoted and value in RESERVED_WORDS:
+            start += 1
+        elif unquoted and value in HEADER_WORDS:
+            return
+        elif unquoted and value == "function":
+            start += 2  # function NAME { ...; }
+        elif _is_assignment(value, unquoted):
+            start += 1
+        else:
+            break
+    _add_argv([value for value, _unquoted in words[start:]], targets, stage, pipeline, parse_nested)
+
+
+def _add_argv(argv, targets, stage, pipeline, parse_nested):
+    """
+    Add the command argv and the commands it runs to the pipeline.
+    """
+    while argv:
+        argv0 = argv[0].rsplit("/", 1)[-1] or argv[0]
+        args = tuple(argv[1:])
+        pipeline.append(Command(argv0, args, tuple(targets), stage))
+        if argv0 in SHELLS:
+            script = _shell_script(args)
+            if script is not None:
+                parse_nested(script)
+        elif argv0 in COMMAND_OPTION_RUNNERS:
+            script = _command_option(args)
+            if script is not None:
+                parse_nested(script)
+        elif argv0 in STRING_RUNNERS:
+            value_options, positionals = STRING_RUNNERS[argv0]
+            rest = args[_skip_options(argv0, args, value_options) + positionals:]
+            if argv0 == "parallel":
+                rest = rest[:next((i for i, arg in enumerate(rest) if arg.startswith(":::")), len(rest))]
+            if rest:
+                parse_nested(" ".join(rest))
+        elif argv0 == "find":
+            for command in _find_commands(args):
+                _add_argv(command, targets, stage, pipeline, parse_nested)
+        elif argv0 == "eval" and args:
+            parse_nested(" ".join(args))
+        argv = _wrapped_command(argv0, args)
+
+
+def _is_assignment(value, unquoted):
+    name, equals, _ = value.partition("=")
+    return bool(equals) and unquoted > len(name) and name.rstrip("+").isidentifier()
+
+
+def _shell_script(args):
+    """
+    The command string of `sh -c STRING`, or None.
+    """
+    for index, arg in enumerate(args):
+        if arg == "--" or not arg.startswith("-"):
+            return None
+        if "c" in arg[1:] and not arg.startswith("--"):
+            return args[index + 1] if index + 1 < len(args) else None
+    return None
+
+
+def _command_option(args):
+    """
+    The command string of `su -c STRING` (also --command, -lc ...), or None.
+    """
+    for index, arg in enumerate(args):
+        if arg == "--":
+            return None
+        if arg.startswith("--command="):
+            return arg[len("--command="):]
+        if arg == "--command" or (arg.startswith("-") and not arg.startswith("--") and "c" in arg[1:]):
+            return args[index + 1] if index + 1 < len(args) else None
+    return None
+
+
+def _find_commands(args):
+    """
+    Arguments of the commands run by find -exec, -execdir, -ok and -okdir.
+    """
+    commands = []
+    index = 0
+    while index < len(args):
+        if args[index] in FIND_EXEC_ACTIONS:
+            end = index + 1
+            while end < len(args) and args[end] not in (";", "+"):
+                end += 1
+            commands.append(list(args[index + 1:end]))
+            index = end
+        index += 1
+    return commands
+
+
+def _wrapped_command(argv0, args):
+    """
+    Arguments of the command a wrapper runs, or [] for other commands.
+    """
+    if argv0 not in WRAPPERS:
+        return []
+    value_options, positionals = WRAPPERS[argv0]
+    return list(args[_skip_options(argv0, args, value_options) + positionals:])
+
+
+def _skip_options(argv0, args, value_options):
+    """
+    Index of the first argument of args after the options of argv0.
+    """
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg == "--":
+            index += 1
+            break
+        if arg in value_options:
+            index += 2
+        elif arg.startswith("-") and len(arg) > 1:
+            index += 1
+        elif argv0 == "env" and "=" in arg:
+            index += 1
+        else:
+            break
+    return index
+
+
+class _Lexer:
+    """
+    Splits a command line into tokens:
+        ("word", (value, unquoted))  value with quotes removed; unquoted is
+                                     how many leading characters were not
+                                     quoted or escaped
+        ("op", separator)            newline, ;, &, |, &&, ||, |&, ;;, ;&, ;;& or )
+        ("redir", operator)          the next word is its target
+        ("group", source)            a ( ... ) subshell
+        ("subst", source)            a $(...), `...` or <(...) inside a word
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+        self.tokens = []
+        self.heredocs = []  # (delimiter, strip_tabs, expand) waiting for the next newline
+
+    def run(self):
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in " \t\r":
+                self.pos += 1
+            elif char == "\n":
+                self.pos += 1
+                self.tokens.append(("op", "\n"))
+                self._read_heredocs()
+            elif char == "#":
+                end = text.find("\n", self.pos)
+                self.pos = len(text) if end < 0 else end
+            elif char == "\\" and text.startswith("\\\n", self.pos):
+                self.pos += 2
+            elif char in ";&|":
+                self._read_operator()
+            elif char == "(":
+                self.pos += 1
+                self.tokens.append(("group", self._read_until_paren()))
+            elif char == ")":
+                self.pos += 1
+                self.tokens.append(("op", ")"))
+            elif char in "<>" and not text.startswith("(", self.pos + 1):
+                self._read_redirection()
+            else:
+                self._read_word()
+
+    def _read_operator(self):
+        for operator in (";;&", "&>>", ";;", ";&", "&&", "||", "|&", "&>", ";", "&", "|"):
+            if self.text.startswith(operator, self.pos):
+                self.pos += len(operator)
+                kind = "redir" if operator in ("&>", "&>>") else "op"
+                self.tokens.append((kind, operator))
+                return
+
+    def _read_redirection(self):
+        for operator in ("<<<", "<<-", "<<", "<>", "<&", "<", ">>", ">|", ">&", ">"):
+            if self.text.startswith(operator, self.pos):
+                self.pos += len(operator)
+                self.tokens.append(("redir", operator))
+                if operator in ("<<", "<<-"):
+                    self._skip_blanks()
+                    start = len(self.tokens)
+                    self._read_word()
+                    if len(self.tokens) > start:
+                        delimiter, unquoted = self.tokens[-1][1]
+                        self.heredocs.append((delimiter, operator == "<<-", unquoted == len(delimiter)))
+                return
+
+    def _skip_blanks(self):
+        while self.pos < len(self.text) and self.text[self.pos] in " \t":
+            self.pos += 1
+
+    def _read_heredocs(self):
+        """
+        Skip the bodies of the here-documents started on the previous line.
+        """
+        for delimiter, strip_tabs, expand in self.heredocs:
+            start = self.pos
+            while self.pos < len(self.text):
+                end = self.text.find("\n", self.pos)
+                end = len(self.text) if end < 0 else end
+                line = self.text[self.pos:end]
+                self.pos = min(end + 1, len(self.text))
+                if (line.lstrip("\t") if strip_tabs else line) == delimiter:
+                    break
+            if expand:
+                # Unquoted delimiters expand $(...) and `...` in the body
+                _Lexer(self.text[start:self.pos])._collect_substitutions(self.tokens)
+        self.heredocs = []
+
+    def _collect_substitutions(self, tokens):
+        while self.pos < len(self.text):
+            self._read_double_quoted(None, [])
+        tokens.extend(token for token in self.tokens if token[0] == "subst")
+
+    def _read_word(self):
+        text = self.text
+        value = []
+        unquoted = None  # Length of value when the first quote or escape was read
+        start = self.pos
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char in " \t\r\n;&|)":
+                break
+            if char in "<>":
+                if text.startswith("(", self.pos + 1):
+                    self.pos += 2
+                    source = self._read_until_paren()
+                    self.tokens.append(("subst", source))
+                    value.append(f"{char}({source})")
+                    continue
+                if value and unquoted is None and "".join(value).isdigit():
+                    value = []  # File descriptor number of a redirection
+                break
+            if char == "(":
+                if value and value[-1].endswith("="):
+                    self.pos += 1
+                    value.append(f"({self._read_until_paren()})")  # Array assignment
+                    continue
+                break
+            if unquoted is None and char in "'\"\\`" or text.startswith("$'", self.pos) \
+                    or text.startswith('$"', self.pos):
+                unquoted = len("".join(value)) if unquoted is None else unquoted
+            if char == "'":
+                end = text.find("'", self.pos + 1)
+                end = len(text) if end < 0 else end
+                value.append(text[self.pos + 1:end])
+                self.pos = end + 1
+            elif char == '"':
+                self.pos += 1
+                self._read_double_quoted('"', value)
+            elif char == "\\":
+                if text.startswith("\\\n", self.pos):
+                    self.pos += 2
+                else:
+                    value.append(text[self.pos + 1:self.pos + 2])
+                    self.pos += 2
+            elif char == "`":
+                value.append(self._read_backticks())
+            elif char == "$":
+                self._read_dollar(value)
+            else:
+                value.append(char)
+                self.pos += 1
+        if self.pos > start and (value or unquoted is not None):
+            word = "".join(value)
+            self.tokens.append(("word", (word, len(word) if unquoted is None else unquoted)))
+
+    def _read_double_quoted(self, end_char, value):
+        """
+        Read up to end_char (None: the end of the text) with double-quote rules.
+        """
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char == end_char:
+                self.pos += 1
+                return
+            if char == "\\" and self.pos + 1 < len(text):
+                following = text[self.pos + 1]
+                if following == "\n":
+                    pass
+                elif following in '$`"\\':
+                    value.append(following)
+                else:
+                    value.append(char + following)
+                self.pos += 2
+            elif char == "`":
+                value.append(self._read_backticks())
+            elif char == "$":
+                self._read_dollar(value, quoted=True)
+            else:
+                value.append(char)
+                self.pos += 1
+
+    def _read_dollar(self, value, quoted=False):
+        text = self.text
+        if text.startswith("$((", self.pos):
+            self.pos += 3
+            value.append(f"$(({self._read_until_paren()})")  # Arithmetic, closed by "))"
+            if text.startswith(")", self.pos):
+                self.pos += 1
+                value.append(")")
+        elif text.startswith("$(", self.pos):
+            self.pos += 2
+            source = self._read_until_paren()
+            self.tokens.append(("subst", source))
+            value.append(f"$({source})")
+        elif text.startswith("${", self.pos):
+            close = self._find_closing(self.pos + 2, "{", "}")
+            end = len(text) if close < 0 else close + 1
+            value.append(text[self.pos:end])
+            self.pos = end
+        elif text.startswith("$'", self.pos) and not quoted:
+            self.pos += 2
+            value.append(self._read_ansi_c())
+        elif text.startswith('$"', self.pos) and not quoted:
+            self.pos += 2
+            self._read_double_quoted('"', value)
+        else:
+            value.append("$")
+            self.pos += 1
+
+    def _read_backticks(self):
+        """
+        Read a `...` substitution; returns it as written.
+        """
+        text = self.text
+        body = []
+        index = self.pos + 1
+        while index < len(text) and text[index] != "`":
+            if text[index] == "\\" and index + 1 < len(text):
+                following = text[index + 1]
+                body.append(following if following in "$`\\" else text[index:index + 2])
+                index += 2
+            else:
+                body.append(text[index])
+                index += 1
+        source = "".join(body)
+        self.tokens.append(("subst", source))
+        self.pos = index + 1
+        return f"`{source}`"
+
+    def _read_until_paren(self):
+        """Read to the ")" matching an opening "(" just before pos; returns what is between."""
+        close = self._find_closing(self.pos, "(", ")")
+        if close < 0:
+            source, self.pos = self.text[self.pos:], len(self.text)
+        else:
+            source, self.pos = self.text[self.pos:close], close + 1
+        return source
+
+    def _find_closing(self, pos, opening, closing):
+        """
+        Index of the closing bracket that balances one already open (-1 if none), skipping quotes.
+        """
+        text = self.text
+        level = 1
+        while pos < len(text):
+            char = text[pos]
+            if char == "\\":
+                pos += 2
+                continue
+            if char == "'":
+                end = text.find("'", pos + 1)
+                pos = len(text) if end < 0 else end + 1
+                continue
+            if char == '"':
+                pos += 1
+                while pos < len(text) and text[pos] != '"':
+                    pos += 2 if text[pos] == "\\" else 1
+                pos += 1
+                continue
+            if char == opening:
+                level += 1
+            elif char == closing:
+                level -= 1
+                if level == 0:
+                    return pos
+            pos += 1
+        return -1
+
+    def _read_ansi_c(self):
+        """
+        Read the rest of a $'...' string, decoding its escapes.
+        """
+        text = self.text
+        value = []
+        while self.pos < len(text) and text[self.pos] != "'":
+            char = text[self.pos]
+            if char != "\\" or self.pos + 1 >= len(text):
+                value.append(char)
+                self.pos += 1
+                continue
+            escape = text[self.pos + 1]
+            self.pos += 2
+            if escape in _ANSI_C_ESCAPES:
+                value.append(_ANSI_C_ESCAPES[escape])
+            elif escape in "xuU":
+                length = {"x": 2, "u": 4, "U": 8}[escape]
+                digits = _take(text, self.pos, length, "0123456789abcdefABCDEF")
+                code = int(digits, 16) if digits else -1
+                if 0 <= code <= MAX_CODE_POINT and not 0xD800 <= code <= 0xDFFF:
+                    value.append(chr(code))
+                else:
+                    value.append("\\" + escape + digits)  # Not a character: kept as written
+                self.pos += len(digits)
+            elif escape in "01234567":
+                digits = escape + _take(text, self.pos, 2, "01234567")
+                value.append(chr(int(digits, 8)))
+                self.pos += len(digits) - 1
+            else:
+                value.append("\\" + escape)
+        self.pos += 1
+        return "".join(value)
+
+
+def _take(text, pos, length, allowed):
+    end = pos
+    while end < len(text) and end - pos < length and text[end] in allowed:
+        end += 1
+    return text[pos:end]
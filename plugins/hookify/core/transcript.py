@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""Streaming evaluation of transcript conditions for hookify Stop rules.
+
+Session transcripts are JSONL files that can grow to hundreds of MB. Rather
+than reading the whole file into one string per condition, TranscriptSource
+reads it once in line-aligned blocks and feeds every transcript condition of
+the event from the same pass. Only one block plus a small context window is
+held in memory.
+
+Matches spanning block boundaries: each block is searched together with the
+preceding context, and a match only counts once it ends inside the current
+block. Patterns that cannot match a newline never span blocks (blocks end on
+line boundaries); other patterns get an overlap of their maximum match
+width, capped at MAX_OVERLAP characters for unbounded ones.
+
+Given a TranscriptTail for the session, the state of every matcher is saved
+after each pass, and the next Stop event resumes from there instead of
+rescanning the whole transcript.
+"""
+
+import re
+import sys
+import json
+import locale
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from hookify.core.config_loader import Condition
+from hookify.core.regex_analysis import max_match_width, may_cross_lines
+from hookify.core.regex_budget import BudgetedPattern, RegexTimeout
+from hookify.core.transcript_tail import TranscriptTail
+
+
+# Bytes read per block (blocks are then extended to the next newline)
+CHUNK_SIZE = 1024 * 1024
+
+# Longest overlap kept between blocks, i.e. the longest match of an unbounded
+# multi-line pattern that is still found when it spans two blocks
+MAX_OVERLAP = 64 * 1024
+
+# Transcripts are decoded as open() would by default
+ENCODING = locale.getpreferredencoding(False)
+
+# Real text after a block, so `$` and lookaheads don't see a fake string end
+LOOKAHEAD = 2
+
+ConditionKey = Tuple[str, str]  # (operator, pattern)
+
+
+class _SearchMatcher:
+    """Streams a regex_match/contains/not_contains condition."""
+
+    def __init__(self, pattern: str, regex: Optional[Union[re.Pattern, BudgetedPattern]], overlap: int):
+        self.pattern = pattern
+        self.regex = regex  # None for literal substring search
+        self.overlap = overlap
+        self.found = False
+        self.timed_out = False
+
+    def feed(self, window: str, start: int, limit: int) -> None:
+        """Look for a match starting at or after start and ending by limit."""
+        if self.regex is None:
+            index = window.find(self.pattern, start)
+            self.found = index != -1 and index + len(self.pattern) <= limit
+            return
+
+        try:
+            match = self.regex.search(window, start)
+            while match is not None and match.start() <= limit:
+                if match.end() <= limit:
+                    self.found = True
+                    return
+                # Runs past the block: the next window sees it in full. A later
+                # match may still end inside this block.
+                match = self.regex.search(window, match.start() + 1)
+        except RegexTimeout:
+            # Stop searching: the condition stays unmatched for this pass
+            print(f"Warning: Regex pattern '{self.pattern}' ran out of its time budget in the transcript, "
+                  f"treating it as not matched", file=sys.stderr)
+            self.timed_out = True
+
+
+class _WholeTextMatcher:
+    """Streams equals/starts_with/ends_with without holding the text."""
+
+    def __init__(self, operator: str, pattern: str):
+        self.operator = operator
+        self.pattern = pattern
+        self.length = 0
+        self.prefix_ok = True
+        self.suffix = ''
+
+    def feed_block(self, block: str) -> None:
+        if self.prefix_ok and self.length < len(self.pattern):
+            expected = self.pattern[self.length:self.length + len(block)]
+            self.prefix_ok = block.startswith(expected) if len(block) >= len(expected) \
+                else expected.startswith(block)
+        self.length += len(block)
+        if self.operator == 'ends_with' and self.pattern:
+            self.suffix = (self.suffix + block[-len(self.pattern):])[-len(self.pattern):]
+
+    def result(self) -> bool:
+        if self.operator == 'equals':
+            return self.prefix_ok and self.length == len(self.pattern)
+        elif self.operator == 'starts_with':
+            return self.prefix_ok and self.length >= len(self.pattern)
+        return self.suffix.endswith(self.pattern)
+
+
+class TranscriptSource:
+    """Evaluates transcript conditions in a single streaming pass.
+
+    With a TranscriptTail, the matcher states are saved at the end of each
+    pass so that the next evaluation in the same session only reads what
+    was appended to the transcript since (plus its last line, whose
+    matches may depend on being at the end of the text).
+    """
+
+    def __init__(self, path: str, chunk_size: int = CHUNK_SIZE,
+                 tail: Optional[TranscriptTail] = None):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.tail = tail
+
+    def evaluate(self, conditions: Iterable[Condition],
+                 compile_regex) -> Dict[ConditionKey, bool]:
+        """Evaluate conditions against the transcript file.
+
+        Args:
+            conditions: Conditions on the transcript field
+            compile_regex: Regex compiler (rule_engine.compile_budgeted)
+
+        Returns:
+            Match result per (operator, pattern). Conditions with an unknown
+            operator or an invalid regex are left out.
+
+        Raises:
+            OSError, UnicodeDecodeError: If the transcript cannot be read
+        """
+        search: Dict[ConditionKey, _SearchMatcher] = {}
+        whole: Dict[ConditionKey, _WholeTextMatcher] = {}
+
+        for condition in conditions:
+            key = (condition.operator, condition.pattern)
+            if key in search or key in whole:
+                continue
+            if condition.operator in ('contains', 'not_contains'):
+                overlap = len(condition.pattern) - 1 if '\n' in condition.pattern else 0
+                search[key] = _SearchMatcher(condition.pattern, None, max(overlap, 0))
+            elif condition.operator == 'regex_match':
+                try:
+                    regex = compile_regex(condition.pattern)
+                except re.error:
+                    continue  # Reported by the caller's fallback path
+                search[key] = _SearchMatcher(condition.pattern, regex, _overlap(condition.pattern))
+            elif condition.operator in ('equals', 'starts_with', 'ends_with'):
+                whole[key] = _WholeTextMatcher(condition.operator, condition.pattern)
+
+        stream = _Stream(1 + max((m.overlap for m in search.values()), default=0))
+        offset = self._resume(stream, search, whole)
+
+        if not offset or whole or not all(m.found for m in search.values()):
+            self._scan(stream, offset, search, whole)
+
+        results: Dict[ConditionKey, bool] = {}
+        for key, matcher in search.items():
+            results[key] = not matcher.found if key[0] == 'not_contains' else matcher.found
+        for key, matcher in whole.items():
+            results[key] = matcher.result()
+        return results
+
+    def _scan(self, stream: '_Stream', offset: int, search: Dict[ConditionKey, _SearchMatcher],
+              whole: Dict[ConditionKey, _WholeTextMatcher]) -> None:
+        """Feed the transcript from offset on to all matchers."""
+        # Literals are shared between contains and not_contains
+        pending = {id(m): m for m in search.values() if not m.found}
+        previous = b''
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for block in self._blocks(f):
+                if previous:
+                    self._feed(stream, pending, whole, previous, block[:LOOKAHEAD])
+                    offset += len(previous)
+                previous = block
+
+        # Checkpoint before the last line: matches in it may rely on the
+        # text ending there, which stops being true once more is appended
+        cut = previous.rfind(b'\n', 0, len(previous) - 1) + 1
+        if cut:
+            self._feed(stream, pending, whole, previous[:cut], previous[cut:cut + LOOKAHEAD])
+            offset += cut
+            previous = previous[cut:]
+        if self.tail is not None:
+            self._save(stream, offset, search, whole)
+
+        # Last line (or the empty transcript, which still matches e.g. `^$`)
+        self._feed(stream, pending, whole, previous, b'')
+
+    def _blocks(self, f) -> Iterator[bytes]:
+        """Yield the file in blocks that end on a line boundary."""
+        pending: List[bytes] = []
+        while True:
+            chunk = f.read(self.chunk_size)
+            if not chunk:
+                break
+            newline = chunk.rfind(b'\n')
+            if newline == -1:
+                pending.append(chunk)  # Very long line: keep extending
+                continue
+            pending.append(chunk[:newline + 1])
+            yield b''.join(pending)
+            pending = [chunk[newline + 1:]] if newline + 1 < len(chunk) else []
+        if pending:
+            yield b''.join(pending)
+
+    @staticmethod
+    def _feed(stream: '_Stream', pending: Dict[int, _SearchMatcher],
+              whole: Dict[ConditionKey, _WholeTextMatcher], data: bytes, lookahead: bytes) -> None:
+        """Search one block (with context) for all unresolved matchers.
+
+        Args:
+            stream: Text preceding the block
+            pending: Matchers without a match so far, removed once they match
+            whole: Matchers that see every block
+            data: Block to search
+            lookahead: Start of the data following the block
+        """
+        block = _decode(data)
+        for matcher in whole.values():
+            matcher.feed_block(block)
+
+        if pending:
+            tail = stream.tail
+            window = tail + block + _decode(lookahead, errors='ignore')
+            limit = len(tail) + len(block)
+            for matcher_id, matcher in list(pending.items()):
+                # Keep one character of real context before the search start so
+                # `^` and `\b` behave as they would on the full text
+                start = max(len(tail) - matcher.overlap, 0 if stream.at_start() else 1)
+                matcher.feed(window, start, limit)
+                if matcher.found or matcher.timed_out:
+                    del pending[matcher_id]
+        stream.advance(block)
+
+    def _resume(self, stream: '_Stream', search: Dict[ConditionKey, _SearchMatcher],
+                whole: Dict[ConditionKey, _WholeTextMatcher]) -> int:
+        """Restore the state saved by the previous evaluation, if usable."""
+        if self.tail is None:
+            return 0
+        offset, data = self.tail.resume()
+        saved = data.get('matchers', {})
+        keys = [json.dumps(key) for key in list(search) + list(whole)]
+        if not offset or data.get('context', 0) < stream.context or \
+                not all(key in saved for key in keys):
+            return 0  # Some condition was not tracked yet: start over
+
+        stream.tail = data.get('tail', '')
+        stream.consumed = data.get('consumed', 0)
+        for key, matcher in search.items():
+            matcher.found = bool(saved[json.dumps(key)])
+        for key, matcher in whole.items():
+            matcher.length, matcher.prefix_ok, matcher.suffix = saved[json.dumps(key)]
+        return offset
+
+    def _save(self, stream: '_Stream', offset: int, search: Dict[ConditionKey, _SearchMatcher],
+              whole: Dict[ConditionKey, _WholeTextMatcher]) -> None:
+        """Save the matcher states reached at offset."""
+        matchers: Dict[str, Any] = {}
+        for key, matcher in search.items():
+            matchers[json.dumps(key)] = matcher.found
+        for key, matcher in whole.items():
+            matchers[json.dumps(key)] = [matcher.length, matcher.prefix_ok, matcher.suffix]
+        self.tail.save(offset, {
+            'context': stream.context,
+            'tail': stream.tail,
+            'consumed': stream.consumed,
+            'matchers': matchers,
+        })
+
+
+class _Stream:
+    """Position in the transcript text: characters consumed and their tail."""
+
+    def __init__(self, context: int):
+        self.context = context  # Characters of preceding text kept in tail
+        self.tail = ''
+        self.consumed = 0
+
+    def at_start(self) -> bool:
+        """True if tail is all of the text consumed so far."""
+        return self.consumed <= self.context
+
+    def advance(self, block: str) -> None:
+        self.consumed += len(block)
+        self.tail = _keep_tail(self.tail, block, self.context)
+
+
+def _overlap(pattern: str) -> int:
+    """Characters of the previous block a pattern needs to see."""
+    if not may_cross_lines(pattern):
+        return 0
+    width = max_match_width(pattern)
+    if width is None:
+        return MAX_OVERLAP
+    return min(max(width - 1, 0), MAX_OVERLAP)
+
+
+def _decode(data: bytes, errors: str = 'strict') -> str:
+    """Decode like open(path, 'r'): locale encoding, universal newlines."""
+    text = data.decode(ENCODING, errors)
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+def _keep_tail(tail: str, block: str, size: int) -> str:
+    if len(block) >= size:
+        return block[-size:]
+    return (tail + block)[-size:]
@@ -19,8 +19,7 @@ if PLUGIN_ROOT:
         sys.path.insert(0, PLUGIN_ROOT)
 
 try:
-    from hookify.core.config_loader import load_rules
-    from hookify.core.rule_engine import RuleEngine
+    from hookify.core.client import evaluate
 except ImportError as e:
     error_msg = {"systemMessage": f"Hookify import error: {e}"}
     print(json.dumps(error_msg), file=sys.stdout)
@@ -33,12 +32,8 @@ def main():
         # Read input from stdin
         input_data = json.load(sys.stdin)
 
-        # Load stop rules
-        rules = load_rules(event='stop')
-
-        # Evaluate rules
-        engine = RuleEngine()
-        result = engine.evaluate_rules(rules, input_data)
+        # Evaluate rules (via the hookify daemon when it is running)
+        result = evaluate('stop', input_data)
 
         # Always output JSON (even if empty)
         print(json.dumps(result), file=sys.stdout)
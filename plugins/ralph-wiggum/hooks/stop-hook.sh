@@ -67,8 +67,21 @@ if [[ ! -f "$TRANSCRIPT_PATH" ]]; then
 fi
 
 # Read last assistant message from transcript (JSONL format - one JSON per line)
+# transcript_tail.py seeks backwards from the end and remembers how far it got
+# per session, so each iteration only reads what was appended since the last
+# one instead of grepping the whole (ever growing) transcript
+TRANSCRIPT_TAIL="${CLAUDE_PLUGIN_ROOT:-$(dirname "$0")/..}/scripts/transcript_tail.py"
+SESSION_ID=$(echo "$HOOK_INPUT" | jq -r '.session_id // "default"')
+TAIL_STATUS=0
+if command -v python3 >/dev/null 2>&1 && [[ -f "$TRANSCRIPT_TAIL" ]]; then
+  LAST_LINE=$(python3 "$TRANSCRIPT_TAIL" last-assistant "$TRANSCRIPT_PATH" \
+    --session "$SESSION_ID" --name ralph-wiggum) || TAIL_STATUS=$?
+else
+  LAST_LINE=$(grep '"role":"assistant"' "$TRANSCRIPT_PATH" | tail -1) || TAIL_STATUS=$?
+fi
+
 # First check if there are any assistant messages
-if ! grep -q '"role":"assistant"' "$TRANSCRIPT_PATH"; then
+if [[ $TAIL_STATUS -eq 1 ]]; then
   echo "⚠️  Ralph loop: No assistant messages found in transcript" >&2
   echo "   Transcript: $TRANSCRIPT_PATH" >&2
   echo "   This is unusual and may indicate a transcript format issue" >&2
@@ -78,8 +91,7 @@ if ! grep -q '"role":"assistant"' "$TRANSCRIPT_PATH"; then
 fi
 
 # Extract last assistant message with explicit error handling
-LAST_LINE=$(grep '"role":"assistant"' "$TRANSCRIPT_PATH" | tail -1)
-if [[ -z "$LAST_LINE" ]]; then
+if [[ $TAIL_STATUS -ne 0 ]] || [[ -z "$LAST_LINE" ]]; then
   echo "⚠️  Ralph loop: Failed to extract last assistant message" >&2
   echo "   Ralph loop is stopping." >&2
   rm "$RALPH_STATE_FILE"
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""Incremental reading of session transcripts.
+
+Transcripts are append-only JSONL files and Stop hooks run after every turn,
+so rescanning the whole file each time adds up to O(n^2) I/O over a long
+session. TranscriptTail remembers, per session, the byte offset up to which
+a transcript has been processed (plus whatever the caller derived from it),
+so the next run only reads what was appended. The saved offset is only
+trusted while the file is the same one and the bytes before it are
+unchanged; otherwise callers start over from offset 0.
+
+Offsets of all sessions are kept in one SQLite database,
+~/.claude/transcript_tail.db, shared by all hook processes. A save also
+expires the offsets of sessions not seen for STATE_MAX_AGE: one range
+delete on an index, instead of a file per session and a scan of
+~/.claude to find the old ones.
+
+This module only uses the standard library, and plugins are installed
+independently, so it is copied verbatim into plugins/hookify/core and
+plugins/ralph-wiggum/scripts; keep the two files identical
+(tests/test_transcript_tail.py fails when they differ).
+
+Usage:
+    python3 transcript_tail.py last-assistant TRANSCRIPT [--session ID]
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+STATE_DB = os.path.join('~', '.claude', 'transcript_tail.db')
+
+# Bytes before the saved offset that must be unchanged to resume from it
+FINGERPRINT_SIZE = 4096
+
+# Read size when seeking backwards from the end of a transcript
+REVERSE_BLOCK_SIZE = 64 * 1024
+
+# Forget the offsets of sessions not seen for this long
+STATE_MAX_AGE = 30 * 24 * 60 * 60
+
+# Seconds to wait for another hook process holding the write lock
+STATE_BUSY_TIMEOUT = 5.0
+
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcript_offsets (
+    name TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    inode INTEGER NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (name, session_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transcript_offsets_saved_at ON transcript_offsets (saved_at);
+"""
+
+ASSISTANT_MARKER = b'"role":"assistant"'
+
+
+def open_state_db(path: str = STATE_DB, create: bool = True):
+    """Open the offsets database, creating it if needed.
+
+    Returns:
+        A sqlite3 connection in autocommit mode, or None if create is False
+        and the database does not exist yet
+    """
+    # Imported here: only Stop hooks that resume a transcript need it
+    import sqlite3
+
+    path = os.path.expanduser(path)
+    created = not os.path.exists(path)
+    if created and not create:
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path, timeout=STATE_BUSY_TIMEOUT, isolation_level=None)
+    try:
+        if created:
+            # Readers do not block the writer and vice versa
+            db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(STATE_SCHEMA)
+    except sqlite3.Error:
+        db.close()
+        raise
+    return db
+
+
+class TranscriptTail:
+    """Remembers how far one consumer has processed a session transcript."""
+
+    def __init__(self, path: str, session_id: str, name: str, state_db: str = STATE_DB):
+        """
+        Args:
+            path: Transcript file
+            session_id: Session the transcript belongs to
+            name: Consumer name, so several hooks can track the same session
+            state_db: Offsets database
+        """
+        self.path = path
+        self.session_id = session_id
+        self.name = name
+        self.state_db = state_db
+
+    def resume(self) -> Tuple[int, Dict[str, Any]]:
+        """Return the saved offset and data if they still apply.
+
+        Returns:
+            (offset, data) from the last save(), or (0, {}) if there is no
+            state or the transcript was replaced, truncated or rewritten
+        """
+        import sqlite3
+
+        try:
+            db = open_state_db(self.state_db, create=False)
+            if db is None:
+                return 0, {}
+            try:
+                row = db.execute(
+                    "SELECT path, inode, byte_offset, fingerprint, data FROM transcript_offsets"
+                    " WHERE name = ? AND session_id = ?", (self.name, self.session_id)
+                ).fetchone()
+            finally:
+                db.close()
+            if row is None:
+                return 0, {}
+            path, inode, offset, fingerprint, data = row
+            stat = os.stat(self.path)
+            if (path != os.path.realpath(self.path) or inode != stat.st_ino
+                    or not isinstance(offset, int) or not 0 < offset <= stat.st_size
+                    or self._fingerprint(offset) != fingerprint):
+                return 0, {}
+            data = json.loads(data)
+        except (sqlite3.Error, OSError, ValueError):
+            return 0, {}
+        return offset, data if isinstance(data, dict) else {}
+
+    def save(self, offset: int, data: Dict[str, Any]) -> None:
+        """Save the processed offset and derived data (best effort).
+
+        Also expires the offsets of all sessions not saved for STATE_MAX_AGE.
+        """
+        import sqlite3
+
+        now = time.time()
+        try:
+            row = (self.name, self.session_id, os.path.realpath(self.path), os.stat(self.path).st_ino,
+                   offset, self._fingerprint(offset), json.dumps(data), now)
+            db = open_state_db(self.state_db)
+            try:
+                db.execute("BEGIN IMMEDIATE")
+                db.execute("DELETE FROM transcript_offsets WHERE saved_at < ?", (now - STATE_MAX_AGE,))
+                db.execute("INSERT OR REPLACE INTO transcript_offsets VALUES (?, ?, ?, ?, ?, ?, ?, ?)", row)
+                db.execute("COMMIT")
+            finally:
+                db.close()
+        except (sqlite3.Error, OSError, TypeError, ValueError):
+            return  # Fail silently, the next run just starts over
+
+    def last_line_containing(self, needle: bytes = ASSISTANT_MARKER) -> Optional[bytes]:
+        """Find the last line containing needle, like `grep needle | tail -1`.
+
+        Seeks backwards from the end of the file through the lines appended
+        since the previous call only; if none of them matches, the line
+        remembered by the previous call is returned.
+
+        Returns:
+            The line without its line break, or None if no line matches
+
+        Raises:
+            OSError: If the transcript cannot be read
+        """
+        stop, data = self.resume()
+        if data.get('needle') != needle.hex():
+            stop = 0  # Nothing known about this needle yet
+        remembered = data.get('line_start') if stop else None
+
+        with open(self.path, 'rb') as f:
+            end = f.seek(0, os.SEEK_END)
+            found = None
+            for start, line in reverse_lines(f, end, stop):
+                if needle in line:
+                    found = (start, line)
+                    break
+
+            if found is None and remembered is not None:
+                f.seek(remembered)
+                found = (remembered, f.readline())
+
+        self.save(end, {'needle': needle.hex(), 'line_start': found[0] if found else None})
+        return found[1].rstrip(b'\r\n') if found else None
+
+    def _fingerprint(self, offset: int) -> str:
+        start = max(offset - FINGERPRINT_SIZE, 0)
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            return hashlib.sha1(f.read(offset - start)).hexdigest()
+
+
+def reverse_lines(f, end: int, stop: int = 0,
+                  block_size: int = REVERSE_BLOCK_SIZE) -> Iterator[Tuple[int, bytes]]:
+    """Yield (start offset, line) from the end of a binary file backwards.
+
+    Lines include their line break. Iteration ends before the first line
+    that ends at or before stop, so only lines (partly) after stop are read.
+    """
+    parts: List[bytes] = []  # Pieces of the current line, last piece first
+    line_end = end
+    pos = end
+    while pos > 0 and line_end > stop:
+        size = min(block_size, pos)
+        pos -= size
+        f.seek(pos)
+        block = f.read(size)
+        right = len(block)
+        while True:
+            # The line break ending the current line is not a line boundary
+            nl = block.rfind(b'\n', 0, max(min(right, line_end - 1 - pos), 0))
+            if nl == -1:
+                parts.append(block[:right])
+                break
+            parts.append(block[nl + 1:right])
+            start = pos + nl + 1
+            yield start, b''.join(reversed(parts))
+            parts = []
+            line_end = start
+            right = nl + 1
+            if line_end <= stop:
+                return
+
+    if pos == 0 and line_end > stop and line_end > 0:
+        yield 0, b''.join(reversed(parts))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incremental session transcript reader")
+    parser.add_argument('command', choices=['last-assistant'])
+    parser.add_argument('transcript', help="Transcript JSONL file")
+    parser.add_argument('--session', default='default', help="Session ID (default: default)")
+    parser.add_argument('--name', default='cli', help="Consumer name for the saved offset")
+    args = parser.parse_args(argv)
+
+    try:
+        line = TranscriptTail(args.transcript, args.session, args.name).last_line_containing()
+    except OSError as e:
+        print(f"Error reading transcript {args.transcript}: {e}", file=sys.stderr)
+        return 2
+    if line is None:
+        return 1
+    sys.stdout.buffer.write(line + b'\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
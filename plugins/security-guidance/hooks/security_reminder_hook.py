@@ -6,8 +6,9 @@ This hook checks for security patterns in file edits and warns about potential v
 
 import json
 import os
-import random
+import re
 import sys
+import time
 from datetime import datetime
 
 # Debug log file
@@ -25,8 +26,6 @@ def debug_log(message):
         pass
 
 
-# State file to track warnings shown (session-scoped using session ID)
-
 # Security patterns configuration
 SECURITY_PATTERNS = [
     {
@@ -126,114 +125,249 @@ Only use exec() if you absolutely need shell features and the input is guarantee
 ]
 
 
-def get_state_file(session_id):
-    """Get session-specific state file path."""
-    return os.path.expanduser(f"~/.claude/security_warnings_state_{session_id}.json")
-
+# Warnings already shown, per session, in one SQLite database shared by all
+# hook processes (sessions are keyed by ID instead of a file per session)
+STATE_DB = os.path.expanduser("~/.claude/security_warnings_state.db")
+# Per-session JSON files of earlier versions, imported once
+LEGACY_STATE_PREFIX = "security_warnings_state_"
 
-def cleanup_old_state_files():
-    """Remove state files older than 30 days."""
-    try:
-        state_dir = os.path.expanduser("~/.claude")
-        if not os.path.exists(state_dir):
-            return
+# Forget warnings shown longer ago than this
+STATE_MAX_AGE = 30 * 24 * 60 * 60
 
-        current_time = datetime.now().timestamp()
-        thirty_days_ago = current_time - (30 * 24 * 60 * 60)
-
-        for filename in os.listdir(state_dir):
-            if filename.startswith("security_warnings_state_") and filename.endswith(
-                ".json"
-            ):
-                file_path = os.path.join(state_dir, filename)
-                try:
-                    file_mtime = os.path.getmtime(file_path)
-                    if file_mtime < thirty_days_ago:
-                        os.remove(file_path)
-                except (OSError, IOError):
-                    pass  # Ignore errors for individual file cleanup
-    except Exception:
-        pass  # Silently ignore cleanup errors
-
-
-def load_state(session_id):
-    """Load the state of shown warnings from file."""
-    state_file = get_state_file(session_id)
-    if os.path.exists(state_file):
-        try:
-            with open(state_file, "r") as f:
-                return set(json.load(f))
-        except (json.JSONDecodeError, IOError):
-            return set()
-    return set()
+# Seconds to wait for another hook process holding the write lock
+STATE_BUSY_TIMEOUT = 5.0
 
+STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shown_warnings (
+    session_id TEXT NOT NULL,
+    warning_key TEXT NOT NULL,
+    shown_at REAL NOT NULL,
+    PRIMARY KEY (session_id, warning_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS shown_warnings_shown_at ON shown_warnings (shown_at);
+"""
 
-def save_state(session_id, shown_warnings):
-    """Save the state of shown warnings to file."""
-    state_file = get_state_file(session_id)
-    try:
-        os.makedirs(os.path.dirname(state_file), exist_ok=True)
-        with open(state_file, "w") as f:
-            json.dump(list(shown_warnings), f)
-    except IOError as e:
-        debug_log(f"Failed to save state file: {e}")
-        pass  # Fail silently if we can't save state
 
+def open_state_db(path=STATE_DB):
+    """Open the state database, creating it (and importing legacy state files) if needed."""
+    # Only needed when a pattern matched, which most tool calls do not
+    import sqlite3
 
-def check_patterns(file_path, content):
-    """Check if file path or content matches any security patterns."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    created = not os.path.exists(path)
+    db = sqlite3.connect(path, timeout=STATE_BUSY_TIMEOUT, isolation_level=None)
+    try:
+        if created:
+            # Readers do not block the writer and vice versa
+            db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(STATE_SCHEMA)
+        if created:
+            import_legacy_state_files(db, os.path.dirname(path))
+    except sqlite3.Error:
+        db.close()
+        raise
+    return db
+
+
+def import_legacy_state_files(db, state_dir):
+    """Move the per-session JSON state files of earlier versions into the database."""
+    cutoff = time.time() - STATE_MAX_AGE
+    try:
+        filenames = os.listdir(state_dir)
+    except OSError:
+        return
+    for filename in filenames:
+        if not (filename.startswith(LEGACY_STATE_PREFIX) and filename.endswith(".json")):
+            continue
+        file_path = os.path.join(state_dir, filename)
+        session_id = filename[len(LEGACY_STATE_PREFIX):-len(".json")]
+        try:
+            shown_at = os.path.getmtime(file_path)
+            if shown_at >= cutoff:
+                with open(file_path, "r") as f:
+                    warning_keys = [key for key in json.load(f) if isinstance(key, str)]
+                db.executemany(
+                    "INSERT OR IGNORE INTO shown_warnings VALUES (?, ?, ?)",
+                    [(session_id, key, shown_at) for key in warning_keys],
+                )
+            os.remove(file_path)
+        except (OSError, ValueError, TypeError):
+            pass  # Ignore errors for individual files
+
+
+def claim_warnings(session_id, warning_keys, path=STATE_DB):
+    """Record warnings as shown in a session.
+
+    Returns the keys that were not shown before. Each key is claimed by one
+    hook process only, even if several check the same session at once. If
+    the state cannot be read or written, all keys are returned.
+    """
+    import sqlite3
+
+    now = time.time()
+    try:
+        db = open_state_db(path)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            # Expire old warnings of all sessions: one range delete on the index
+            db.execute("DELETE FROM shown_warnings WHERE shown_at < ?", (now - STATE_MAX_AGE,))
+            claimed = []
+            for key in warning_keys:
+                cursor = db.execute(
+                    "INSERT OR IGNORE INTO shown_warnings VALUES (?, ?, ?)", (session_id, key, now)
+                )
+                if cursor.rowcount:
+                    claimed.append(key)
+            db.execute("COMMIT")
+            return claimed
+        finally:
+            db.close()
+    except (sqlite3.Error, OSError) as e:
+        debug_log(f"Failed to update state database: {e}")
+        return list(warning_keys)
+
+
+# Copy of _trie_pattern in plugins/hookify/core/prefilter.py, which explains
+# it (plugins cannot import each other); tests/test_trie_pattern.py runs both
+def _trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node):
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class SubstringMatcher:
+    """Finds every occurrence of many substrings in one scan of a text."""
+
+    def __init__(self, substrings):
+        words = sorted({substring for substring in substrings if substring})
+        self._regex = re.compile(_trie_pattern(words)) if words else None
+        # The regex reports the longest word at a position; the words that
+        # are prefixes of it occur there too
+        self._prefixes = {
+            word: [other for other in words if other != word and word.startswith(other)]
+            for word in words
+        }
+
+    def finditer(self, text):
+        """Yield (offset, substring) for every occurrence, overlapping ones included."""
+        if self._regex is None or not text:
+            return
+        search = self._regex.search
+        match = search(text)
+        while match:
+            start = match.start()
+            for prefix in self._prefixes[match.group()]:
+                yield start, prefix
+            yield start, match.group()
+            # Resume inside the match: another word may start there
+            match = search(text, start + 1)
+
+
+# Rule names for each substring in SECURITY_PATTERNS, all scanned for at once
+RULES_BY_SUBSTRING = {}
+for _pattern in SECURITY_PATTERNS:
+    for _substring in _pattern.get("substrings", ()):
+        RULES_BY_SUBSTRING.setdefault(_substring, []).append(_pattern["ruleName"])
+CONTENT_MATCHER = SubstringMatcher(RULES_BY_SUBSTRING)
+
+
+def find_pattern_matches(file_path, segments):
+    """Find every security pattern the file path or content matches.
+
+    segments are the (edit_index, text) pieces of the new content, see
+    extract_content_segments. Each is scanned once for the substrings of all
+    patterns; no match spans two edits. Returns (rule_name, reminder,
+    matches) tuples in SECURITY_PATTERNS order, where matches lists the
+    (edit_index, offset, substring) occurrences in segment and offset order
+    (empty for path-based patterns).
+    """
     # Normalize path by removing leading slashes
     normalized_path = file_path.lstrip("/")
 
+    matches_by_rule = {}
+    for edit_index, text in segments:
+        for offset, substring in CONTENT_MATCHER.finditer(text):
+            for rule_name in RULES_BY_SUBSTRING[substring]:
+                matches_by_rule.setdefault(rule_name, []).append((edit_index, offset, substring))
+
+    found = []
     for pattern in SECURITY_PATTERNS:
-        # Check path-based patterns
-        if "path_check" in pattern and pattern["path_check"](normalized_path):
-            return pattern["ruleName"], pattern["reminder"]
+        matches = matches_by_rule.get(pattern["ruleName"], [])
+        if matches or ("path_check" in pattern and pattern["path_check"](normalized_path)):
+            found.append((pattern["ruleName"], pattern["reminder"], matches))
+    return found
 
-        # Check content-based patterns
-        if "substrings" in pattern and content:
-            for substring in pattern["substrings"]:
-                if substring in content:
-                    return pattern["ruleName"], pattern["reminder"]
 
+def check_patterns(file_path, content):
+    """Check if file path or content matches any security patterns.
+
+    Returns the (rule_name, reminder) of the first matching pattern, or
+    (None, None).
+    """
+    for rule_name, reminder, _ in find_pattern_matches(file_path, [(None, content)]):
+        return rule_name, reminder
     return None, None
 
 
-def extract_content_from_input(tool_name, tool_input):
-    """Extract content to check from tool input based on tool type."""
+# Occurrences listed per rule in a reminder
+MAX_REPORTED_MATCHES = 5
+
+
+def describe_matches(segments, matches):
+    """Describe where a rule matched, e.g. "`eval(` at line 3 of edit 2"."""
+    texts = dict(segments)
+    described = []
+    for edit_index, offset, substring in matches[:MAX_REPORTED_MATCHES]:
+        line = texts[edit_index].count("\n", 0, offset) + 1
+        if edit_index is None:
+            described.append(f"`{substring}` at line {line}")
+        else:
+            described.append(f"`{substring}` at line {line} of edit {edit_index + 1}")
+    if len(matches) > MAX_REPORTED_MATCHES:
+        described.append(f"{len(matches) - MAX_REPORTED_MATCHES} more")
+    return ", ".join(described)
+
+
+def extract_content_segments(tool_name, tool_input):
+    """Yield the new content of a tool input as (edit_index, text) segments.
+
+    Write and Edit have a single segment with edit_index None. MultiEdit
+    yields the new_string of each edit with its index, so edits are scanned
+    one by one without joining them into one string.
+    """
     if tool_name == "Write":
-        return tool_input.get("content", "")
+        yield None, tool_input.get("content", "")
     elif tool_name == "Edit":
-        return tool_input.get("new_string", "")
+        yield None, tool_input.get("new_string", "")
     elif tool_name == "MultiEdit":
-        edits = tool_input.get("edits", [])
-        if edits:
-            return " ".join(edit.get("new_string", "") for edit in edits)
-        return ""
+        for edit_index, edit in enumerate(tool_input.get("edits", [])):
+            yield edit_index, edit.get("new_string", "")
 
-    return ""
 
+def run_hook(input_data):
+    """Check one PreToolUse hook input.
 
-def main():
-    """Main hook function."""
+    Prints the reminders of all matching patterns not yet shown for the file
+    in this session to stderr and returns 2 (block), otherwise returns 0.
+    """
     # Check if security reminders are enabled
     security_reminder_enabled = os.environ.get("ENABLE_SECURITY_REMINDER", "1")
 
     # Only run if security reminders are enabled
     if security_reminder_enabled == "0":
-        sys.exit(0)
-
-    # Periodically clean up old state files (10% chance per run)
-    if random.random() < 0.1:
-        cleanup_old_state_files()
-
-    # Read input from stdin
-    try:
-        raw_input = sys.stdin.read()
-        input_data = json.loads(raw_input)
-    except json.JSONDecodeError as e:
-        debug_log(f"JSON decode error: {e}")
-        sys.exit(0)  # Allow tool to proceed if we can't parse input
+        return 0
 
     # Extract session ID and tool information from the hook input
     session_id = input_data.get("session_id", "default")
@@ -242,38 +376,56 @@ def main():
 
     # Check if this is a relevant tool
     if tool_name not in ["Edit", "Write", "MultiEdit"]:
-        sys.exit(0)  # Allow non-file tools to proceed
+        return 0  # Allow non-file tools to proceed
 
     # Extract file path from tool_input
     file_path = tool_input.get("file_path", "")
     if not file_path:
-        sys.exit(0)  # Allow if no file path
+        return 0  # Allow if no file path
 
-    # Extract content to check
-    content = extract_content_from_input(tool_name, tool_input)
+    # Extract content to check, edit by edit
+    segments = list(extract_content_segments(tool_name, tool_input))
 
     # Check for security patterns
-    rule_name, reminder = check_patterns(file_path, content)
+    findings = find_pattern_matches(file_path, segments)
+
+    if findings:
+        # Report every rule not yet shown for this file in this session
+        warning_keys = [f"{file_path}-{rule_name}" for rule_name, _, _ in findings]
+        new_keys = set(claim_warnings(session_id, warning_keys))
+
+        reminders = []
+        for warning_key, (rule_name, reminder, matches) in zip(warning_keys, findings):
+            if warning_key not in new_keys:
+                continue
+            if matches:
+                reminder = f"{reminder}\n\nFound in the new content: {describe_matches(segments, matches)}"
+            reminders.append(reminder)
+
+        if reminders:
+            # Output the warnings to stderr and block execution
+            print("\n\n".join(reminders), file=sys.stderr)
+            return 2  # Block tool execution (exit code 2 for PreToolUse hooks)
 
-    if rule_name and reminder:
-        # Create unique warning key
-        warning_key = f"{file_path}-{rule_name}"
+    # Allow tool to proceed
+    return 0
 
-        # Load existing warnings for this session
-        shown_warnings = load_state(session_id)
 
-        # Check if we've already shown this warning in this session
-        if warning_key not in shown_warnings:
-            # Add to shown warnings and save
-            shown_warnings.add(warning_key)
-            save_state(session_id, shown_warnings)
+def main():
+    """Main hook function."""
+    # Only run if security reminders are enabled
+    if os.environ.get("ENABLE_SECURITY_REMINDER", "1") == "0":
+        sys.exit(0)
 
-            # Output the warning to stderr and block execution
-            print(reminder, file=sys.stderr)
-            sys.exit(2)  # Block tool execution (exit code 2 for PreToolUse hooks)
+    # Read input from stdin
+    try:
+        raw_input = sys.stdin.read()
+        input_data = json.loads(raw_input)
+    except json.JSONDecodeError as e:
+        debug_log(f"JSON decode error: {e}")
+        sys.exit(0)  # Allow tool to proceed if we can't parse input
 
-    # Allow tool to proceed
-    sys.exit(0)
+    sys.exit(run_hook(input_data))
 
 
 if __name__ == "__main__":
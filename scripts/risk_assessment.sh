@@ -34,15 +34,19 @@ else
     FAILURES=$((FAILURES + 1))
 fi
 
-# 3. Check Audit Log
-AUDIT_LOG=~/.claude/governance_audit.log
-if [ -f "$AUDIT_LOG" ]; then
-    echo "[PASS] Audit Log found at: $AUDIT_LOG"
-    # Check last modification
-    LAST_MOD=$(date -r "$AUDIT_LOG" "+%Y-%m-%d %H:%M:%S")
-    echo "       Last activity: $LAST_MOD"
+# 3. Check Audit Store
+AUDIT_STORE=${GOVERNANCE_AUDIT_DIR:-~/.claude/governance_audit}
+AUDIT_STORE_TOOL="$PLUGIN_PATH/hooks/audit_store.py"
+if [ -d "$AUDIT_STORE" ] && [ -f "$AUDIT_STORE_TOOL" ]; then
+    echo "[PASS] Audit Store found at: $AUDIT_STORE"
+    python3 "$AUDIT_STORE_TOOL" status --store "$AUDIT_STORE" | sed 's/^/       /'
 else
-    echo "[WARN] Audit Log not found at: $AUDIT_LOG. It will be created on first run."
+    echo "[WARN] Audit Store not found at: $AUDIT_STORE. It will be created on first run."
+fi
+LEGACY_AUDIT_LOG=~/.claude/governance_audit.log
+if [ -f "$LEGACY_AUDIT_LOG" ] && grep -q ' - INFO - {' "$LEGACY_AUDIT_LOG"; then
+    echo "[INFO] Legacy audit events found in $LEGACY_AUDIT_LOG."
+    echo "       Import them with: python3 $AUDIT_STORE_TOOL import-legacy"
 fi
 
 # 4. Check Python Hook Dependencies
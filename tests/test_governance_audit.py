@@ -0,0 +1,36 @@
+"""Tests for the raw-line prefilter of the governance-audit query command."""
+
+import importlib.machinery
+import importlib.util
+import json
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_PATH = os.path.join(REPO_ROOT, 'scripts', 'governance-audit')
+
+loader = importlib.machinery.SourceFileLoader('governance_audit', SCRIPT_PATH)
+spec = importlib.util.spec_from_loader('governance_audit', loader)
+governance_audit = importlib.util.module_from_spec(spec)
+loader.exec_module(governance_audit)
+
+SESSION_IDS = ['abc', 42, 4.5, -1, True, False, None, float('nan'), float('inf'), [1, 2], {'a': 1},
+               '42', 'true', 'a"b', 'Ü', 1e16]
+
+EVENTS = [{'timestamp': f'2025-07-01T00:00:{i:02d}', 'event_type': 'TOOL_USE', 'risk_level': 'LOW',
+           'decision': 'ALLOWED', 'details': {'session_id': session_id}}
+          for i, session_id in enumerate(SESSION_IDS)]
+LINES = [(json.dumps(event) + '\n').encode('utf-8') for event in EVENTS]
+
+
+@pytest.mark.parametrize('accepted', [str(session_id) for session_id in SESSION_IDS] + ['1e5', '042', 'missing'])
+def test_prefilter_keeps_every_event_that_matches(accepted):
+    query = governance_audit.Query(values={'session_id': [accepted]})
+    expected = [event for event in (json.loads(line) for line in LINES) if query.matches(event)]
+    assert [json.dumps(e) for e in query.matching_events(LINES)] == [json.dumps(e) for e in expected]
+
+
+def test_numeric_session_is_found():
+    query = governance_audit.Query(values={'session_id': ['42'], 'decision': ['ALLOWED']})
+    assert [event['details']['session_id'] for event in query.matching_events(LINES)] == [42, '42']
@@ -0,0 +1,91 @@
+"""Tests for the governance command policy and its use in PreToolUse."""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOOKS_DIR = os.path.join(REPO_ROOT, 'plugins', 'governance-layer', 'hooks')
+sys.path.insert(0, HOOKS_DIR)
+
+import command_policy  # noqa: E402
+import governance_hook  # noqa: E402
+
+
+@pytest.fixture
+def policy(tmp_path):
+    path = tmp_path / 'policy.json'
+
+    def write(value):
+        path.write_text(json.dumps(value))
+        return str(path), str(tmp_path / 'index')
+    return write
+
+
+def run_hook(tmp_path, command, **env):
+    payload = {'session_id': 'test', 'tool_name': 'Bash', 'tool_input': {'command': command}}
+    env = dict(os.environ, HOME=str(tmp_path), GOVERNANCE_AUDIT_DIR=str(tmp_path / 'audit'),
+               GOVERNANCE_COMMAND_POLICY=str(tmp_path / 'missing.json'), **env)
+    result = subprocess.run([sys.executable, os.path.join(HOOKS_DIR, 'governance_hook.py'), '--event', 'PreToolUse'],
+                            input=json.dumps(payload), capture_output=True, text=True, env=env)
+    events = []
+    for name in os.listdir(tmp_path / 'audit'):
+        with open(tmp_path / 'audit' / name) as f:
+            events.extend(json.loads(line) for line in f)
+    return result, events
+
+
+def test_rules_by_executable(policy):
+    path, index = policy({'rules': [
+        {'executable': 'terraform', 'action': 'deny', 'args': ['destroy']},
+        {'executable': 'git', 'action': 'review', 'args': ['push'], 'flags': [['-f', '--force']]},
+    ]})
+    assert command_policy.evaluate_command('terraform plan', path, index).action == 'allow'
+    assert command_policy.evaluate_command('sudo terraform destroy', path, index).action == 'deny'
+    assert command_policy.evaluate_command('git status && git push -f', path, index).action == 'review'
+    assert command_policy.evaluate_command('rm -fr /', path, index).action == 'deny'
+
+
+def test_invalid_policy_needs_review(policy):
+    path, index = policy({'default': 'bogus'})
+    decision = command_policy.evaluate_command('ls', path, index)
+    assert decision.action == 'review'
+    assert decision.error
+
+
+def test_tokenizer_error_denies(monkeypatch, policy):
+    def broken(command):
+        raise RuntimeError('tokenizer bug')
+    monkeypatch.setattr(command_policy, 'parse_command', broken)
+    decision = command_policy.evaluate_command('ls', *policy({}))
+    assert decision.action == 'deny'
+    assert 'tokenizer bug' in decision.error
+
+
+def test_unavailable_policy_denies(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'command_policy', None)  # Import fails
+    monkeypatch.setattr(governance_hook, 'get_logger', lambda: type('Logger', (), {'error': print}))
+    decision = governance_hook.check_command_policy('Bash', {'command': 'ls'})
+    assert decision.action == 'deny'
+
+
+def test_hook_blocks_and_audits(tmp_path):
+    result, events = run_hook(tmp_path, "rm -rf / ; echo $'\\UFFFFFFFF'")
+    assert result.returncode == 2
+    assert 'Governance Block' in result.stderr
+    assert [event['decision'] for event in events] == ['BLOCKED']
+
+
+@pytest.mark.parametrize('command', [
+    'ssh host rm -rf /',
+    'watch rm -rf /',
+    'find . -exec rm -rf / \\;',
+    'python3 -c \'import os; os.system("rm -rf /")\'',
+])
+def test_builtin_deny_reaches_nested_commands(tmp_path, command):
+    result, events = run_hook(tmp_path, command)
+    assert result.returncode == 2
+    assert [event['decision'] for event in events] == ['BLOCKED']
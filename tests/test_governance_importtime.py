@@ -0,0 +1,14 @@
+"""The per-event import budget of the governance hook (see benchmarks/check_governance_importtime.py)."""
+
+import importlib.util
+import os
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CHECK = os.path.join(REPO_ROOT, 'benchmarks', 'check_governance_importtime.py')
+
+
+def test_governance_hook_import_budget():
+    spec = importlib.util.spec_from_file_location('check_governance_importtime', CHECK)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    assert module.check() == []  # Best of 5 runs: single runs on a loaded machine are noisy
@@ -0,0 +1,88 @@
+"""Tests for running the plugins' handlers in the hook dispatcher."""
+
+import importlib.util
+import os
+import signal
+import sys
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DISPATCHER_PATH = os.path.join(REPO_ROOT, 'plugins', 'hook-dispatcher', 'hooks', 'dispatcher.py')
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins', 'governance-layer', 'hooks'))
+
+import governance_hook  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not hasattr(signal, 'setitimer'), reason='needs signal.setitimer')
+
+
+@pytest.fixture
+def dispatcher(monkeypatch):
+    monkeypatch.setenv('HOOK_DISPATCHER_PLUGINS_DIR', os.path.join(REPO_ROOT, 'plugins'))
+    spec = importlib.util.spec_from_file_location('dispatcher', DISPATCHER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class SlowTTY:
+    """A /dev/tty whose user takes `delay` seconds to answer."""
+
+    def __init__(self, answer, delay):
+        self.answer, self.delay = answer, delay
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def write(self, text):
+        pass
+
+    def flush(self):
+        pass
+
+    def readline(self):
+        time.sleep(self.delay)
+        return self.answer
+
+
+@pytest.fixture
+def tty(monkeypatch):
+    audit = []
+    monkeypatch.setattr(governance_hook, 'log_audit', lambda event_type, details, **kwargs: audit.append(event_type))
+    exists = os.path.exists
+    monkeypatch.setattr(os.path, 'exists', lambda path: path == '/dev/tty' or exists(path))
+
+    def answer(text, delay):
+        monkeypatch.setattr(governance_hook, 'open', lambda path, mode: SlowTTY(text, delay), raising=False)
+        return audit
+    return answer
+
+
+@pytest.mark.parametrize('text, exit_code', [('y\n', 0), ('n\n', 1)])
+def test_approval_prompt_is_not_cut_short_by_the_handler_timeout(dispatcher, tty, monkeypatch, text, exit_code):
+    monkeypatch.setenv('HOOK_DISPATCHER_TIMEOUT', '0.1')
+    audit = tty(text, 0.3)
+    handler = next(h for h in dispatcher.HANDLERS if h.name == 'governance-layer')
+    data = {'session_id': 's', 'prompt': 'Draft the HR decision for this case'}
+    result = dispatcher.run_handler(handler, 'UserPromptSubmit', data, '{}')
+    assert result.error is None
+    assert result.exit_code == exit_code
+    assert audit.count('HITL_APPROVAL') == 1
+
+
+def test_paused_timer_resumes_with_its_remaining_time():
+    previous = signal.signal(signal.SIGALRM, lambda signum, frame: None)
+    try:
+        signal.setitimer(signal.ITIMER_REAL, 5)
+        remaining, interval = governance_hook.pause_alarm()
+        assert 0 < remaining <= 5 and signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        time.sleep(0.05)
+        governance_hook.resume_alarm(remaining, interval)
+        assert 0 < signal.getitimer(signal.ITIMER_REAL)[0] <= remaining
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
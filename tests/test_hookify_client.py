@@ -0,0 +1,27 @@
+"""Tests for the hook-side client of the hookify rule daemon."""
+
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLUGINS_DIR = os.path.join(REPO_ROOT, 'plugins')
+
+
+def test_fallback_path_skips_daemon_imports(tmp_path):
+    # Without a daemon, a hook call must not import what only the daemon path uses
+    code = (
+        "import json, sys\n"
+        f"sys.path.insert(0, {PLUGINS_DIR!r})\n"
+        "from hookify.core.client import evaluate\n"
+        "evaluate('bash', {'session_id': 's', 'tool_name': 'Bash', 'tool_input': {'command': 'ls'}})\n"
+        "print(json.dumps(sorted(sys.modules)))\n"
+    )
+    env = dict(os.environ, HOME=str(tmp_path), XDG_RUNTIME_DIR=str(tmp_path))
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                            env=env, cwd=str(tmp_path), check=True)
+    modules = set(json.loads(result.stdout))
+    assert 'hookify.core.rule_engine' in modules
+    assert not modules & {'socket', 'tempfile', 'shutil', 'random', 'threading', 'signal',
+                          'hookify.core.transcript', 'hookify.core.transcript_tail'}
@@ -0,0 +1,51 @@
+"""Tests for the single-pass literal prefilter of hookify conditions."""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins'))
+
+from hookify.core.prefilter import REBUILD_AFTER_STALE_HITS, LiteralScanner  # noqa: E402
+
+KEYS = [
+    ('rm', True), ('rm -rf', True), ('RM', True), ('sudo', False), ('Sudo su', False),
+    ('push', False), ('--force', True), ('force', False), ('ö', False), ('', True),
+]
+
+
+def plain_scan(keys, text):
+    """Keys whose literal occurs in text: case sensitive or not, like LiteralScanner."""
+    found = set()
+    for literal, case_sensitive in keys:
+        if not literal:
+            continue
+        if case_sensitive:
+            present = literal in text
+        else:
+            present = not text.isascii() or literal.lower() in text.lower()
+        if present:
+            found.add((literal, case_sensitive))
+    return found
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    'rm -rf /',
+    'RM -RF /',
+    'SUDO su - root',
+    'git push --force-with-lease',
+    'git PUSH -f origin',
+    'echo ö && sudo rm x',
+    'rmrmrm' * (REBUILD_AFTER_STALE_HITS * 2) + ' then push --force',
+])
+def test_scan_matches_plain_substring_search(text):
+    assert LiteralScanner(KEYS).scan(text) == plain_scan(KEYS, text)
+
+
+def test_scanner_is_reused_across_texts():
+    scanner = LiteralScanner(KEYS)
+    for text in ['rm -rf /', 'nothing here', 'Sudo SU', 'rm -rf /']:
+        assert scanner.scan(text) == plain_scan(KEYS, text)
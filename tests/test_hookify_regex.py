@@ -0,0 +1,55 @@
+"""Tests for hookify's backtracking analysis and regex time budgets."""
+
+import os
+import sys
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins'))
+
+from hookify.core.regex_analysis import backtracking_risks  # noqa: E402
+from hookify.core.regex_budget import BudgetedPattern  # noqa: E402
+from hookify.core.rule_engine import RuleEngine, compile_budgeted  # noqa: E402
+
+
+@pytest.mark.parametrize('pattern', [
+    r'(a+)+$',
+    r'(\w+\s?)+$',
+    r'(ab|abc|b)*x',
+    r'(a|a)*b',
+    r'(ab|a.)*x',
+    r'x(?:(a|a){2})*y',
+])
+def test_risky_patterns_are_flagged(pattern):
+    assert backtracking_risks(pattern)
+
+
+@pytest.mark.parametrize('pattern', [
+    r'rm\s+-rf',
+    r'(a+b)+',
+    r'(\d{1,3}\.)+',
+    r'(a|b)*c',
+    r'(foo|bar)+',
+    r'(a++)+$',
+])
+def test_safe_patterns_are_not_flagged(pattern):
+    assert backtracking_risks(pattern) == ()
+
+
+@pytest.fixture
+def budget_ms(monkeypatch):
+    monkeypatch.setenv('HOOKIFY_REGEX_BUDGET_MS', '100')
+    compile_budgeted.cache_clear()
+    yield
+    compile_budgeted.cache_clear()
+
+
+def test_overlapping_alternatives_are_budgeted(budget_ms):
+    assert isinstance(compile_budgeted(r'(a|a)*b'), BudgetedPattern)
+
+    # Unbudgeted, 40 a's would take days
+    start = time.monotonic()
+    assert not RuleEngine()._regex_match(r'(a|a)*b', 'a' * 40)
+    assert time.monotonic() - start < 5
@@ -0,0 +1,52 @@
+"""Tests for the private runtime directory of hookify's daemon sockets and decision cache."""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins'))
+
+from hookify.core import client, runtime_dir  # noqa: E402
+
+
+@pytest.fixture
+def xdg(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    return tmp_path / 'hookify'
+
+
+def test_created_private(xdg):
+    assert runtime_dir.runtime_dir(create=True) == str(xdg)
+    assert os.stat(xdg).st_mode & 0o777 == 0o700
+
+
+def test_shared_mode_is_refused(xdg):
+    xdg.mkdir(mode=0o755)
+    os.chmod(xdg, 0o755)
+    assert runtime_dir.runtime_dir(create=True) is None
+    assert client._socket_path() is None
+
+
+def test_symlink_is_refused(xdg, tmp_path):
+    target = tmp_path / 'elsewhere'
+    target.mkdir(mode=0o700)
+    xdg.symlink_to(target)
+    assert runtime_dir.runtime_dir(create=True) is None
+
+
+def test_decision_cache_skipped_when_not_private(xdg):
+    from hookify.core.decision_cache import DecisionCache
+
+    payload = {'session_id': 'test', 'tool_name': 'Bash', 'tool_input': {'command': 'ls'}}
+    cache = DecisionCache.for_input(payload)
+    assert cache is not None and cache.directory.startswith(str(xdg))
+    os.chmod(xdg, 0o777)
+    assert DecisionCache.for_input(payload) is None
+
+
+def test_tmpdir_fallback(tmp_path, monkeypatch):
+    monkeypatch.delenv('XDG_RUNTIME_DIR', raising=False)
+    monkeypatch.setenv('TMPDIR', str(tmp_path))
+    assert runtime_dir.runtime_dir(create=True) == str(tmp_path / f'hookify-{os.getuid()}')
@@ -0,0 +1,72 @@
+"""Tests for streaming evaluation of hookify transcript conditions."""
+
+import os
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, 'plugins'))
+
+from hookify.core.config_loader import Condition  # noqa: E402
+from hookify.core.rule_engine import RuleEngine, compile_budgeted  # noqa: E402
+from hookify.core.transcript import TranscriptSource  # noqa: E402
+from hookify.core.transcript_tail import TranscriptTail  # noqa: E402
+
+CONDITIONS = [Condition('transcript', operator, pattern) for operator, pattern in [
+    ('contains', 'npm test'),
+    ('contains', 'never said'),
+    ('not_contains', 'rm -rf'),
+    ('not_contains', 'absent'),
+    ('contains', 'line one\nline two'),
+    ('regex_match', r'"role":"assistant".*done'),
+    ('regex_match', r'(?s)BEGIN.*END'),
+    ('regex_match', r'(?m)^tail line$'),
+    ('regex_match', r'last\n?$'),
+    ('regex_match', r'\bword\b'),
+    ('regex_match', r'^{"role"'),
+    ('starts_with', '{"role":"user"'),
+    ('ends_with', 'last\n'),
+    ('equals', 'whole'),
+]]
+
+LINES = [
+    '{"role":"user","content":"run npm test"}\n',
+    '{"role":"assistant","content":"line one\\nline two"}\n',
+    'line one\n',
+    'line two\n',
+    'BEGIN' + 'x' * 50 + '\n',
+    'y' * 30 + 'END\n',
+    'swordfish and a word, then rm -rf\n',
+    '{"role":"assistant","content":"all done"}\n',
+    'tail line\n',
+    'last\n',
+]
+
+
+def whole_text_results(text):
+    engine = RuleEngine()
+    return {(c.operator, c.pattern): engine._apply_operator(c.operator, c.pattern, text) for c in CONDITIONS}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64, 1024 * 1024])
+def test_streaming_matches_whole_text(tmp_path, chunk_size):
+    transcript = tmp_path / 'transcript.jsonl'
+    transcript.write_text(''.join(LINES))
+    results = TranscriptSource(str(transcript), chunk_size=chunk_size).evaluate(CONDITIONS, compile_budgeted)
+    assert results == whole_text_results(''.join(LINES))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 16, 1024 * 1024])
+def test_resume_after_append_matches_whole_text(tmp_path, chunk_size):
+    transcript = tmp_path / 'transcript.jsonl'
+    db = str(tmp_path / 'tail.db')
+    text = ''
+    for count in (1, 3, 4, 7, len(LINES)):
+        with open(transcript, 'a') as f:
+            f.write(''.join(LINES[len(text.splitlines()):count]))
+        text = ''.join(LINES[:count])
+        tail = TranscriptTail(str(transcript), 'session', 'test', db)
+        source = TranscriptSource(str(transcript), chunk_size=chunk_size, tail=tail)
+        assert source.evaluate(CONDITIONS, compile_budgeted) == whole_text_results(text), count
+    assert TranscriptTail(str(transcript), 'session', 'test', db).resume()[0] > 0
@@ -0,0 +1,76 @@
+"""Tests for the security-guidance pattern matcher and its PreToolUse hook."""
+
+import importlib.util
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HOOK_PATH = os.path.join(REPO_ROOT, 'plugins', 'security-guidance', 'hooks', 'security_reminder_hook.py')
+
+
+@pytest.fixture
+def hook(tmp_path, monkeypatch):
+    # The state database path is resolved at import, under a throwaway HOME
+    monkeypatch.setenv('HOME', str(tmp_path))
+    spec = importlib.util.spec_from_file_location('security_reminder_hook', HOOK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def plain_matches(hook, file_path, segments):
+    """find_pattern_matches() by searching for each substring on its own."""
+    found = []
+    for pattern in hook.SECURITY_PATTERNS:
+        matches = []
+        for position, (edit_index, text) in enumerate(segments):
+            for substring in pattern.get('substrings', ()):
+                offset = text.find(substring)
+                while offset != -1:
+                    matches.append((position, offset, len(substring), (edit_index, offset, substring)))
+                    offset = text.find(substring, offset + 1)
+        matches = [match for *_, match in sorted(matches)]
+        if matches or ('path_check' in pattern and pattern['path_check'](file_path.lstrip('/'))):
+            found.append((pattern['ruleName'], pattern['reminder'], matches))
+    return found
+
+
+@pytest.mark.parametrize('file_path, segments', [
+    ('app.py', [(None, 'import os\nos.system(cmd)\nimport pickle\npickle.loads(x)')]),
+    ('app.js', [(None, 'el.innerHTML = a; el.innerHTML=b; eval(c); exec(d); execSync(e)')]),
+    ('app.js', [(None, 'require("child_process").exec; child_process.exec(x)')]),
+    ('/.github/workflows/ci.yml', [(None, 'run: echo ${{ github.event.issue.title }}')]),
+    ('app.js', [(0, 'safe'), (1, 'document.write(x)'), (2, 'new Function(y); eval(z)')]),
+    ('notes.md', [(None, 'nothing to see')]),
+])
+def test_single_scan_matches_plain_search(hook, file_path, segments):
+    assert hook.find_pattern_matches(file_path, segments) == plain_matches(hook, file_path, segments)
+
+
+def test_every_finding_is_reported_once(hook, capsys):
+    input_data = {'session_id': 's', 'tool_name': 'Write',
+                  'tool_input': {'file_path': 'app.py', 'content': 'os.system(a)\npickle.loads(b)'}}
+    assert hook.run_hook(input_data) == 2
+    reported = capsys.readouterr().err
+    assert 'os.system' in reported and 'pickle' in reported
+
+    # Shown in this session already
+    assert hook.run_hook(input_data) == 0
+
+
+def test_multiedit_findings_name_their_edit(hook, capsys):
+    input_data = {'session_id': 's', 'tool_name': 'MultiEdit', 'tool_input': {
+        'file_path': 'app.js',
+        'edits': [
+            {'old_string': 'a', 'new_string': 'safe'},
+            {'old_string': 'b', 'new_string': 'x = 1\neval(y)'},
+            {'old_string': 'c', 'new_string': 'ev'},
+            {'old_string': 'd', 'new_string': 'al(z)\ndocument.write(w)'},
+        ],
+    }}
+    assert hook.run_hook(input_data) == 2
+    reported = capsys.readouterr().err
+    assert '`eval(` at line 2 of edit 2' in reported
+    assert '`document.write` at line 2 of edit 4' in reported
+    assert 'edit 3' not in reported  # No match spans two edits
@@ -0,0 +1,57 @@
+"""Regression tests for the Bash tokenizer shared by governance-layer and hookify."""
+
+import importlib.util
+import os
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPIES = {
+    'governance-layer': os.path.join(REPO_ROOT, 'plugins', 'governance-layer', 'hooks', 'shell_command.py'),
+    'hookify': os.path.join(REPO_ROOT, 'plugins', 'hookify', 'core', 'shell_command.py'),
+}
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(f'shell_command_{name}', COPIES[name])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=sorted(COPIES))
+def parse_command(request):
+    return load(request.param).parse_command
+
+
+def test_copies_are_identical():
+    with open(COPIES['governance-layer'], 'rb') as a, open(COPIES['hookify'], 'rb') as b:
+        assert a.read() == b.read()
+
+
+@pytest.mark.parametrize('escape', ['\\UFFFFFFFF', '\\U00110000', '\\uD800', '\\U0000DFFF'])
+def test_ansi_c_escape_that_is_not_a_character_is_kept(parse_command, escape):
+    parsed = parse_command(f"rm -rf / ; echo $'{escape}'")
+    assert [command.argv0 for command in parsed.pipeline] == ['rm', 'echo']
+    assert parsed.pipeline[0].args == ('-rf', '/')
+    assert parsed.pipeline[1].args == (escape,)
+
+
+def test_ansi_c_escapes_are_decoded(parse_command):
+    parsed = parse_command("echo $'\\x41\\u00e9\\U0001F600\\101\\n'")
+    assert parsed.pipeline[0].args == ('Aé\U0001F600A\n',)
+
+
+@pytest.mark.parametrize('command', [
+    'ssh -p 22 host rm -rf /',
+    "ssh host 'rm -rf /'",
+    'watch -n 1 rm -rf /',
+    'find . -name x -exec rm -rf / \\; -print',
+    'find . -execdir sh -c "rm -rf /" {} +',
+    'parallel -j4 rm -rf / ::: a b',
+    'su -c "rm -rf /" root',
+    'su root --command="rm -rf /"',
+    'sudo setsid chroot /mnt rm -rf /',
+])
+def test_commands_run_by_other_commands(parse_command, command):
+    assert 'rm -rf /' in [parsed.text for parsed in parse_command(command).pipeline]
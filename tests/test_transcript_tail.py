@@ -0,0 +1,76 @@
+"""Tests for the incremental transcript reader shared by hookify and ralph-wiggum."""
+
+import importlib.util
+import json
+import os
+import sqlite3
+import time
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPIES = {
+    'hookify': os.path.join(REPO_ROOT, 'plugins', 'hookify', 'core', 'transcript_tail.py'),
+    'ralph-wiggum': os.path.join(REPO_ROOT, 'plugins', 'ralph-wiggum', 'scripts', 'transcript_tail.py'),
+}
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(f'transcript_tail_{name}', COPIES[name])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=sorted(COPIES))
+def transcript_tail(request):
+    return load(request.param)
+
+
+def test_copies_are_identical():
+    with open(COPIES['hookify'], 'rb') as a, open(COPIES['ralph-wiggum'], 'rb') as b:
+        assert a.read() == b.read()
+
+
+def append(path, *messages):
+    with open(path, 'a') as f:
+        for message in messages:
+            f.write(json.dumps(message, separators=(',', ':')) + '\n')
+
+
+def test_last_assistant_line_resumes(transcript_tail, tmp_path):
+    transcript = tmp_path / 'transcript.jsonl'
+    db = str(tmp_path / 'tail.db')
+    append(transcript, {'role': 'user'}, {'role': 'assistant', 'n': 1})
+    assert b'"n":1' in transcript_tail.TranscriptTail(str(transcript), 's', 'test', db).last_line_containing()
+
+    append(transcript, {'role': 'user'})
+    assert transcript_tail.TranscriptTail(str(transcript), 's', 'test', db).resume()[0] > 0
+    assert b'"n":1' in transcript_tail.TranscriptTail(str(transcript), 's', 'test', db).last_line_containing()
+
+    append(transcript, {'role': 'assistant', 'n': 2})
+    assert b'"n":2' in transcript_tail.TranscriptTail(str(transcript), 's', 'test', db).last_line_containing()
+    assert sorted(os.listdir(tmp_path)) == ['tail.db', 'transcript.jsonl']  # No state file per session
+
+
+def test_rewritten_transcript_starts_over(transcript_tail, tmp_path):
+    transcript = tmp_path / 'transcript.jsonl'
+    db = str(tmp_path / 'tail.db')
+    append(transcript, {'role': 'assistant', 'n': 1})
+    tail = transcript_tail.TranscriptTail(str(transcript), 's', 'test', db)
+    tail.save(transcript.stat().st_size, {'seen': True})
+    transcript.write_text(json.dumps({'role': 'assistant', 'n': 3}) + '\n')
+    assert tail.resume() == (0, {})
+
+
+def test_old_sessions_expire(transcript_tail, tmp_path):
+    transcript = tmp_path / 'transcript.jsonl'
+    db = str(tmp_path / 'tail.db')
+    append(transcript, {'role': 'user'})
+    transcript_tail.TranscriptTail(str(transcript), 'old', 'test', db).save(1, {})
+    with sqlite3.connect(db) as conn:
+        conn.execute("UPDATE transcript_offsets SET saved_at = ?", (time.time() - transcript_tail.STATE_MAX_AGE - 1,))
+    transcript_tail.TranscriptTail(str(transcript), 'new', 'test', db).save(1, {})
+    with sqlite3.connect(db) as conn:
+        sessions = [row[0] for row in conn.execute("SELECT session_id FROM transcript_offsets")]
+    assert sessions == ['new']
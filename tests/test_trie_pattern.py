@@ -0,0 +1,43 @@
+"""Tests for the trie-shaped alternation of hookify's prefilter and its security-guidance copy."""
+
+import importlib.util
+import os
+import re
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COPIES = {
+    'hookify': os.path.join(REPO_ROOT, 'plugins', 'hookify', 'core', 'prefilter.py'),
+    'security-guidance': os.path.join(REPO_ROOT, 'plugins', 'security-guidance', 'hooks',
+                                      'security_reminder_hook.py'),
+}
+
+
+def load(name):
+    spec = importlib.util.spec_from_file_location(f'trie_pattern_{name}', COPIES[name])
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(params=sorted(COPIES))
+def trie_pattern(request):
+    return load(request.param)._trie_pattern
+
+
+@pytest.mark.parametrize('words, text, expected', [
+    (['eval(', 'exec(', 'exec'], 'x = exec(eval(y)); exec', ['exec(', 'eval(', 'exec']),
+    (['a', 'ab', 'abc'], 'abcab a', ['abc', 'ab', 'a']),
+    (['.*', '(?', 'a|b'], 'a|b .* (?x', ['a|b', '.*', '(?']),
+    (['child_process.exec', 'child_process'], 'child_process.execSync', ['child_process.exec']),
+    (['x'], 'yyy', []),
+])
+def test_matches_longest_word(trie_pattern, words, text, expected):
+    assert re.findall(trie_pattern(words), text) == expected
+
+
+def test_copies_build_the_same_pattern():
+    words = ['new Function', 'eval(', 'exec(', 'os.system', 'os.', 'pickle', '.innerHTML =', '']
+    patterns = {name: load(name)._trie_pattern(words) for name in COPIES}
+    assert len(set(patterns.values())) == 1